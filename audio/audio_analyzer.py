@@ -17,6 +17,7 @@ class AudioAnalyzer:
        
        # Store processed audio data
        self.audio_data = None
+       self.audio_file = None  # File audio_data was analyzed from
        
        # Legacy properties - initialize with proper keys
        from config import ELEMENT_REGISTRY
@@ -38,27 +39,45 @@ class AudioAnalyzer:
     def analyze_audio_frequencies(self, audio_file_path):
         """Load and analyze audio file using file processor"""
         self.audio_data = self.file_processor.load_and_analyze(audio_file_path)
+        self.audio_file = audio_file_path
         return self.audio_data is not None
 
-    def get_element_frequency_levels_and_panning(self, current_time):
+    def get_element_frequency_levels_and_panning(self, current_time, dt):
         """Update frequency and panning analysis using specialized processors"""
         if not self.audio_data:
             return
             
         # Run the specialized analyzers
-        self.frequency_analyzer.analyze_frequency_levels(self.audio_data, current_time)
-        self.panning_analyzer.analyze_panning(self.audio_data, current_time)
+        self.frequency_analyzer.analyze_frequency_levels(self.audio_data, current_time, dt)
+        self.panning_analyzer.analyze_panning(self.audio_data, current_time, dt)
         
         # Copy the results to maintain compatibility with existing code
         self.element_frequency_levels.update(self.frequency_analyzer.get_frequency_levels())
         self.element_panning.update(self.panning_analyzer.get_panning_levels())
 
-    def get_audio_level(self, channel_activity, is_playing):
+    def reset(self):
+        """Zero the smoothed levels and panning (e.g. when playback restarts)"""
+        self.audio_level = 0.0
+        for levels in (self.element_frequency_levels, self.element_panning,
+                       self.frequency_analyzer.element_frequency_levels, self.panning_analyzer.element_panning):
+            for name in levels:
+                levels[name] = 0.0
+        self.panning_analyzer.pan_history.clear()
+
+    def get_state(self):
+        """Plain-data copy of the levels the UI shows, published by the simulation worker"""
+        return {'frequency_levels': dict(self.element_frequency_levels), 'panning': dict(self.element_panning)}
+
+    def set_state(self, state):
+        self.element_frequency_levels.update(state['frequency_levels'])
+        self.element_panning.update(state['panning'])
+
+    def get_audio_level(self, channel_activity, is_playing, dt):
         if is_playing:
             try:
                 total_activity = sum(channel_activity.values())
                 audio_level = min(1.0, total_activity * 0.8)
-                self.audio_level += (audio_level - self.audio_level) * 0.1
+                self.audio_level += (audio_level - self.audio_level) * (1 - 0.9 ** (dt * 60))  # 0.1 per 1/60 s
                 return self.audio_level
             except:
                 return 0.0
@@ -6,10 +6,11 @@ class FrequencyAnalyzer:
         self.frequency_bands = ELEMENT_REGISTRY.get_frequency_bands()
         self.element_frequency_levels = {name: 0.0 for name in self.frequency_bands.keys()}
         
-    def analyze_frequency_levels(self, audio_data, current_time):
-        """Extract frequency levels for each element at current time"""
+    def analyze_frequency_levels(self, audio_data, current_time, dt):
+        """Extract frequency levels for each element at current time, smoothed over dt seconds"""
         if not audio_data or current_time is None:
             return
+        decay = 0.85 ** (dt * 60)  # Smoothing and decay are per 1/60 s
             
         stft_left = audio_data['stft_left']
         stft_right = audio_data['stft_right']
@@ -45,11 +46,25 @@ class FrequencyAnalyzer:
                 # Smooth the frequency level
                 self.element_frequency_levels[element_name] += (
                     normalized_amp - self.element_frequency_levels[element_name]
-                ) * 0.15
+                ) * (1 - decay)
             else:
                 # Decay if no frequency content
-                self.element_frequency_levels[element_name] *= 0.85
+                self.element_frequency_levels[element_name] *= decay
     
     def get_frequency_levels(self):
         """Get current frequency levels for all elements"""
         return self.element_frequency_levels.copy()
+
+    def get_level_timeline(self, audio_data):
+        """Unsmoothed level of every element's band at every STFT frame: (time_frames, {element: levels})"""
+        if not audio_data:
+            return None, {}
+
+        magnitude = audio_data['stft_left'] + audio_data['stft_right']
+        frequency_bins = audio_data['frequency_bins']
+        levels = {}
+        for element_name, (freq_min, freq_max) in self.frequency_bands.items():
+            freq_mask = (frequency_bins >= freq_min) & (frequency_bins <= freq_max)
+            total_amp = magnitude[freq_mask].sum(axis=0)
+            levels[element_name] = np.minimum(1.0, np.log1p(total_amp / (freq_max - freq_min)) / 10.0)
+        return audio_data['time_frames'], levels
@@ -8,10 +8,12 @@ class PanningAnalyzer:
         self.element_panning = {name: 0.0 for name in self.frequency_bands.keys()}
         self.pan_history = deque(maxlen=10)
         
-    def analyze_panning(self, audio_data, current_time):
-        """Extract stereo panning for each element at current time"""
+    def analyze_panning(self, audio_data, current_time, dt):
+        """Extract stereo panning for each element at current time, smoothed over dt seconds"""
         if not audio_data or current_time is None:
             return
+        smoothing = 1 - 0.8 ** (dt * 60)  # 0.2 per 1/60 s
+        decay = 0.9 ** (dt * 60)
             
         stft_left = audio_data['stft_left']
         stft_right = audio_data['stft_right']
@@ -47,17 +49,17 @@ class PanningAnalyzer:
                     if element_name in self.element_panning:
                         self.element_panning[element_name] += (
                             element_pan - self.element_panning[element_name]
-                        ) * 0.2
+                        ) * smoothing
                     else:
                         self.element_panning[element_name] = element_pan
                 else:
                     # Decay toward center if no signal
                     if element_name in self.element_panning:
-                        self.element_panning[element_name] *= 0.9
+                        self.element_panning[element_name] *= decay
             else:
                 # Decay if no frequency content
                 if element_name in self.element_panning:
-                    self.element_panning[element_name] *= 0.9
+                    self.element_panning[element_name] *= decay
     
     def get_panning_levels(self):
         """Get current panning levels for all elements"""
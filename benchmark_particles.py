@@ -0,0 +1,170 @@
+import random
+import time
+import numpy as np
+import pyglet
+
+pyglet.options['headless'] = True  # The engine is benchmarked without a window
+
+from visual.particles import ExplosionEngine, ParticleEngine
+from visual.particles import particle_kernels
+from utils            import FrameContext, RandomStreams
+
+WATER_COUNTS = [1000, 2000, 5000, 10000, 20000, 50000]
+BRUTE_FORCE_LIMIT = 5000  # Pairwise reference gets too slow past this
+FRAMES = 10
+STREAM_DENSITY_COUNT = 2000  # Particles per 1920x1080 of field
+BACKEND_COUNTS = [1000, 5000, 20000, 50000]  # Mixed elements / explosion particles per backend workload
+
+def make_water_engine(count, seed=1, backend="numpy"):
+    """Water streams at the same density for every count (the field grows with it)"""
+    random.seed(seed)
+    RandomStreams.seed(seed)  # Engine-side draws (emission durations, curve directions)
+    engine = ParticleEngine(None, capacity=count, backend=backend)
+    scale = (count / STREAM_DENSITY_COUNT) ** 0.5
+    width, height = 1920 * scale, 1080 * scale
+    streams = max(1, round(4 * scale))
+    for i in range(count):
+        # Droplets bunch into bands around each stream's line - the clustering StreamEmitter produces
+        stream = i % streams
+        start = (random.uniform(0, width), (stream + 0.5) * height / streams + random.uniform(-20, 20))
+        engine.emit("WATER", start, (width / 2, height / 2), (0, 191, 255),
+                    speed=random.uniform(55, 80), stream_alignment=random.uniform(0.4, 0.8))
+    water = engine.pools["WATER"]
+    water.elapsed[:count] = 2.0  # Past the emission phase
+    engine._simulate(water, 1 / 60)  # Seed velocities
+    return engine
+
+def brute_force_neighbors(engine, rows):
+    """Neighbour velocity sums the O(n^2) way, to check the grid against"""
+    water = engine.pools["WATER"]
+    n = water.count
+    x, y = water.x[:n], water.y[:n]
+    near = (x[rows, None] - x) ** 2 + (y[rows, None] - y) ** 2 < engine.WATER_NEIGHBOR_DISTANCE ** 2
+    near[np.arange(len(rows)), rows] = False
+    return near @ water.velocity_x[:n], near.sum(axis=1)
+
+def grid_neighbors(engine, rows):
+    water = engine.pools["WATER"]
+    n = water.count
+    grid = engine.water_grid
+    grid.rebuild(water.x[:n], water.y[:n])
+    queries, points = grid.query_pairs(water.x[rows], water.y[rows], engine.WATER_NEIGHBOR_DISTANCE)
+    not_self = rows[queries] != points
+    queries, points = queries[not_self], points[not_self]
+    return (np.bincount(queries, water.velocity_x[points], len(rows)),
+            np.bincount(queries, minlength=len(rows)))
+
+def time_cohesion(engine):
+    """Milliseconds per cohesion step over every water particle"""
+    water = engine.pools["WATER"]
+    stream = np.ones(water.count, bool)
+    dir_x, dir_y = np.ones(water.count), np.zeros(water.count)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        engine._apply_stream_cohesion(water, stream, dir_x, dir_y)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def time_brute_force(engine):
+    rows = np.arange(engine.count)
+    start = time.perf_counter()
+    brute_force_neighbors(engine, rows)
+    return (time.perf_counter() - start) * 1000
+
+def make_mixed_engine(count, backend, seed=1, motion="integrated", elements=ParticleEngine.ELEMENT_NAMES):
+    """Elements heading for the centre, a third still in their emission phase"""
+    random.seed(seed)
+    RandomStreams.seed(seed)
+    engine = ParticleEngine(None, capacity=count, backend=backend, motion=motion)
+    for i in range(count):
+        element_type = elements[i % len(elements)]
+        direction = (1, 0) if i % 3 == 0 and element_type != "WATER" else None
+        engine.emit(element_type, (random.uniform(0, 1920), random.uniform(0, 1080)), (960, 540), (200, 200, 200),
+                    emission_direction=direction)
+    return engine
+
+def make_explosion_engine(count, backend, seed=1):
+    RandomStreams.seed(seed)
+    engine = ExplosionEngine(None, capacity=count, backend=backend)
+    engine.explode((960, 540), np.arange(count) % 4, np.zeros((count, 3), np.uint8))
+    return engine
+
+def time_updates(engine, update):
+    """Milliseconds per update, after a warm-up step (pays the JIT compile)"""
+    frame = FrameContext()
+    update(engine, frame.advance(1 / 60))
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        update(engine, frame.advance(1 / 60))
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def update_particles(engine, frame):
+    engine.update(frame, (960, 540), 20, lambda codes, colors: np.ones(len(codes), bool))
+
+def update_explosions(engine, frame):
+    engine.update(frame, 1920, 1080, 64)
+
+def max_difference(engine_a, engine_b):
+    """Largest position difference between two engines stepped identically (inf if their pools differ)"""
+    difference = 0.0
+    for element_type, pool_a in engine_a.pools.items():
+        pool_b = engine_b.pools[element_type]
+        if pool_a.count != pool_b.count:
+            return float('inf')
+        n = pool_a.count
+        if n:
+            difference = max(difference, np.abs(pool_a.x[:n] - pool_b.x[:n]).max(),
+                             np.abs(pool_a.y[:n] - pool_b.y[:n]).max())
+    return difference
+
+def compare_backends():
+    """NumPy vs numba kernels on the same workloads"""
+    if not particle_kernels.NUMBA_AVAILABLE:
+        print("⚠️  numba not installed, only the NumPy kernels can be timed")
+        return
+    print(f"\n{'workload':>12} {'count':>8} {'numpy ms':>10} {'numba ms':>10} {'speedup':>8}")
+    workloads = (
+        ("elemental", make_mixed_engine, update_particles),
+        ("water", lambda count, backend: make_water_engine(count, backend=backend), update_particles),
+        ("explosion", make_explosion_engine, update_explosions),
+    )
+    for name, make, update in workloads:
+        for count in BACKEND_COUNTS:
+            engines = {backend: make(count, backend) for backend in ("numpy", "numba")}
+            timings = {backend: time_updates(engine, update) for backend, engine in engines.items()}
+            if max_difference(engines["numpy"], engines["numba"]) > 1e-6:
+                print(f"❌ numba kernels differ from NumPy ({name}, {count} particles)")
+            print(f"{name:>12} {count:>8} {timings['numpy']:>10.2f} {timings['numba']:>10.2f} "
+                  f"{timings['numpy'] / timings['numba']:>7.1f}x")
+
+def compare_motion_models():
+    """Step-integrated pursuit vs closed-form Bezier paths, for the non-water elements"""
+    backends = ("numpy", "numba") if particle_kernels.NUMBA_AVAILABLE else ("numpy",)
+    elements = ("EARTH", "WIND", "FIRE")
+    print(f"\n{'count':>8} " + " ".join(f"{backend + ' ms':>14}" for backend in backends) + f" {'bezier ms':>10}")
+    for count in BACKEND_COUNTS:
+        timings = [time_updates(make_mixed_engine(count, backend, elements=elements), update_particles)
+                   for backend in backends]
+        bezier = time_updates(make_mixed_engine(count, "numpy", motion="bezier", elements=elements), update_particles)
+        print(f"{count:>8} " + " ".join(f"{timing:>14.2f}" for timing in timings) + f" {bezier:>10.2f}")
+
+def main():
+    print(f"{'water':>8} {'grid ms':>10} {'pairwise ms':>12} {'avg neighbours':>15}")
+    for count in WATER_COUNTS:
+        engine = make_water_engine(count)
+        grid_ms = time_cohesion(engine)
+
+        rows = np.arange(count)
+        _, neighbor_counts = grid_neighbors(engine, rows)
+        pairwise = "-"
+        if count <= BRUTE_FORCE_LIMIT:
+            sums, counts = grid_neighbors(engine, rows)
+            expected_sums, expected_counts = brute_force_neighbors(engine, rows)
+            if not (np.array_equal(counts, expected_counts) and np.allclose(sums, expected_sums)):
+                print(f"❌ Grid neighbours differ from pairwise at {count} particles")
+            pairwise = f"{time_brute_force(engine):.2f}"
+        print(f"{count:>8} {grid_ms:>10.2f} {pairwise:>12} {neighbor_counts.mean():>15.1f}")
+    compare_backends()
+    compare_motion_models()
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,26 @@ class Settings:
     GRID_COLOR   = (20, 30, 40)
     GRID_SPACING = 50
     
+    # Simulation (same seed + same inputs = identical frames, None = different every run)
+    SIMULATION_SEED          = 2001
+    SIMULATION_RATE          = 60    # Fixed simulation steps per second, independent of the render rate
+    SIMULATION_MAX_STEPS     = 5     # Steps caught up per rendered frame, a longer stall is dropped
+    SIMULATION_INTERPOLATION = True  # Draw particles between the last two steps (False = latest step)
+    SIMULATION_WORKER_ENABLED  = False  # Simulate MIDI, audio features, nodes and particles in a separate process
+    SIMULATION_WORKER_CAPACITY = 32768  # Slots per element shared with the renderer, extra particles are not drawn
+    EMISSION_SCHEDULE_WINDOW   = 1.0    # Seconds of song time whose emission events are drawn in one batch
+
     # Network settings
     SATELLITE_DISTANCE = 250
+    CONNECTION_OPACITY = 0  # Element-Odin connection lines (0 = hidden, kept out of the batch)
+    
+    # Explosion particle culling
+    EXPLOSION_CULL_ENABLED = True
+    EXPLOSION_CULL_MARGIN  = 64  # Pixels beyond the window edge before a particle is retired
+    EXPLOSION_SPAWN_FRAMES = 4   # A burst is released over this many frames to avoid a spike
+
+    # Odin's particle sink: weighted reservoir sample of absorbed particles (unlisted elements weigh 1.0)
+    ODIN_SINK_ELEMENT_WEIGHTS = {"WATER": 0.1}  # Dense water streams are kept ~1 in 10
     
     # Element configuration
     ELEMENT_DEFINITIONS = [
@@ -37,7 +55,23 @@ class Settings:
     FFT_HOP_LENGTH      = 512
     
     # Recording settings
-    DEFAULT_TARGET_FPS = 25
+    DEFAULT_TARGET_FPS             = 25
+    RECORDING_QUEUE_DEPTH          = 8         # Captured frames waiting for a writer thread
+    RECORDING_WRITER_THREADS       = 2         # Threads converting and encoding captured frames
+    RECORDING_DROP_POLICY          = "block"   # Queue full: "block" (render waits), "drop_newest" or "drop_oldest"
+    RECORDING_READBACK             = "pbo"     # "pbo": pixel buffer ring, frames copied out later; "direct": glReadPixels waits
+    RECORDING_PBO_COUNT            = 2         # Pixel buffers in the ring (frames of capture latency + 1)
+    RECORDING_BACKEND              = "ffmpeg"  # "ffmpeg": frames piped to one ffmpeg that also muxes audio; "opencv"
+    RECORDING_PIXEL_FORMAT         = "yuv420p" # ffmpeg pipe format, converted on the writer threads ("bgr24" = 2x traffic)
+    RECORDING_FFMPEG_PRESET        = "medium"
+    RECORDING_FFMPEG_CRF           = 18
+    RECORDING_SEGMENT_SECONDS      = 60        # Take written as segments of this length + manifest, stitched at the end (0 = one file)
+    RECORDING_INTERMEDIATE         = None      # "ffv1": lossless capture, x264 final encode in parallel chunks at the end
+    RECORDING_ENCODE_PROCESSES     = 0         # ffmpeg processes of the chunked final encode (0 = one per 4 cores)
+    RECORDING_ENCODE_CHUNK_SECONDS = 10        # Length of each chunk of the final encode
+    RECORDING_FINALIZE_TIMEOUT     = 600       # Seconds one ffmpeg run of the finalization (mux, stitch, chunk) may take,
+    RECORDING_FINALIZE_PER_SECOND  = 10        # plus this many per second of video (None timeout = no limit)
+    RECORDING_CLOSE_WAIT           = 600       # Seconds closing the window waits for finalization before cancelling it
     
     # UI settings
     INFO_LABEL_COUNT  = 20
@@ -76,6 +110,10 @@ class Settings:
     UI_DATA_SIZE     = 9              # Data text
     UI_SMALL_SIZE    = 8              # Secondary info
 
+    # HUD data text: fixed character grid drawn from a glyph atlas (False = one Label per line)
+    HUD_GLYPH_TEXT_ENABLED = True
+    HUD_TEXT_COLUMNS       = 36  # Characters per line, longer lines are cut
+
     # Border and Glow Settings (minimal, clean)
     PANEL_BORDER_WIDTH  = 1  # Ultra-thin borders
     PANEL_GLOW_WIDTH    = 3  # Subtle glow effect
@@ -92,6 +130,41 @@ class Settings:
     PANEL_PULSE_INTENSITY = 0.15  # How much opacity varies (subtle)
     PANEL_FADE_SPEED      = 4.0   # How fast panels fade in/out on data changes
 
+    # Static layer caching (grid and panel chrome rendered once to textures)
+    UI_LAYER_CACHE_ENABLED = True
+    UI_CACHE_GRID_LAYER    = False  # Full-window blit - cheaper to draw the lines on software GL
+
+    # Dynamic resolution (scene rendered offscreen and upscaled, HUD stays native)
+    DYNAMIC_RESOLUTION_ENABLED         = True
+    DYNAMIC_RESOLUTION_MIN_SCALE       = 0.5   # Floor, fraction of the window size
+    DYNAMIC_RESOLUTION_MAX_SCALE       = 1.0   # Ceiling (1.0 = native, no offscreen pass)
+    DYNAMIC_RESOLUTION_TARGET_FPS      = 50    # Frame rate the scale is steered towards
+    DYNAMIC_RESOLUTION_HEADROOM        = 0.15  # Dead band around the target frame time
+    DYNAMIC_RESOLUTION_STEP            = 0.05  # Scale change per adjustment
+    DYNAMIC_RESOLUTION_ADJUST_INTERVAL = 0.5   # Seconds between adjustments
+    DYNAMIC_RESOLUTION_SMOOTHING       = 0.1   # Frame time average weight
+    DYNAMIC_RESOLUTION_WHILE_RECORDING = False # Recordings stay at the ceiling scale
+
+    # Particle budget (emission and explosion fan-out follow frame time)
+    PARTICLE_BUDGET_ENABLED         = True
+    PARTICLE_BUDGET_TARGET_FPS      = 50     # Frame rate the budget is steered towards
+    PARTICLE_BUDGET_HEADROOM        = 0.15   # Dead band around the target frame time
+    PARTICLE_BUDGET_STEP_DOWN       = 0.1    # Budget cut per adjustment when over target
+    PARTICLE_BUDGET_STEP_UP         = 0.05   # Budget restored per adjustment when under target
+    PARTICLE_BUDGET_ADJUST_INTERVAL = 0.5    # Seconds between adjustments
+    PARTICLE_BUDGET_SMOOTHING       = 0.1    # Frame time average weight
+    PARTICLE_BUDGET_MIN_LEVEL       = 0.3    # Lowest overall budget
+    PARTICLE_BUDGET_MIN_SCALE       = 0.1    # No source is throttled below this share
+    PARTICLE_BUDGET_MAX_PARTICLES   = 20000  # Hard cap on live elemental particles
+    PARTICLE_BUDGET_WHILE_RECORDING = False  # Recordings keep the full budget
+    PARTICLE_BUDGET_PRIORITIES      = {     # Lower priority sheds particles first
+        "EARTH": 1.0, "FIRE": 1.0, "WIND": 0.75, "WATER": 0.5, "EXPLOSION": 0.75
+    }
+
+    # Particle physics kernels: "auto" (numba when installed), "numba" or "numpy"
+    PARTICLE_KERNEL_BACKEND = "auto"
+    PARTICLE_MOTION_MODEL   = "integrated"  # "bezier": closed-form paths to Odin, no per-step state (not water)
+
     # Geometric Precision (2001 aesthetic)
     PANEL_PERFECT_SPACING = True    # Ensures pixel-perfect alignment
     PANEL_DATA_ALIGNMENT  = 'left'  # Clean left alignment for data
@@ -52,7 +52,32 @@ class MIDIProcessor:
             print(f"❌ Error loading MIDI: {e}")
             return False
         
-    def process_midi_events(self, current_time, channel_nodes, connections):
+    def reset(self):
+        """Back to the first event with nothing held (e.g. when playback restarts)"""
+        self.current_event_index = 0
+        self.channel_activity.clear()
+        self.recent_events.clear()
+        self.active_channels.clear()
+        self.channel_note_counts.clear()
+
+    def get_state(self):
+        """Plain-data copy of the playback state the UI shows, published by the simulation worker"""
+        return {
+            'current_event_index': self.current_event_index,
+            'channel_activity': dict(self.channel_activity),
+            'active_channels': set(self.active_channels),
+            'recent_events': list(self.recent_events),
+        }
+
+    def set_state(self, state):
+        self.current_event_index = state['current_event_index']
+        self.channel_activity.clear()
+        self.channel_activity.update(state['channel_activity'])
+        self.active_channels = state['active_channels']
+        self.recent_events.clear()
+        self.recent_events.extend(state['recent_events'])
+
+    def process_midi_events(self, current_time, channel_nodes, connections, dt):
         """Process MIDI events"""
         events_processed = 0
         
@@ -96,9 +121,10 @@ class MIDIProcessor:
             self.current_event_index += 1
             events_processed += 1
         
-        # Decay channel activities only if no notes are held
+        # Decay channel activities only if no notes are held (0.95 per 1/60 s of simulated time)
+        decay = 0.95 ** (dt * 60)
         for channel in self.channel_activity:
             if channel not in self.active_channels:
-                self.channel_activity[channel] = max(0, self.channel_activity[channel] * 0.95)
+                self.channel_activity[channel] = max(0, self.channel_activity[channel] * decay)
         
         return events_processed
\ No newline at end of file
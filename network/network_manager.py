@@ -1,12 +1,15 @@
 import math
-import random
 from config           import ELEMENT_REGISTRY
 from config.settings  import Settings
 from visual.emitters  import EmitterFactory
 from nodes            import OdinNode, ElementalNode, Connection
+from visual.particles import ExplosionEngine, ParticleEngine, SimulationWorker
+from visual.particle_budget   import ParticleBudget
+from visual.emission_schedule import EmissionTimeline, EmissionSchedule
+from utils.random_streams     import RandomStreams
 
 class NetworkManager:
-    def __init__(self, window_width, window_height, batch, visualizer_ref):
+    def __init__(self, window_width, window_height, batch, visualizer_ref, worker=None):
         self.batch = batch
         self.channel_nodes = {}
 
@@ -20,17 +23,43 @@ class NetworkManager:
         self.connections = []
         self.odin_node = None
         
-        # Particles
-        self.particles = []
-        self.explosion_particles = []  # New list for explosion particles
+        # Particles (elemental particles live in the vectorized engine)
+        self.simulation_worker = None
+        self.published_sink_count = 0
+        if worker is None:
+            worker = Settings.SIMULATION_WORKER_ENABLED
+        if worker:
+            # The whole simulation runs in a worker process, this one only applies and draws what it publishes
+            self.simulation_worker = SimulationWorker(
+                batch, Settings.SIMULATION_WORKER_CAPACITY, Settings.SIMULATION_SEED, window_width, window_height
+            )
+            self.particles = self.simulation_worker.particles
+            self.explosion_particles = self.simulation_worker.explosions
+        else:
+            self.particles = ParticleEngine(batch)
+            self.explosion_particles = ExplosionEngine(batch)  # Odin's bursts, simulated as arrays
+
+        # Emission and explosion fan-out are throttled to hold the frame time target
+        self.particle_budget = ParticleBudget(Settings.PARTICLE_BUDGET_ENABLED)
+        self.emission_timeline = None  # Built from the loaded MIDI and audio on first use
+        self.emission_sources = None
+        
+        # Per-type explosion counters: particles currently on screen / retired by culling
+        self.explosion_visible = self.explosion_particles.visible
+        self.explosion_culled  = self.explosion_particles.culled
 
         # Create the network immediately
         self.create_network()
 
         self.emitters = {}
-        for element_node in self.channel_nodes.values():
+        self.emission_schedules = {}  # Emission events per element, drawn a window of song time ahead
+        for channel, element_node in self.channel_nodes.items():
             element_type = element_node.element_type
-            self.emitters[element_type] = EmitterFactory.create_emitter(element_type, element_node, self.batch)
+            emitter = EmitterFactory.create_emitter(element_type, element_node, self.batch)
+            self.emitters[element_type] = emitter
+            self.emission_schedules[element_type] = EmissionSchedule(
+                emitter, channel, RandomStreams.numpy(f"emission.{element_type}")
+            )
 
 
     def create_network(self):
@@ -65,13 +94,93 @@ class NetworkManager:
         print("   💧 WATER (CH3) - Deep blue drops with rippling waves")
         print("   ⚡ ODIN (Central) - Audio-reactive morphing square→circle")
 
-    def update_odin_from_elements(self, midi_processor, audio_analyzer, dt):
+    def simulate(self, frame_context, steps, step_dt, audio_time, playing, midi_processor, audio_analyzer, on_step=None):
+        """One rendered frame: MIDI and audio features at audio_time, then steps fixed simulation steps
+        (run by the simulation worker when there is one - its latest published state is applied instead)"""
+        if self.simulation_worker:
+            self.simulation_worker.load(midi_processor, audio_analyzer)
+            self.simulation_worker.queue((
+                'simulate', steps, step_dt, audio_time, playing,
+                self.particle_budget.enabled, self.particle_budget.pinned, self.particle_budget.level
+            ))
+            state = self.simulation_worker.sync()
+            if state:
+                self.set_state(state, midi_processor, audio_analyzer)
+        else:
+            # Smoothing and decays cover the simulated time this frame advances by
+            dt = steps * step_dt
+            if playing:
+                if audio_analyzer.audio_data is not None:
+                    audio_analyzer.get_element_frequency_levels_and_panning(audio_time, dt)
+                midi_processor.process_midi_events(audio_time, self.channel_nodes, self.connections, dt)
+            audio_level = audio_analyzer.get_audio_level(midi_processor.channel_activity, playing, dt)
+
+        for step in range(steps):
+            frame = frame_context.advance(step_dt)
+            frame.song_time = audio_time - (steps - 1 - step) * step_dt  # Steps catch up to audio_time
+            if self.simulation_worker:
+                self.update_shapes(frame)
+            else:
+                self.update_nodes_and_connections(frame, audio_level)
+                self.update_particles(frame)
+                self.update_odin_from_elements(midi_processor, audio_analyzer, frame)
+            if on_step:
+                on_step(frame)
+
+    def update_shapes(self, frame):
+        """Move node shapes and connection lines to their current state (set from the simulation worker)"""
+        for node in self.nodes:
+            node.update_shapes(frame)
+        for connection in self.connections:
+            connection.update_shapes(frame)
+
+    def get_state(self, midi_processor, audio_analyzer):
+        """Plain-data copy of everything drawn or shown besides the particles, published by the simulation worker"""
+        return {
+            'nodes': [node.get_state() for node in self.nodes],
+            'connections': [connection.get_state() for connection in self.connections],
+            'sink_count': len(self.odin_node.particle_sink),
+            'particles': self.particles.count,
+            'explosions': self.explosion_particles.count,
+            'explosion_visible': dict(self.explosion_visible),
+            'explosion_culled': dict(self.explosion_culled),
+            'midi': midi_processor.get_state(),
+            'audio': audio_analyzer.get_state(),
+        }
+
+    def set_state(self, state, midi_processor, audio_analyzer):
+        for node, node_state in zip(self.nodes, state['nodes']):
+            node.set_state(node_state)
+        for connection, connection_state in zip(self.connections, state['connections']):
+            connection.set_state(connection_state)
+        self.published_sink_count = state['sink_count']
+        self.particles.published_count = state['particles']
+        self.explosion_particles.published_count = state['explosions']
+        self.explosion_visible.update(state['explosion_visible'])
+        self.explosion_culled.update(state['explosion_culled'])
+        midi_processor.set_state(state['midi'])
+        audio_analyzer.set_state(state['audio'])
+
+    def get_sink_count(self):
+        """Particles in Odin's sink (as last published, when the simulation worker owns it)"""
+        if self.simulation_worker:
+            return self.published_sink_count
+        return len(self.odin_node.particle_sink)
+
+    def update_odin_from_elements(self, midi_processor, audio_analyzer, frame):
         """Update Odin based on elemental activity - elements can push/pull Odin around"""
         if not self.odin_node:
             return
         
         # Count active channels (instruments with notes currently held)
         active_element_channels = [ch for ch in midi_processor.active_channels if ch < 4]  # Only elements (0-3)
+
+        # Emission events scheduled up to this step (every element's, so silent ones don't pile up)
+        timeline = self.get_emission_timeline(midi_processor, audio_analyzer)
+        due_events = {
+            element_type: schedule.due(timeline, frame.song_time)
+            for element_type, schedule in self.emission_schedules.items()
+        }
         num_active_instruments = len(active_element_channels)
         
         # Calculate sustained activity from held notes
@@ -94,18 +203,17 @@ class NetworkManager:
                 element_type = element_node.element_type
 
                 # Get element's audio data
-                element_freq_level = audio_analyzer.element_frequency_levels.get(element_type, 0.0)
                 element_pan = audio_analyzer.element_panning.get(element_type, 0.0)
 
                 # Use the emitter for this element type
                 emitter = self.emitters[element_type]
-                emitter.update_cooldown(dt)
 
-                # Get emission probability and emit if appropriate
-                emission_prob = emitter.get_emission_probability(element_freq_level, activity)
-                if random.random() < emission_prob:
+                # Fire the due events the particle budget keeps (their keys are under its share)
+                emitter.budget_scale = self.particle_budget.get_scale(element_type)
+                events = int((due_events[element_type] < emitter.get_budgeted_share()).sum())
+                if events and self.particle_budget.allows_emission(len(self.particles)):
                     odin_pos = self.odin_node.get_current_position()
-                    emitter.emit_particles(odin_pos, self.particles, element_pan)
+                    emitter.emit_particles(odin_pos, self.particles, element_pan, events)
 
                 
                 # Calculate force from this element on Odin
@@ -196,7 +304,7 @@ class NetworkManager:
             # No notes held - Odin returns to base state and original position
             self.odin_node.target_size = self.odin_node.base_size
             self.odin_node.target_color = self.odin_node.base_color.copy()
-            self.odin_node.activity *= 0.85  # Slow decay
+            self.odin_node.activity *= 0.85 ** (frame.dt * 60)  # Slow decay (0.85 per 1/60 s)
             
             # Smoothly return Odin to center
             center_x, center_y = self.window_width // 2, self.window_height // 2
@@ -207,63 +315,88 @@ class NetworkManager:
                 if connection.node1 == self.odin_node or connection.node2 == self.odin_node:
                     connection.set_connection_pull(0.0)
 
-    def update_particles(self, dt):
+    def get_emission_timeline(self, midi_processor, audio_analyzer):
+        """Emission inputs over the whole song, rebuilt when another MIDI or audio file is loaded"""
+        sources = (id(midi_processor.midi_events), len(midi_processor.midi_events), id(audio_analyzer.audio_data))
+        if sources != self.emission_sources:
+            self.emission_timeline = EmissionTimeline.from_sources(midi_processor, audio_analyzer)
+            self.emission_sources = sources
+            for schedule in self.emission_schedules.values():
+                schedule.reset(None)
+        return self.emission_timeline
+
+    def update_particles(self, frame):
         """Update particles and return if explosion is needed"""
         explosion_needed = False
         
-        # Update particles and check for particles reaching Odin
-        particles_to_remove = []
-        for i, particle in enumerate(self.particles):
-            if particle.element_type == "WATER":
-                particle.update(dt, self.particles)  # Pass the full particle list
-            else:
-                particle.update(dt)
-                
-            if not particle.alive:
-                particles_to_remove.append(i)
-            else:
-                # Check if particle reached Odin
-                odin_pos = self.odin_node.get_current_position()
-                dist_to_odin = math.hypot(particle.x - odin_pos[0], particle.y - odin_pos[1])
-                if dist_to_odin < 20:  # Within Odin's radius
-                    if self.odin_node.add_particle_to_sink(particle):
-                        particles_to_remove.append(i)
-
-        # Remove processed particles
-        for i in reversed(particles_to_remove):
-            self.particles.pop(i)
-
-        # Update explosion particles
-        explosion_particles_to_remove = []
-        for i, explosion_particle in enumerate(self.explosion_particles):
-            explosion_particle.update(dt)
-            if not explosion_particle.alive:
-                explosion_particles_to_remove.append(i)
-
-        # Remove finished explosion particles
-        for i in reversed(explosion_particles_to_remove):
-            self.explosion_particles.pop(i)
+        # Update particles - those reaching Odin's radius go into its sink
+        self.particles.update(
+            frame, self.odin_node.get_current_position(), 20, self.capture_particles
+        )
+
+        # Update explosion particles, retiring the ones that left the viewport
+        if Settings.EXPLOSION_CULL_ENABLED:
+            self.explosion_particles.update(frame, self.window_width, self.window_height, Settings.EXPLOSION_CULL_MARGIN)
+        else:
+            self.explosion_particles.update(frame)
         
         return explosion_needed
 
-    def update_nodes_and_connections(self, dt, audio_level):
+    def render_particles(self, alpha=1.0):
+        """Write particle geometry once per rendered frame, interpolated between simulation steps"""
+        self.particles.render(alpha)
+        self.explosion_particles.render(alpha)
+
+    def reset(self):
+        """Nodes, connections, particles and emission schedules back to their starting state
+        (the random streams are reseeded by the caller)"""
+        for node in self.nodes:
+            node.reset()
+        for connection in self.connections:
+            connection.reset()
+        self.particles.clear()
+        self.explosion_particles.clear()
+        self.published_sink_count = 0
+        for schedule in self.emission_schedules.values():
+            schedule.reset(None)
+
+    def shutdown(self):
+        if self.simulation_worker:
+            self.simulation_worker.stop()
+            self.simulation_worker = None
+
+    def capture_particles(self, element_codes, colors):
+        """Hand particles that reached Odin to its sink, returns the consumed mask"""
+        return self.odin_node.add_particles_to_sink(element_codes, colors)
+
+    def get_explosion_stats(self):
+        """Per-type explosion particle counts: on screen and retired by culling"""
+        return {
+            particle_type: {
+                'visible': self.explosion_visible[particle_type],
+                'culled': self.explosion_culled[particle_type]
+            }
+            for particle_type in ExplosionEngine.PARTICLE_TYPES
+        }
+
+    def update_nodes_and_connections(self, frame, audio_level):
         """Update all nodes and connections"""
         explosion_needed = False
         
         # Update all nodes (with audio level for Odin)
         for node in self.nodes:
             if isinstance(node, OdinNode):
-                if node.update(dt, audio_level):
+                if node.update(frame, audio_level):
                     explosion_needed = True
             else:
-                node.update(dt)
+                node.update(frame)
 
         # Handle Odin explosion if needed
         if explosion_needed:
-            self.odin_node.explode_particles(self.explosion_particles, self.batch)
+            self.odin_node.explode_particles(self.explosion_particles, self.particle_budget.get_scale("EXPLOSION"))
 
         # Update all connections
         for connection in self.connections:
-            connection.update(dt)
+            connection.update(frame)
         
         return explosion_needed
\ No newline at end of file
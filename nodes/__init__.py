@@ -1,5 +1,6 @@
 from .odin_node import OdinNode
 from .elemental_node import ElementalNode
 from .connection import Connection
+from .particle_sink import ParticleSink
 
-__all__ = ['OdinNode', 'ElementalNode', 'Connection']
\ No newline at end of file
+__all__ = ['OdinNode', 'ElementalNode', 'Connection', 'ParticleSink']
\ No newline at end of file
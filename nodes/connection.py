@@ -1,13 +1,16 @@
-import random
-import time
 import math
-from pyglet import shapes
+from pyglet          import shapes
+from config.settings import Settings
+from visual          import Visibility
+from utils.random_streams import RandomStreams
 
 class Connection:
+    STATE_FIELDS = ('strength', 'pulse_strength', 'jitter_intensity')
+
     def __init__(self, node1, node2, batch):
         self.node1, self.node2 = node1, node2
         self.strength, self.target_strength, self.pulse_strength = 0.3, 0.3, 0
-        self.harmonic_sensitivity = random.uniform(0.4, 1.0)
+        self.harmonic_sensitivity = RandomStreams.python("connections").uniform(0.4, 1.0)
         
         # Store original positions for dynamic movement
         self.node1_original_pos = (node1.x, node1.y)
@@ -25,15 +28,36 @@ class Connection:
         self.jitter_intensity = 0.0
         
         self.batch = batch
+        self.line = None
+        self.line_opacity = Settings.CONNECTION_OPACITY
+        if batch is None:
+            return  # Simulation state only (the simulation worker's connections)
         self.line = shapes.Line(
             node1.x, node1.y, node2.x, node2.y, 
             color=(120, 160, 220), batch=batch
         )
-        self.line.opacity = 0  # Make connections invisible
+        self.line.opacity = self.line_opacity
+        Visibility.sync(self.line, self.batch, self.line_opacity > 0)
         
-    def update(self, dt):
+    def reset(self):
+        """Back to the resting strength and pull (e.g. when playback restarts)"""
+        self.strength, self.target_strength, self.pulse_strength = 0.3, 0.3, 0
+        self.connection_pull = self.target_connection_pull = 0.0
+        self.jitter_x1 = self.jitter_y1 = self.jitter_x2 = self.jitter_y2 = 0.0
+        self.jitter_intensity = 0.0
+
+    def get_state(self):
+        """Plain-data copy of what update_shapes draws, published by the simulation worker"""
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def set_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def update(self, frame):
+        dt = frame.dt
         self.strength += (self.target_strength - self.strength) * dt * 4
-        self.pulse_strength = max(0, self.pulse_strength * 0.88)
+        self.pulse_strength = max(0, self.pulse_strength * 0.88 ** (dt * 60))  # 0.88 per 1/60 s
         
         # Update connection pull smoothly
         self.connection_pull += (self.target_connection_pull - self.connection_pull) * dt * 6
@@ -47,16 +71,25 @@ class Connection:
         # Update jitter based on combined activity
         self.jitter_intensity = combined_activity * 0.8  # Reduced from 1.5
         
+        # Apply dynamic positioning based on connection pull
+        self.apply_dynamic_positioning()
+
+        if self.batch is not None:
+            self.update_shapes(frame)
+
+    def update_shapes(self, frame):
+        """Move the line to the connection's current state"""
+        # Jitter, width, colour and endpoints only matter while the line can be seen
+        if not Visibility.sync(self.line, self.batch, self.line_opacity > 0):
+            return
+        
         # Generate jitter for connection endpoints
-        time_factor = time.time() * 18
+        time_factor = frame.time * 18
         self.jitter_x1 = math.sin(time_factor) * self.jitter_intensity
         self.jitter_y1 = math.cos(time_factor * 1.1) * self.jitter_intensity
         self.jitter_x2 = math.sin(time_factor * 1.3) * self.jitter_intensity
         self.jitter_y2 = math.cos(time_factor * 0.9) * self.jitter_intensity
         
-        # Apply dynamic positioning based on connection pull
-        self.apply_dynamic_positioning()
-        
         # Update visual properties
         width = max(2, min(12, int(self.strength * 3 + self.pulse_strength * 4)))
         color_variance = int(min(80, self.pulse_strength * 80))
@@ -68,7 +101,7 @@ class Connection:
         
         self.line.width = width
         self.line.color = color
-        self.line.opacity = 0  # Keep connections invisible
+        self.line.opacity = self.line_opacity
         
         # Update line endpoints to current node positions with jitter
         node1_pos = self.node1.get_current_position()
@@ -109,10 +142,9 @@ class Connection:
     def set_connection_pull(self, pull_strength):
         """Set the connection pull strength (0.0 to 1.0)"""
         self.target_connection_pull = min(1.0, max(0.0, pull_strength))# Update labels to follow the node
-        if hasattr(self.node2, 'label_text'):
+        if getattr(self.node2, 'labels_visible', False):
             self.node2.label_text.x = self.node2.x
             self.node2.label_text.y = self.node2.y - int(self.node2.size) - 25
-        if hasattr(self.node2, 'notes_text'):
             self.node2.notes_text.x = self.node2.x
             self.node2.notes_text.y = self.node2.y - int(self.node2.size) - 40
         
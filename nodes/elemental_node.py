@@ -1,11 +1,13 @@
-import time
 import math
 from pyglet        import text
 from visual.shapes import ElementalShape
+from visual        import Visibility
 from config        import ELEMENT_REGISTRY
 
 class ElementalNode:
     """Enhanced node class for elements with audio-reactive shapes"""
+    STATE_FIELDS = ('x', 'y', 'size', 'color', 'activity', 'audio_smoothed', 'jitter_x', 'jitter_y')
+
     def __init__(self, x, y, node_id, batch, instrument_channel=None, element_type="", element_color=None):
         self.x = int(x)
         self.y = int(y)
@@ -23,6 +25,7 @@ class ElementalNode:
         self.activity = 0
         self.label = element_type
         self.active_notes = set()
+        self.batch = batch
         
         # Audio reactivity
         self.audio_intensity = 0.0
@@ -36,7 +39,13 @@ class ElementalNode:
         # MIDI note-based color gradient tracking
         self.current_gradient_color = self.base_color.copy()
         self.note_colors = {}  # Track colors for each active note
-        
+
+        # Without a batch the node is simulation state only (the simulation worker's nodes)
+        self.elemental_shape = None
+        self.labels_visible = False
+        if batch is None:
+            return
+
         # Create elemental shape
         self.elemental_shape = ElementalShape(x, y, self.base_size, batch, element_type, self.color)
         
@@ -49,7 +58,33 @@ class ElementalNode:
             '', font_size=10, color=(180, 255, 180, 0),  # Invisible
             x=x, y=y - self.base_size - 40, anchor_x='center', batch=batch
         )
-        
+        self.labels_visible = self.label_text.color[3] > 0 or self.notes_text.color[3] > 0
+        Visibility.sync(self.label_text, batch, self.labels_visible)
+        Visibility.sync(self.notes_text, batch, self.labels_visible)
+        
+    def reset(self):
+        """Back to the resting state the node was created in (e.g. when playback restarts)"""
+        self.x, self.y = self.original_x, self.original_y
+        self.size = self.target_size = self.base_size
+        self.color = self.base_color.copy()
+        self.target_color = self.base_color.copy()
+        self.current_gradient_color = self.base_color.copy()
+        self.activity = 0
+        self.active_notes.clear()
+        self.note_colors.clear()
+        self.audio_intensity = self.audio_smoothed = 0.0
+        self.jitter_x = self.jitter_y = self.jitter_intensity = 0.0
+        if self.elemental_shape:
+            self.elemental_shape.audio_intensity = self.elemental_shape.target_audio_intensity = 0.0
+
+    def get_state(self):
+        """Plain-data copy of what update_shapes draws, published by the simulation worker"""
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def set_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def get_note_color_for_element(self, note):
         """Generate element-specific color gradients based on MIDI note"""
         element_config = ELEMENT_REGISTRY.get_element(self.element_type)
@@ -75,7 +110,8 @@ class ElementalNode:
         num_notes = len(self.active_notes)
         self.current_gradient_color = [int(c / num_notes) for c in blended_color]
         
-    def update(self, dt):
+    def update(self, frame):
+        dt = frame.dt
         # Override audio intensity with frequency-based reactivity
         if hasattr(self, 'visualizer_ref') and self.visualizer_ref:
             freq_level = self.visualizer_ref.audio_analyzer.element_frequency_levels.get(self.element_type, 0.0)
@@ -93,7 +129,7 @@ class ElementalNode:
         self.jitter_intensity = self.activity * 1.2  # Reduced from 2.5
         
         # Generate different jitter patterns for each element
-        time_factor = time.time() * (12 + self.id)  # Different speed per element
+        time_factor = frame.time * (12 + self.id)  # Different speed per element
         self.jitter_x = math.sin(time_factor) * self.jitter_intensity
         self.jitter_y = math.cos(time_factor * 1.2) * self.jitter_intensity
         
@@ -104,27 +140,32 @@ class ElementalNode:
         # Use gradient color instead of target color
         self.color = self.current_gradient_color.copy()
         
-        # Activity decay
-        self.activity = max(0, min(1, self.activity * 0.92))
+        # Activity decay (0.92 per 1/60 s)
+        self.activity = max(0, min(1, self.activity * 0.92 ** (dt * 60)))
         
         if self.active_notes:
             self.activity = min(1.0, len(self.active_notes) * 0.3)
-        
+
+        if self.batch is not None:
+            self.update_shapes(frame)
+
+    def update_shapes(self, frame):
+        """Move the shape and labels to the node's current state"""
         # Current position with jitter
         current_x = int(self.x + self.jitter_x)
         current_y = int(self.y + self.jitter_y)
         
         # Update elemental shape with gradient color AND both intensities
         self.elemental_shape.set_position_and_size(current_x, current_y, int(self.size))
-        self.elemental_shape.update(dt, self.color, self.audio_smoothed, self.activity)
-        
-        # Update labels (hidden but kept for compatibility)
-        new_size = int(self.size)
-        self.label_text.x = current_x
-        self.label_text.y = current_y - new_size - 25
-        self.notes_text.x = current_x
-        self.notes_text.y = current_y - new_size - 40
-        # Labels are invisible so no text updates needed
+        self.elemental_shape.update(frame, self.color, self.audio_smoothed, self.activity)
+        
+        # Update labels (hidden but kept for compatibility - skipped while out of the batch)
+        if self.labels_visible:
+            new_size = int(self.size)
+            self.label_text.x = current_x
+            self.label_text.y = current_y - new_size - 25
+            self.notes_text.x = current_x
+            self.notes_text.y = current_y - new_size - 40
     
     def get_current_position(self):
         """Get current position including jitter"""
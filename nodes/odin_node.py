@@ -1,13 +1,16 @@
-import time
 import math
-import random
+import numpy as np
 from pyglet import shapes, text
 from visual.shapes import CurvedOdinShape
-from visual.particles import ExplosionParticle
-from visual.particles import ExplosionParticle3D
+from visual import Visibility
+from config.settings import Settings
+from visual.particles import ExplosionParticle, ParticleEngine
+from .particle_sink import ParticleSink
 
 class OdinNode:
     """Special node class for Odin with audio-reactive morphing"""
+    STATE_FIELDS = ('x', 'y', 'size', 'color', 'activity', 'audio_smoothed', 'jitter_x', 'jitter_y')
+
     def __init__(self, x, y, node_id, batch, instrument_channel=None):
         self.x = int(x)
         self.y = int(y)
@@ -24,6 +27,7 @@ class OdinNode:
         self.activity = 0
         self.label = "ODIN"
         self.active_notes = set()
+        self.batch = batch
         
         # Audio reactivity
         self.audio_intensity = 0.0
@@ -33,7 +37,21 @@ class OdinNode:
         self.jitter_x = 0.0
         self.jitter_y = 0.0
         self.jitter_intensity = 0.0
-        
+
+        # Particle sink properties
+        self.max_sink_capacity = 500  # Maximum particles Odin can hold
+        self.particle_sink = ParticleSink(self.max_sink_capacity, [
+            Settings.ODIN_SINK_ELEMENT_WEIGHTS.get(name, 1.0) for name in ParticleEngine.ELEMENT_NAMES
+        ])  # Sample of the particles that reached Odin
+        self.frame_index = 0  # Frame last updated, stamps sink entries
+        self.was_large = False  # Track if Odin was previously large to detect contraction
+
+        # Without a batch Odin is simulation state only (the simulation worker's Odin)
+        self.curved_shape = None
+        self.labels_visible = False
+        if batch is None:
+            return
+
         # Create custom curved shape instead of regular rectangle
         self.curved_shape = CurvedOdinShape(x, y, self.base_size, batch)
         
@@ -44,6 +62,7 @@ class OdinNode:
             color=(150, 200, 255), batch=batch
         )
         self.border.opacity = 0
+        Visibility.sync_opacity(self.border, batch)
         
         # Labels (kept in code but hidden)
         self.label_text = text.Label(
@@ -54,13 +73,14 @@ class OdinNode:
             '', font_size=10, color=(180, 255, 180, 0),  # Invisible
             x=x, y=y - self.base_size - 45, anchor_x='center', batch=batch
         )
-
-        # Particle sink properties
-        self.particle_sink = []  # Store particles that reach Odin
-        self.max_sink_capacity = 500  # Maximum particles Odin can hold
-        self.was_large = False  # Track if Odin was previously large to detect contraction
+        self.labels_visible = self.label_text.color[3] > 0 or self.notes_text.color[3] > 0
+        Visibility.sync(self.label_text, batch, self.labels_visible)
+        Visibility.sync(self.notes_text, batch, self.labels_visible)
         
-    def update(self, dt, audio_level=0.0):
+    def update(self, frame, audio_level=0.0):
+        dt = frame.dt
+        self.frame_index = frame.frame_index  # Stamps sink entries
+
         # Smooth audio level for reactivity
         self.audio_intensity = audio_level
         self.audio_smoothed += (audio_level - self.audio_smoothed) * dt * 8
@@ -69,7 +89,7 @@ class OdinNode:
         self.jitter_intensity = self.audio_smoothed * 1.5  # Reduced from 3.0
         
         # Generate audio-reactive jitter
-        time_factor = time.time() * 15  # Jitter speed
+        time_factor = frame.time * 15  # Jitter speed
         self.jitter_x = math.sin(time_factor) * self.jitter_intensity
         self.jitter_y = math.cos(time_factor * 1.3) * self.jitter_intensity
         
@@ -89,38 +109,64 @@ class OdinNode:
             self.color[i] += (self.target_color[i] - self.color[i]) * dt * 5
             self.color[i] = max(0, min(255, self.color[i]))
         
-        # Activity decay
-        self.activity = max(0, min(1, self.activity * 0.92))
+        # Activity decay (0.92 per 1/60 s)
+        self.activity = max(0, min(1, self.activity * 0.92 ** (dt * 60)))
         
+        if self.batch is not None:
+            self.update_shapes(frame)
+        return False  # No explosion
+
+    def update_shapes(self, frame):
+        """Move the shape, border and labels to Odin's current state"""
         # Current position with jitter
         current_x = int(self.x + self.jitter_x)
         current_y = int(self.y + self.jitter_y)
         
         # Update curved shape with audio reactivity
         self.curved_shape.set_position_and_size(current_x, current_y, int(self.size))
-        self.curved_shape.update(dt, self.color, self.audio_smoothed, int(self.size))
+        self.curved_shape.update(frame, self.color, self.audio_smoothed, int(self.size))
         
-        # Update border for active nodes
-        if self.activity > 0.2:
+        # Update border for active nodes (parked outside the batch otherwise)
+        if Visibility.sync(self.border, self.batch, self.activity > 0.2):
             new_size = int(self.size)
             self.border.x = current_x - new_size - 3
             self.border.y = current_y - new_size - 3
             self.border.width = new_size * 2 + 6
             self.border.height = new_size * 2 + 6
             self.border.opacity = int(self.activity * 200)
-        else:
-            self.border.opacity = 0
         
-        # Update labels (hidden but kept for compatibility)
-        new_size = int(self.size)
-        self.label_text.x = current_x
-        self.label_text.y = current_y - new_size - 25
-        self.notes_text.x = current_x
-        self.notes_text.y = current_y - new_size - 45
-        # Labels are invisible so no text updates needed
-
-        return False  # No explosion
+        # Update labels (hidden but kept for compatibility - skipped while out of the batch)
+        if self.labels_visible:
+            new_size = int(self.size)
+            self.label_text.x = current_x
+            self.label_text.y = current_y - new_size - 25
+            self.notes_text.x = current_x
+            self.notes_text.y = current_y - new_size - 45
     
+    def reset(self):
+        """Back to the resting state Odin was created in, with an empty sink"""
+        self.x, self.y = self.original_x, self.original_y
+        self.size = self.target_size = self.base_size
+        self.color = self.base_color.copy()
+        self.target_color = self.base_color.copy()
+        self.activity = 0
+        self.active_notes.clear()
+        self.audio_intensity = self.audio_smoothed = 0.0
+        self.jitter_x = self.jitter_y = self.jitter_intensity = 0.0
+        if self.curved_shape:
+            self.curved_shape.curvature = self.curved_shape.target_curvature = 0.0
+        self.particle_sink.clear()
+        self.frame_index = 0
+        self.was_large = False
+
+    def get_state(self):
+        """Plain-data copy of what update_shapes draws, published by the simulation worker"""
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def set_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def get_current_position(self):
         """Get current position including jitter"""
         return (int(self.x + self.jitter_x), int(self.y + self.jitter_y))
@@ -138,69 +184,25 @@ class OdinNode:
         # Odin doesn't directly receive MIDI notes, but we keep this for compatibility
         pass
 
-    def add_particle_to_sink(self, particle):
-        """Add a particle to Odin's internal sink with sampling for water"""
-        if len(self.particle_sink) < self.max_sink_capacity:
-            # For water particles, only store every 20th particle
-            if particle.element_type == "WATER":
-                if random.random() < 0.1:  # 10% chance (1 in 10)
-                    self.particle_sink.append({
-                        'color': particle.color,
-                        'element_type': particle.element_type,
-                        'added_time': time.time()
-                    })
-                    return True
-                else:
-                    return True  # Particle is "consumed" but not stored
-            else:
-                # Non-water particles are stored normally
-                self.particle_sink.append({
-                    'color': particle.color,
-                    'element_type': getattr(particle, 'element_type', 'GENERIC'),
-                    'added_time': time.time()
-                })
-                return True
-        return False
-
-    def explode_particles(self, explosion_particles_list, batch):
-        """Release all particles from sink in 3D explosion pattern"""
+    def add_particles_to_sink(self, element_codes, colors):
+        """Absorb a batch of particles into the sink - Odin takes every particle that reaches it"""
+        self.particle_sink.add(element_codes, colors, self.frame_index)
+        return np.ones(len(element_codes), bool)
+
+    def explode_particles(self, explosion_engine, fan_out=1.0):
+        """Release particles from sink in 3D explosion pattern (fan_out = share of the sink that bursts)"""
         if not self.particle_sink:
             return
-            
-        current_pos = self.get_current_position()
-        
-        for particle_data in self.particle_sink:
-            # Get element type from stored data
-            element_type = particle_data.get('element_type', 'GENERIC')
-            
-            # Decide particle direction explicitly
-            direction_chance = random.random()
-        
-            if direction_chance < 0.05:  # 5% chance - toward viewer
-                direction = (
-                    random.uniform(-0.2, 0.2),
-                    random.uniform(-0.2, 0.2),
-                )
-                particle_type = "toward_viewer"
-            elif direction_chance < 0.10:  # Next 5% chance - away from viewer  
-                angle = random.uniform(0, 2 * math.pi)
-                direction = (
-                    math.cos(angle) * 0.5,
-                    math.sin(angle) * 0.5,
-                )
-                particle_type = "away_from_viewer"
-            else:  # Remaining 90% - screen plane explosion
-                angle = random.uniform(0, 2 * math.pi)
-                direction = (
-                    math.cos(angle),
-                    math.sin(angle),
-                )
-                particle_type = "screen_plane"
-
-            explosion_particle = ExplosionParticle3D(
-                current_pos, direction, particle_data['color'], batch, particle_type, element_type
-            )
-            explosion_particles_list.append(explosion_particle)
+
+        element_codes, colors, _ = self.particle_sink.snapshot()
+
+        # Under a reduced particle budget only a random share of the sink bursts
+        if fan_out < 1.0:
+            keep = self.particle_sink.random.permutation(len(element_codes))[:max(1, round(len(element_codes) * fan_out))]
+            element_codes, colors = element_codes[keep], colors[keep]
+
+        # The whole burst is generated as arrays in one call
+        explosion_engine.explode(self.get_current_position(), element_codes, colors)
         
         # Clear the sink
         self.particle_sink.clear()
@@ -0,0 +1,76 @@
+import numpy as np
+from utils.random_streams import RandomStreams
+
+class ParticleSink:
+    """Fixed-capacity store of absorbed particles - each element thinned by its weight, a reservoir sample once full"""
+    def __init__(self, capacity, element_weights):
+        self.capacity = capacity
+        self.element_weights = np.asarray(element_weights, np.float64)  # Indexed by element code
+        self.random = RandomStreams.numpy("odin_sink")
+        self.count = 0
+        self.seen = 0  # Particles offered since the last clear
+
+        self.element_codes = np.zeros(capacity, np.uint8)
+        self.colors = np.zeros(capacity, np.uint32)  # Packed 0xRRGGBB
+        self.frames = np.zeros(capacity, np.int64)   # Frame each particle was absorbed on
+        self.keys = np.zeros(capacity, np.float64)   # Reservoir keys (higher stays)
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def pack_colors(colors):
+        colors = np.asarray(colors, np.uint32).reshape(-1, 3)
+        return (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
+
+    @staticmethod
+    def unpack_colors(packed):
+        return np.stack(((packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF), axis=-1).astype(np.uint8)
+
+    def add(self, element_codes, colors, frame):
+        """Absorb a batch of particles: each is kept with its element's weight, then reservoir-sampled once full"""
+        count = len(element_codes)
+        if count == 0:
+            return
+        element_codes = np.asarray(element_codes, np.uint8)
+        self.seen += count
+
+        # Weighted thinning applies below capacity too (water is kept ~1 in 10)
+        kept = self.random.random(count) < self.element_weights[element_codes]
+        element_codes = element_codes[kept]
+        packed = self.pack_colors(colors)[kept]
+        count = len(element_codes)
+        if count == 0:
+            return
+        keys = self.random.random(count)  # Uniform over the thinned stream, so the weights apply once
+
+        # Fill the free slots with straight array writes
+        free = min(count, self.capacity - self.count)
+        if free:
+            block = slice(self.count, self.count + free)
+            self.element_codes[block] = element_codes[:free]
+            self.colors[block] = packed[:free]
+            self.frames[block] = frame
+            self.keys[block] = keys[:free]
+            self.count += free
+        if free == count:
+            return
+
+        # Full: each newcomer replaces the lowest key it beats
+        rest = slice(free, count)
+        for i in np.flatnonzero(keys[rest] > self.keys.min()) + free:
+            slot = np.argmin(self.keys)
+            if keys[i] > self.keys[slot]:
+                self.element_codes[slot] = element_codes[i]
+                self.colors[slot] = packed[i]
+                self.frames[slot] = frame
+                self.keys[slot] = keys[i]
+
+    def snapshot(self):
+        """Copy of the stored particles (element codes, RGB colours, frames)"""
+        n = self.count
+        return self.element_codes[:n].copy(), self.unpack_colors(self.colors[:n]), self.frames[:n].copy()
+
+    def clear(self):
+        self.count = 0
+        self.seen = 0
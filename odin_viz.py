@@ -10,7 +10,11 @@ from recording.video_recorder import VideoRecorder
 from network.network_manager  import NetworkManager
 from ui.ui_manager            import UIManager
 from visual.visual_manager    import VisualManager
+from visual.dynamic_resolution import DynamicResolution
 from utils.file_manager       import FileManager
+from utils.fixed_timestep     import FixedTimestep
+from utils.frame_context      import FrameContext
+from utils.random_streams     import RandomStreams
 
 from video.video_effects_manager import VideoEffectsManager
 
@@ -31,6 +35,11 @@ class MIDIVisualizer(pyglet.window.Window):
         self.grid_batch = pyglet.graphics.Batch()
         self.video_batch = pyglet.graphics.Batch()
         
+        # Simulation clock shared by every update, and seeded random streams for each subsystem
+        RandomStreams.seed(Settings.SIMULATION_SEED)
+        self.frame_context = FrameContext()
+        self.timestep = FixedTimestep(Settings.SIMULATION_RATE, Settings.SIMULATION_MAX_STEPS)
+
         # Instantitate the audio analyzer class
         self.audio_analyzer = AudioAnalyzer()
 
@@ -55,6 +64,9 @@ class MIDIVisualizer(pyglet.window.Window):
         # Instantiate the video effects manager class
         self.video_effects_manager = VideoEffectsManager(self.width, self.height, self.video_batch)
 
+        # Scene render resolution follows frame time (HUD is always drawn native)
+        self.dynamic_resolution = DynamicResolution(self.width, self.height, Settings.DYNAMIC_RESOLUTION_ENABLED)
+
         self.start_time = None
         self.playing = False
         
@@ -76,27 +88,24 @@ class MIDIVisualizer(pyglet.window.Window):
         """Main update loop"""
         try:
             audio_time = self.audio_player.get_current_time()
-            # Process MIDI if playing
-            if self.playing:    
-                if self.playing and self.audio_analyzer.audio_data is not None:
-                    self.audio_analyzer.get_element_frequency_levels_and_panning(audio_time)
-                
-                self.midi_processor.process_midi_events(audio_time, self.network_manager.channel_nodes, self.network_manager.connections)
-            
+
+            # The particle budget follows real frame time, once per rendered frame
+            self.network_manager.particle_budget.update()
+
+            # MIDI, audio features, nodes and particles in fixed steps, however long this frame took
+            # (in the simulation worker when it is enabled)
+            steps = self.timestep.advance(dt)
+            self.network_manager.simulate(
+                self.frame_context, steps, self.timestep.step_dt, audio_time, self.playing,
+                self.midi_processor, self.audio_analyzer, on_step=self.update_step_effects
+            )
+
             # Update visuals
             total_activity = sum(self.midi_processor.channel_activity.values())
             self.background_intensity = min(0.3, max(0, total_activity * 0.1))
-            
-            # Update all nodes (with audio level for Odin)
-            audio_level = self.audio_analyzer.get_audio_level(self.midi_processor.channel_activity, self.playing)
-
-            # Update network components
-            self.network_manager.update_nodes_and_connections(dt, audio_level)
-            self.network_manager.update_particles(dt)
-            self.network_manager.update_odin_from_elements(self.midi_processor, self.audio_analyzer, dt)
 
-            # Update visual effects (background patterns, etc.)
-            self.visual_manager.update_effects(dt, total_activity)
+            # Particles are drawn between the last two steps so motion stays smooth at any render rate
+            self.network_manager.render_particles(self.timestep.alpha if Settings.SIMULATION_INTERPOLATION else 1.0)
             
             # Update video effects (fades, transitions, etc.)
             elapsed_time = audio_time if self.playing else 0.0
@@ -104,6 +113,7 @@ class MIDIVisualizer(pyglet.window.Window):
 
             # Update UI
             self.ui_manager.update_ui(
+                self.frame_context,
                 audio_time,
                 self.start_time,
                 self.playing,
@@ -111,17 +121,23 @@ class MIDIVisualizer(pyglet.window.Window):
                 self.video_recorder,
                 self.network_manager,
                 self.audio_analyzer,
+                self.dynamic_resolution.scale,
             )
             
             # Capture frame if recording
             if self.video_recorder.recording and self.playing:
-                self.video_recorder.capture_frame(dt, self.width, self.height)
+                self.video_recorder.capture_frame(audio_time, self.width, self.height)
                 
         except Exception as e:
             import traceback
             print(f"❌ Update error: {e}")
             traceback.print_exc()
     
+    def update_step_effects(self, frame):
+        """Update visual effects (background patterns, etc.) once per simulation step"""
+        total_activity = sum(self.midi_processor.channel_activity.values())
+        self.visual_manager.update_effects(frame, total_activity)
+
     def on_draw(self):
         self.clear()
         
@@ -129,11 +145,29 @@ class MIDIVisualizer(pyglet.window.Window):
         bg_intensity = 0.98 + max(0, min(0.08, self.background_intensity * 0.15))
         pyglet.gl.glClearColor(bg_intensity, bg_intensity, bg_intensity, 1.0)
         
+        # Scene resolution and particle budget adapt to frame time - recordings keep full quality unless allowed
+        self.dynamic_resolution.pinned = self.video_recorder.recording and not Settings.DYNAMIC_RESOLUTION_WHILE_RECORDING
+        self.network_manager.particle_budget.pinned = (
+            self.video_recorder.recording and not Settings.PARTICLE_BUDGET_WHILE_RECORDING
+        )
+        self.dynamic_resolution.update()
+        
         # Draw everything in proper layer order
-        self.grid_batch.draw()      # Background grid
+        self.dynamic_resolution.begin()             # Scene goes offscreen when scaled down
+        self.ui_manager.draw_background_layers()  # Cached background grid
+        self.grid_batch.draw()      # Background pattern
         self.batch.draw()           # Main content (nodes, particles)
-        self.ui_batch.draw()        # UI panels
+        self.dynamic_resolution.end()               # Upscale the scene to the window
+        self.ui_manager.draw_panel_layers()       # Cached panel chrome
+        self.ui_batch.draw()        # UI panel text
         self.video_batch.draw()     # Video effects (fades, overlays) - LAST
+
+    def on_resize(self, width, height):
+        super().on_resize(width, height)
+        if hasattr(self, 'ui_manager'):
+            self.ui_manager.resize(width, height)
+        if hasattr(self, 'dynamic_resolution'):
+            self.dynamic_resolution.resize(width, height)
     
     def on_key_press(self, symbol, _modifiers):
         try:
@@ -145,28 +179,27 @@ class MIDIVisualizer(pyglet.window.Window):
                         print("⏸️  Paused")
                     else:
                         self.playing = True
-                        self.start_time = time.time()
+                        self.start_time = self.frame_context.time
                         self.audio_player.play()
                         print("▶️  Playing")
             
             elif symbol == pyglet.window.key.R:
                 if self.midi_processor.midi_events:
+                    # Video frames follow the audio clock, which goes back to 0 - the take ends here
+                    if self.video_recorder.recording:
+                        self.video_recorder.stop_recording()
+
                     # Restart everything
-                    self.midi_processor.current_event_index = 0
-                    self.start_time = time.time()
+                    self.midi_processor.reset()
                     self.playing = True
-                    self.midi_processor.channel_activity.clear()
-                    self.midi_processor.recent_events.clear()
-                    
-                    # Reset nodes
-                    for node in self.network_manager.nodes:
-                        node.active_notes.clear()
-                        node.target_size = node.base_size
-                        node.target_color = node.base_color.copy()
-                    
-                    # Reset Odin tracking
-                    self.midi_processor.active_channels.clear()
-                    self.midi_processor.channel_note_counts.clear()
+
+                    # Simulation restarts from the seed, so a restarted run replays the same way
+                    self.frame_context.reset()
+                    self.timestep.reset()
+                    self.start_time = self.frame_context.time
+                    RandomStreams.seed(Settings.SIMULATION_SEED)
+                    self.network_manager.reset()  # Nodes, connections, particles, Odin's sink
+                    self.audio_analyzer.reset()
 
                     # Restart audio
                     self.audio_player.restart()
@@ -186,6 +219,10 @@ class MIDIVisualizer(pyglet.window.Window):
                         print("⚠️  Stop playback first (R to restart, then V, then SPACE)")
                 else:
                     self.video_recorder.stop_recording()
+            elif symbol == pyglet.window.key.C:
+                cancelled = self.video_recorder.cancel_finalization()
+                if cancelled:
+                    print(f"🚫 Cancelling background finalization of {cancelled} recording(s)")
             elif symbol == pyglet.window.key.F:
                 # Toggle fade effects
                 current_state = self.video_effects_manager.fade_controller.fade_enabled
@@ -196,6 +233,15 @@ class MIDIVisualizer(pyglet.window.Window):
             elif symbol == pyglet.window.key.L:
                 new_state = self.ui_manager.toggle_logs()
                 print(f"{'✅' if new_state else '🚫'} Logs {'enabled' if new_state else 'disabled'}")
+            elif symbol == pyglet.window.key.D:
+                new_state = not self.dynamic_resolution.enabled
+                self.dynamic_resolution.set_enabled(new_state)
+                print(f"{'✅' if new_state else '🚫'} Dynamic resolution {'enabled' if new_state else 'disabled'}")
+            elif symbol == pyglet.window.key.B:
+                particle_budget = self.network_manager.particle_budget
+                new_state = not particle_budget.enabled
+                particle_budget.set_enabled(new_state)
+                print(f"{'✅' if new_state else '🚫'} Particle budget {'enabled' if new_state else 'disabled'}")
 
                 
         except Exception as e:
@@ -206,13 +252,24 @@ class MIDIVisualizer(pyglet.window.Window):
             if self.video_recorder.recording:
                 self.video_recorder.stop_recording()
                 self.audio_player.cleanup()
-        except:
-            pass
+            if self.video_recorder.finalization_jobs:
+                print(f"⏳ Waiting up to {Settings.RECORDING_CLOSE_WAIT}s for recordings to finish (Ctrl+C cancels)...")
+                try:
+                    finished = self.video_recorder.wait_for_finalization(Settings.RECORDING_CLOSE_WAIT)
+                except KeyboardInterrupt:
+                    finished = False
+                if not finished:
+                    cancelled = self.video_recorder.cancel_finalization()
+                    print(f"🚫 Cancelled finalization of {cancelled} recording(s), the video-only files are kept")
+        except Exception as e:
+            print(f"❌ Close error: {e}")
+        self.network_manager.shutdown()
         super().on_close()
     
     def run_visualization(self, midi_file=None, audio_file=None):
         # Ensure directories exist
         FileManager.ensure_directories()
+        self.video_recorder.recover_segments(Settings.OUTPUT_VIDEOS_DIR)
         
         # Find files
         midi_path = FileManager.find_midi_file(midi_file)
@@ -268,14 +325,17 @@ class MIDIVisualizer(pyglet.window.Window):
         print("  SPACE - Play/Pause")
         print("  R - Restart")
         print("  V - Start/Stop video recording")
+        print("  C - Cancel background recording finalization")
         print("  F - Toggle fade effects")
+        print("  D - Toggle dynamic resolution")
+        print("  B - Toggle particle budget")
         print("  ESC - Exit")
         print("\nWorkflow:")
         print("  1. Press V (start recording)")
         print("  2. Press SPACE (start music)")
         print("  3. Watch Odin grow with elemental power!")
         print("  4. Press V (stop recording)")
-        print("  5. Get final video with audio - ready for upload!")
+        print("  5. Get final video with audio - ready for upload! (finished in the background)")
         
         pyglet.app.run()
 
@@ -0,0 +1,166 @@
+import collections
+import threading
+import time
+import numpy as np
+
+class CapturePipeline:
+    """Frames copied into pooled buffers on the render thread, converted and encoded by writer threads
+
+    Every capture carries the video frame indices it stands for (several when the render fell behind). A frame
+    dropped by the drop policy hands its indices to a neighbouring frame, so the video keeps its timeline.
+    """
+    DROP_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+    def __init__(self, frame_shape, convert, write, depth=8, writers=2, drop_policy="block"):
+        if drop_policy not in self.DROP_POLICIES:
+            raise ValueError(f"Unknown capture drop policy: {drop_policy}")
+        self.convert = convert  # (buffer) -> encoder-ready frame, runs on a writer thread
+        self.write = write      # (frame) -> success, called in capture order, once per frame index
+        self.depth = depth
+        self.drop_policy = drop_policy
+
+        # Every buffer is either free, queued or held by a writer
+        self.buffers = [np.empty(frame_shape, np.uint8) for _ in range(depth + writers)]
+        self.free = list(range(len(self.buffers)))
+        self.queued = collections.deque()  # (sequence, buffer index, frame indices)
+        self.carried = []  # Frame indices of a dropped capture, given to the next one submitted
+        self.condition = threading.Condition()
+        self.next_sequence = 0  # Given to the next captured frame
+        self.next_write = 0     # Sequence the encoder is waiting for
+        self.skipped = set()    # Dropped sequences the encoder must step over
+        self.running = True
+
+        # Live stats
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.write_failures = 0
+        self.error = None      # First exception a writer thread caught (the take keeps its timeline)
+        self.convert_ms = 0.0  # Moving averages
+        self.encode_ms = 0.0
+
+        self.threads = [
+            threading.Thread(target=self._writer, name=f"capture-writer-{i}", daemon=True) for i in range(writers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fill, frame_indices=(0,)):
+        """Render thread: fill(buffer) copies the frame into a free buffer, returns False if the frame was dropped"""
+        frame_indices = list(frame_indices)
+        with self.condition:
+            index = self._acquire()
+            if index is None:
+                self.frames_dropped += 1
+                if self.queued:
+                    self.queued[-1][2].extend(frame_indices)  # The previous frame covers its slots
+                else:
+                    self.carried.extend(frame_indices)
+                return False
+        try:
+            fill(self.buffers[index])
+        except Exception:
+            with self.condition:
+                self.free.append(index)
+                self.condition.notify_all()
+            raise
+        with self.condition:
+            self.queued.append((self.next_sequence, index, self.carried + frame_indices))
+            self.carried = []
+            self.next_sequence += 1
+            self.condition.notify_all()
+        return True
+
+    def _acquire(self):
+        """Free buffer index under the drop policy (caller holds the condition), None = drop this frame"""
+        if len(self.queued) >= self.depth or not self.free:
+            if self.drop_policy == "drop_newest":
+                return None
+            if self.drop_policy == "drop_oldest" and self.queued:
+                sequence, index, frame_indices = self.queued.popleft()
+                if self.queued:
+                    self.queued[0][2][:0] = frame_indices  # The next frame covers its slots
+                else:
+                    self.carried.extend(frame_indices)
+                self.skipped.add(sequence)
+                self.frames_dropped += 1
+                self.condition.notify_all()
+                return index
+            while (len(self.queued) >= self.depth or not self.free) and self.running:  # Backpressure
+                self.condition.wait()
+        return self.free.pop() if self.free else None
+
+    def _writer(self):
+        while True:
+            with self.condition:
+                while not self.queued and self.running:
+                    self.condition.wait()
+                if not self.queued:
+                    return
+                sequence, index, frame_indices = self.queued.popleft()
+                self.condition.notify_all()
+
+            start = time.perf_counter()
+            try:
+                frame = self.convert(self.buffers[index])
+            except Exception as e:
+                frame = None
+                self._record_error(e)
+            convert_ms = (time.perf_counter() - start) * 1000
+            with self.condition:
+                self.free.append(index)
+                self.convert_ms += (convert_ms - self.convert_ms) * 0.1
+
+                # Frames are encoded in capture order, whichever writer converted them
+                while self.next_write != sequence:
+                    if self.next_write in self.skipped:
+                        self.skipped.discard(self.next_write)
+                        self.next_write += 1
+                        continue
+                    self.condition.wait()
+
+            # Only this writer holds the next sequence, so the encoder is used by one thread at a time.
+            # A failure is counted and the sequence still advances, the other writers never wait on it forever.
+            start = time.perf_counter()
+            written = False
+            if frame is not None:
+                try:
+                    written = all([self.write(frame) is not False for _ in frame_indices])
+                except Exception as e:
+                    self._record_error(e)
+            encode_ms = (time.perf_counter() - start) * 1000 / max(1, len(frame_indices))
+            with self.condition:
+                if written:
+                    self.frames_written += len(frame_indices)
+                else:
+                    self.write_failures += 1
+                self.encode_ms += (encode_ms - self.encode_ms) * 0.1
+                self.next_write += 1
+                self.condition.notify_all()
+
+    def _record_error(self, error):
+        """Writer thread: keep and report the first error, later ones only show in the failure count"""
+        with self.condition:
+            first = self.error is None
+            if first:
+                self.error = error
+        if first:
+            print(f"❌ Capture writer error: {error}")
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                'queue_depth': len(self.queued),
+                'written': self.frames_written,
+                'dropped': self.frames_dropped,
+                'failed': self.write_failures,
+                'convert_ms': self.convert_ms,
+                'encode_ms': self.encode_ms,
+            }
+
+    def close(self):
+        """Encode everything still queued, then stop the writers"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
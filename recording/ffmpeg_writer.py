@@ -0,0 +1,68 @@
+import shutil
+import subprocess
+
+class FFmpegWriter:
+    """Raw frames piped into one ffmpeg process that encodes them and muxes the audio in the same pass
+    (used like cv2.VideoWriter: isOpened / write / release)"""
+    INPUT_FORMATS = ("yuv420p", "bgr24")
+
+    def __init__(self, filename, width, height, fps, audio_file=None, pixel_format="yuv420p", preset="medium",
+                 crf=18, movflags="+faststart", codec="libx264"):
+        if pixel_format not in self.INPUT_FORMATS:
+            raise ValueError(f"Unknown ffmpeg input pixel format: {pixel_format}")
+        self.filename = filename
+        self.pixel_format = pixel_format
+        self.audio_file = audio_file
+
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', pixel_format, '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        ]
+        if audio_file:
+            cmd += ['-i', audio_file]
+        if codec == "ffv1":
+            # Lossless intra-only intermediate (bgr24 is stored as bgr0), sliced so it encodes on several cores
+            cmd += ['-c:v', 'ffv1', '-level', '3', '-g', '1', '-slices', '16', '-threads', '0',
+                    '-pix_fmt', 'yuv420p' if pixel_format == "yuv420p" else 'bgr0']
+        else:
+            # Scaled to 1080p like the two-pass final encode (the lossless intermediate keeps the capture size)
+            cmd += ['-vf', 'scale=1920:1080', '-c:v', 'libx264', '-preset', preset, '-crf', str(crf), '-pix_fmt', 'yuv420p']
+        if audio_file:
+            cmd += ['-c:a', 'aac', '-shortest']
+        if movflags:  # MP4 only
+            cmd += ['-movflags', movflags]
+        cmd += [filename]
+
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    @staticmethod
+    def available():
+        return shutil.which('ffmpeg') is not None
+
+    def isOpened(self):
+        return self.process.poll() is None
+
+    def write(self, frame):
+        """Send one frame, already in the input pixel format (False once ffmpeg has gone away)"""
+        try:
+            self.process.stdin.write(memoryview(frame).cast('B'))
+            return True
+        except (BrokenPipeError, ValueError):
+            return False
+
+    def release(self):
+        """Close the pipe and wait for ffmpeg to finish the file"""
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        errors = self.process.stderr.read().decode(errors='replace').strip()
+        self.process.wait()
+        if self.process.returncode != 0:
+            print(f"⚠️  ffmpeg exited with {self.process.returncode}: {errors}")
+        return self.process.returncode == 0
+
+    def terminate(self):
+        """Stop ffmpeg without finishing the file (cancelled recording)"""
+        if self.process.poll() is None:
+            self.process.terminate()
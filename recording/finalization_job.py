@@ -0,0 +1,371 @@
+import os
+import subprocess
+import threading
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+
+class FinalizationJob(threading.Thread):
+    """Finishes a stopped recording off the render thread: drain the capture queue, close the file, mux the audio"""
+    # The delivery encode of OpenCV and lossless recordings
+    FINAL_ENCODE = ['-vf', 'scale=1920:1080', '-c:v', 'libx264', '-preset', 'medium', '-crf', '18',
+                    '-pix_fmt', 'yuv420p']
+    PROGRESS_STAGES = {"muxing": "MUX", "stitching": "STITCH", "chunk encoding": "ENCODE"}
+
+    def __init__(self, pipeline, writer, output_filename, audio_file=None, audio_muxed=False, duration=0.0,
+                 timeout=None, duplicated=0, manifest=None, encoders=0, chunk_seconds=10.0, timeout_per_second=0):
+        super().__init__(name="recording-finalizer", daemon=True)
+        self.pipeline = pipeline
+        self.writer = writer
+        self.output_filename = output_filename
+        self.audio_file = audio_file
+        self.audio_muxed = audio_muxed  # The writer already encoded the audio in
+        self.duration = duration        # Seconds of video, for the mux progress
+        self.timeout = timeout          # Seconds per ffmpeg run, None = no limit
+        self.timeout_per_second = timeout_per_second  # Added per second of video, long takes encode for longer
+        self.duplicated = duplicated    # Frames repeated to fill gaps, for the summary
+        self.manifest = manifest        # Segmented take: the segments are stitched into output_filename
+        # ffmpeg processes for a lossless take's final encode, each x264 given its share of the cores
+        cores = os.cpu_count() or 1
+        self.encoders = encoders or max(1, cores // 4)
+        self.encoder_threads = max(1, cores // self.encoders)
+        self.chunk_seconds = chunk_seconds
+
+        self.stage = "queued"
+        self.progress = 0.0
+        self.final_output = None
+        self.cancelled = threading.Event()
+        self.processes = set()  # Running ffmpeg, so cancel() and the timeout can stop them
+        self.lock = threading.Lock()
+        self.stop_reason = None  # "cancelled", "timed out" or "failed" - the first one stops every process
+        self.errors = ""
+
+    def get_status(self):
+        """Short status for the SYSTEM panel"""
+        if self.stage in self.PROGRESS_STAGES:
+            return f"{self.PROGRESS_STAGES[self.stage]} {self.progress * 100:.0f}%"
+        return self.stage.upper()
+
+    def cancel(self):
+        self.cancelled.set()
+        self._halt("cancelled")
+        if hasattr(self.writer, 'terminate'):
+            self.writer.terminate()
+
+    def run(self):
+        try:
+            self.stage = "encoding"
+            if self.pipeline:
+                # Let the writers finish what is queued before the file is closed
+                self.pipeline.close()
+                stats = self.pipeline.get_stats()
+                print(f"📊 Capture: {stats['written']} written, {stats['dropped']} dropped, {stats['failed']} failed, "
+                      f"{self.duplicated} duplicated | "
+                      f"convert {stats['convert_ms']:.1f} ms, encode {stats['encode_ms']:.1f} ms")
+            if self.writer:
+                self.writer.release()
+            if self.cancelled.is_set():
+                self.stage = "cancelled"
+                print(f"🚫 Finalization cancelled: {self.output_filename}")
+                return
+            if self.manifest:
+                self.stitch_segments()
+                return
+
+            if not (self.output_filename and os.path.exists(self.output_filename)):
+                self.stage = "failed"
+                print("❌ Video file not found")
+                return
+            file_size = os.path.getsize(self.output_filename) / (1024 * 1024)
+            print(f"📁 Video file: {self.output_filename} ({file_size:.1f} MB)")
+
+            # Automatically combine with audio
+            if self.audio_muxed:
+                print("🎉 Video and audio encoded in one pass!")
+            elif self.audio_file:
+                self.stage = "muxing"
+                self.combine_with_audio()
+                return
+            else:
+                print("🎬 Video-only file ready!")
+            self.final_output = self.output_filename
+            self.stage = "done"
+        except Exception as e:
+            self.stage = "failed"
+            print(f"❌ Finalization error: {e}")
+
+    def combine_with_audio(self):
+        """Combine video with audio using ffmpeg, following its progress output"""
+        if not self.ffmpeg_available():
+            print("ℹ️  ffmpeg not found - keeping video-only file")
+            print("   Install ffmpeg to get video+audio output")
+            self.final_output = self.output_filename
+            self.stage = "done"
+            return
+
+        base_name = self.output_filename.replace('.mp4', '')
+        final_output = f"{base_name}_with_audio.mp4"
+
+        print("🎵 Combining video with audio...")
+
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error', '-nostats', '-progress', 'pipe:1',
+            '-i', self.output_filename,
+            '-i', self.audio_file,
+            '-vf', 'scale=1920:1080', # Force scale to 1080p
+            '-c:v', 'libx264',
+            '-c:a', 'aac',
+            '-preset', 'medium',
+            '-crf', '18',
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            '-shortest',
+            final_output
+        ]
+
+        if self._run_ffmpeg(cmd, final_output):
+            file_size = os.path.getsize(final_output) / (1024 * 1024)
+            print(f"🎉 Final video with audio: {final_output}")
+            print(f"   File size: {file_size:.1f} MB")
+            print(f"   Ready for YouTube upload!")
+            self.final_output = final_output
+            self.stage = "done"
+
+            try:
+                os.remove(self.output_filename)
+                print(f"   Cleaned up: {self.output_filename}")
+            except:
+                pass
+        else:
+            self._report_stop("Audio mux")
+            print(f"   Keeping video-only file: {self.output_filename}")
+            self.final_output = self.output_filename
+
+    def stitch_segments(self):
+        """Concatenate the take's segments into one file, muxing the audio in the same pass"""
+        segments = self.manifest.stitchable_segments()
+        if not segments:
+            self.stage = "failed"
+            print(f"❌ No complete segments in {self.manifest.path}")
+            return
+        self.duration = self.manifest.duration
+        print(f"🧩 Stitching {len(segments)} segment(s)" + (f" ({self.duration:.1f}s of video)..." if self.duration else "..."))
+
+        chunks = []
+        if not self.ffmpeg_available():
+            print("ℹ️  ffmpeg not found - stitching with OpenCV (video only, re-encoded)")
+            self.stage = "stitching"
+            final_output = self._stitch_with_opencv(segments)
+        elif self.manifest.data['intermediate']:
+            # Lossless segments: the slow delivery encode runs as concurrent chunks, which are then only copied
+            chunks = self._encode_chunks(segments) or []
+            final_output = None
+            if chunks:
+                self.stage = "stitching"
+                final_output = self._stitch_with_ffmpeg(chunks, encoded=True)
+        else:
+            self.stage = "stitching"
+            final_output = self._stitch_with_ffmpeg(segments, encoded=self.manifest.data['backend'] == "ffmpeg")
+        for path in chunks:
+            os.remove(path)
+
+        if final_output:
+            self.manifest.remove()
+            file_size = os.path.getsize(final_output) / (1024 * 1024)
+            print(f"🎉 Final video: {final_output} ({file_size:.1f} MB)")
+            self.final_output = final_output
+            self.stage = "done"
+        else:
+            print(f"   Segments kept, listed in {self.manifest.path}")
+
+    def _stitch_with_ffmpeg(self, segments, encoded):
+        """Concat demuxer: encoded (x264) inputs are copied as they are, the others get the final encode"""
+        final_output = self.output_filename
+        if self.audio_file:
+            final_output = f"{os.path.splitext(self.output_filename)[0]}_with_audio.mp4"
+        list_path = f"{os.path.splitext(self.output_filename)[0]}.segments.txt"
+        with open(list_path, 'w') as f:
+            for path in segments:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-nostats', '-progress', 'pipe:1',
+               '-f', 'concat', '-safe', '0', '-i', list_path]
+        if self.audio_file:
+            cmd += ['-i', self.audio_file, '-map', '0:v', '-map', '1:a']
+        cmd += ['-c:v', 'copy'] if encoded else self.FINAL_ENCODE
+        if self.audio_file:
+            cmd += ['-c:a', 'aac', '-shortest']
+        cmd += ['-movflags', '+faststart', final_output]
+
+        stitched = self._run_ffmpeg(cmd, final_output)
+        os.remove(list_path)
+        if not stitched:
+            self._report_stop("Segment stitch")
+        return final_output if stitched else None
+
+    def _plan_chunks(self, segments):
+        """(segment, first frame, frames) pieces of at most chunk_seconds - lossless frames are all keyframes,
+        so every cut is GOP-aligned"""
+        chunk_frames = max(1, round(self.chunk_seconds * self.manifest.data['fps']))
+        frame_counts = {segment['file']: segment['frames'] for segment in self.manifest.data['segments']}
+        chunks = []
+        for path in segments:
+            frames = frame_counts.get(os.path.basename(path), 0)
+            if frames <= 0:
+                # Cut off by a crash, count what the file holds (a truncated file may not know its length)
+                capture = cv2.VideoCapture(path)
+                frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+                if frames <= 0:
+                    frames = 0
+                    while capture.grab():
+                        frames += 1
+                capture.release()
+            chunks += [(path, start, min(chunk_frames, frames - start)) for start in range(0, frames, chunk_frames)]
+        return chunks
+
+    def _encode_chunks(self, segments):
+        """Encode every chunk with up to `encoders` ffmpeg processes at once, the chunk files in order (None if
+        one failed)"""
+        chunks = self._plan_chunks(segments)
+        if not chunks:
+            self.stage = "failed"
+            print("❌ The segments hold no frames")
+            return None
+        fps = self.manifest.data['fps']
+        self.duration = sum(frames for _, _, frames in chunks) / fps
+        base = os.path.splitext(self.output_filename)[0]
+        outputs = [f"{base}.chunk{number:04d}.mp4" for number in range(len(chunks))]
+        encoded_seconds = [0.0] * len(chunks)
+        print(f"⚙️  Encoding {len(chunks)} chunks with {min(self.encoders, len(chunks))} ffmpeg processes "
+              f"({self.encoder_threads} threads each)...")
+        self.stage = "chunk encoding"
+
+        def encode(number):
+            path, start, frames = chunks[number]
+
+            def on_progress(seconds):
+                encoded_seconds[number] = seconds
+                self.progress = min(1.0, sum(encoded_seconds) / max(self.duration, 1e-9))
+
+            # Input seeking lands exactly on the chunk's first frame, every lossless frame being a keyframe
+            cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-nostats', '-progress', 'pipe:1',
+                   '-ss', f"{start / fps:.6f}", '-i', path, '-frames:v', str(frames), *self.FINAL_ENCODE,
+                   '-threads', str(self.encoder_threads), '-an', outputs[number]]
+            return self._run_ffmpeg(cmd, outputs[number], on_progress)
+
+        with ThreadPoolExecutor(self.encoders) as pool:
+            encoded = list(pool.map(encode, range(len(chunks))))
+        if all(encoded):
+            return outputs
+        self._report_stop("Chunk encode")
+        for path in outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        return None
+
+    def _stitch_with_opencv(self, segments):
+        """Decode every segment and write one video-only file (lossy, only without ffmpeg)"""
+        data = self.manifest.data
+        codec = 'mp4v' if data['intermediate'] else data['codec']
+        writer = cv2.VideoWriter(self.output_filename, cv2.VideoWriter_fourcc(*codec), data['fps'],
+                                 (data['width'], data['height']))
+        if not writer.isOpened():
+            self.stage = "failed"
+            print(f"❌ Could not open {self.output_filename} with {codec}")
+            return None
+        total = max(1, self.manifest.frames)
+        frames = 0
+        try:
+            for path in segments:
+                capture = cv2.VideoCapture(path)
+                while not self.cancelled.is_set():
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    writer.write(frame)
+                    frames += 1
+                    self.progress = min(1.0, frames / total)
+                capture.release()
+        finally:
+            writer.release()
+        if self.cancelled.is_set():
+            self.stage = "cancelled"
+            print("🚫 Segment stitch cancelled")
+            os.remove(self.output_filename)
+            return None
+        if self.audio_file:
+            print("   Install ffmpeg to get video+audio output")
+        return self.output_filename
+
+    @staticmethod
+    def ffmpeg_available():
+        try:
+            subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return False
+
+    def _run_ffmpeg(self, cmd, output, on_progress=None):
+        """Run ffmpeg under the cancel flag and the timeout, following its -progress output, True if it finished"""
+        with self.lock:
+            if self.stop_reason:
+                return False
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            self.processes.add(process)
+        watchdog = None
+        if self.timeout:
+            watchdog = threading.Timer(self.run_timeout(), self._halt, ("timed out",))
+            watchdog.start()
+        try:
+            # -progress writes key=value lines, out_time_us is how far the encode got
+            for line in process.stdout:
+                key, _, value = line.strip().partition('=')
+                if key == 'out_time_us' and value.isdigit():
+                    if on_progress:
+                        on_progress(int(value) / 1e6)
+                    elif self.duration > 0:
+                        self.progress = min(1.0, int(value) / 1e6 / self.duration)
+            errors = process.stderr.read()
+            process.wait()
+        finally:
+            if watchdog:
+                watchdog.cancel()
+            with self.lock:
+                self.processes.discard(process)
+
+        if process.returncode == 0 and not self.stop_reason:
+            return True
+        if self._halt("failed"):
+            self.errors = errors
+        try:
+            os.remove(output)  # Partial output
+        except OSError:
+            pass
+        return False
+
+    def run_timeout(self):
+        """Seconds one ffmpeg run may take, grows with the length of the take"""
+        return self.timeout + self.duration * self.timeout_per_second
+
+    def _halt(self, reason):
+        """Stop every running ffmpeg, True for the first reason given"""
+        with self.lock:
+            if self.stop_reason:
+                return False
+            self.stop_reason = reason
+            for process in self.processes:
+                if process.poll() is None:
+                    if reason == "timed out":
+                        process.kill()
+                    else:
+                        process.terminate()
+        return True
+
+    def _report_stop(self, label):
+        self.stage = self.stop_reason or "failed"
+        if self.stop_reason == "cancelled":
+            print(f"🚫 {label} cancelled")
+        elif self.stop_reason == "timed out":
+            print(f"⚠️  ffmpeg timed out after {self.run_timeout():.0f}s")
+        else:
+            print(f"⚠️  ffmpeg failed: {self.errors}")
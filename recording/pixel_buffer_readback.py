@@ -0,0 +1,62 @@
+import ctypes
+from pyglet import gl
+
+class PixelBufferReadback:
+    """Asynchronous readback through a ring of pixel pack buffers - each frame is copied out a few frames later,
+    so glReadPixels only queues a transfer instead of waiting for the GPU to finish"""
+    def __init__(self, width, height, count=2):
+        self.width = width
+        self.height = height
+        self.size = width * height * 3  # BGR, rows packed
+        self.buffers = (gl.GLuint * max(2, count))()
+        gl.glGenBuffers(len(self.buffers), self.buffers)
+        for pbo in self.buffers:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
+            gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, self.size, None, gl.GL_STREAM_READ)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        self.tags = [None] * len(self.buffers)  # Caller data travelling with each transfer
+        self.next_read = 0  # Transfers issued
+        self.next_copy = 0  # Transfers copied out (or discarded)
+
+    @property
+    def in_flight(self):
+        return self.next_read - self.next_copy
+
+    @property
+    def oldest_tag(self):
+        return self.tags[self.next_copy % len(self.buffers)]
+
+    def read(self, tag=None):
+        """Queue this frame's transfer, True when the oldest one is due to be copied out"""
+        if self.in_flight == len(self.buffers):
+            self.discard_oldest()  # Never overwrite a transfer nobody collected
+        slot = self.next_read % len(self.buffers)
+        self.tags[slot] = tag
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        gl.glReadBuffer(gl.GL_BACK)
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        gl.glReadPixels(0, 0, self.width, self.height, gl.GL_BGR, gl.GL_UNSIGNED_BYTE, 0)  # Offset into the PBO
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self.next_read += 1
+        return self.in_flight == len(self.buffers)
+
+    def copy_oldest(self, buffer):
+        """Map the oldest transfer and copy it into buffer (bottom row first, like glReadPixels)"""
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.buffers[self.next_copy % len(self.buffers)])
+        try:
+            pointer = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, self.size, gl.GL_MAP_READ_BIT)
+            if not pointer:
+                raise RuntimeError("Pixel buffer could not be mapped")
+            ctypes.memmove(buffer.ctypes.data, pointer, self.size)
+            gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        finally:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+            self.next_copy += 1
+
+    def discard_oldest(self):
+        self.next_copy += 1
+
+    def delete(self):
+        gl.glDeleteBuffers(len(self.buffers), self.buffers)
+        self.buffers = (gl.GLuint * 0)()
@@ -0,0 +1,123 @@
+import glob
+import json
+import os
+
+class RecordingManifest:
+    """JSON record of a segmented take: its settings and which segment files are complete, so the segments can be
+    stitched after a crash without rendering again"""
+    SUFFIX = ".segments.json"
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+
+    @classmethod
+    def create(cls, output_filename, width, height, fps, backend, codec, audio_file=None, segment_frames=0,
+               fragmented=False, intermediate=None):
+        manifest = cls(f"{os.path.splitext(output_filename)[0]}{cls.SUFFIX}", {
+            'output': os.path.basename(output_filename),
+            'width': width,
+            'height': height,
+            'fps': fps,
+            'backend': backend,            # "ffmpeg" segments are x264 and concatenate without re-encoding
+            'codec': codec,                # Pipe pixel format (ffmpeg) or fourcc (OpenCV)
+            'intermediate': intermediate,  # Lossless codec ("ffv1") - the final encode happens when stitching
+            'extension': cls.segment_extension(output_filename, intermediate),
+            'fragmented': fragmented,      # An unfinished segment plays up to its last fragment (fragmented MP4, Matroska)
+            'audio_file': audio_file,      # Muxed in when the segments are stitched
+            'segment_frames': segment_frames,
+            'segments': [],
+            'finished': False,             # Set when the take was stopped normally
+        })
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(path, json.load(f))
+
+    @classmethod
+    def find_unfinished(cls, directory):
+        """Manifests of takes that never reached stop_recording"""
+        manifests = []
+        for path in sorted(glob.glob(os.path.join(directory, f"*{cls.SUFFIX}"))):
+            try:
+                manifest = cls.load(path)
+            except (OSError, ValueError):
+                continue
+            if not manifest.data['finished']:
+                manifests.append(manifest)
+        return manifests
+
+    @property
+    def output_filename(self):
+        return os.path.join(os.path.dirname(self.path), self.data['output'])
+
+    @property
+    def frames(self):
+        return sum(segment['frames'] for segment in self.data['segments'])
+
+    @property
+    def duration(self):
+        return self.frames / self.data['fps']
+
+    @staticmethod
+    def segment_extension(output_filename, intermediate=None):
+        """Lossless segments go in Matroska, which also stays readable when cut off"""
+        return ".mkv" if intermediate else os.path.splitext(output_filename)[1]
+
+    @staticmethod
+    def segment_filename(output_filename, number, extension):
+        return f"{os.path.splitext(output_filename)[0]}.seg{number:04d}{extension}"
+
+    def segment_path(self, number):
+        return self.segment_filename(self.output_filename, number, self.data['extension'])
+
+    def open_segment(self):
+        """Register the next segment file (unfinished until close_segment), returns its path"""
+        path = self.segment_path(len(self.data['segments']))
+        self.data['segments'].append({'file': os.path.basename(path), 'frames': 0, 'complete': False})
+        self.save()
+        return path
+
+    def close_segment(self, frames, number=-1):
+        segment = self.data['segments'][number]
+        segment['frames'] = frames
+        segment['complete'] = True
+        self.save()
+
+    def finish(self):
+        self.data['finished'] = True
+        self.save()
+
+    def stitchable_segments(self):
+        """Paths of the segments worth stitching, in order"""
+        directory = os.path.dirname(self.path)
+        paths = []
+        for segment in self.data['segments']:
+            path = os.path.join(directory, segment['file'])
+            if not (os.path.exists(path) and os.path.getsize(path) > 0):
+                continue
+            if segment['complete'] and segment['frames'] > 0:
+                paths.append(path)
+            elif not segment['complete'] and self.data['fragmented']:
+                paths.append(path)  # Cut off mid-segment, but every finished fragment plays
+        return paths
+
+    def save(self):
+        """Written to a temporary file and renamed, a crash never leaves half a manifest"""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        """Delete the segments and the manifest once they are stitched"""
+        directory = os.path.dirname(self.path)
+        for segment in self.data['segments']:
+            try:
+                os.remove(os.path.join(directory, segment['file']))
+            except OSError:
+                pass
+        os.remove(self.path)
@@ -0,0 +1,60 @@
+import threading
+
+class SegmentedWriter:
+    """Video writer that starts a new file every segment_frames frames and records each one in a manifest
+    (used like cv2.VideoWriter: isOpened / write / release)"""
+    def __init__(self, manifest, open_segment, segment_frames, first_writer=None):
+        self.manifest = manifest
+        self.open_segment = open_segment  # (path) -> writer for the next segment, None if it failed
+        self.segment_frames = segment_frames
+        self.writer = first_writer        # Already opened on manifest.segment_path(0)
+        self.frames = 0                   # Written to the current segment
+        self.number = 0                   # Manifest index of the current segment
+        self.closers = []                 # Threads finishing earlier segments in the background
+        self.lock = threading.Lock()      # The manifest is saved from the writer and closer threads
+        if first_writer is not None:
+            manifest.open_segment()
+
+    def isOpened(self):
+        return self.writer is None or self.writer.isOpened()
+
+    def write(self, frame):
+        if self.writer is None:
+            with self.lock:
+                path = self.manifest.open_segment()
+                self.number = len(self.manifest.data['segments']) - 1
+            self.writer = self.open_segment(path)
+            if self.writer is None:
+                return False
+        if self.writer.write(frame) is False:
+            return False
+        self.frames += 1
+        if self.frames == self.segment_frames:
+            self._close_segment()
+        return True
+
+    def _close_segment(self):
+        """Hand the full segment to a closer thread - the encoder flushes while the next segment is written"""
+        closer = threading.Thread(target=self._finish_segment, args=(self.writer, self.number, self.frames),
+                                  name="segment-closer", daemon=True)
+        closer.start()
+        self.closers = [thread for thread in self.closers if thread.is_alive()] + [closer]
+        self.writer = None
+        self.frames = 0
+
+    def _finish_segment(self, writer, number, frames):
+        """Closer thread: the segment counts as complete once its file is"""
+        writer.release()
+        with self.lock:
+            self.manifest.close_segment(frames, number)
+
+    def release(self):
+        if self.writer is not None:
+            self._close_segment()
+        for closer in self.closers:
+            closer.join()
+        self.manifest.finish()
+
+    def terminate(self):
+        if hasattr(self.writer, 'terminate'):
+            self.writer.terminate()
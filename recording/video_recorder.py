@@ -1,22 +1,43 @@
-import os
+import math
+import functools
 import numpy as np
+import threading
 import time
 import cv2
-import pyglet
-import PIL.Image
-from config.settings import Settings
+from pyglet import gl
+from config.settings                 import Settings
+from recording.capture_pipeline       import CapturePipeline
+from recording.ffmpeg_writer         import FFmpegWriter
+from recording.finalization_job      import FinalizationJob
+from recording.pixel_buffer_readback import PixelBufferReadback
+from recording.recording_manifest    import RecordingManifest
+from recording.segmented_writer      import SegmentedWriter
 
 class VideoRecorder:
+    # Segments are fragmented MP4, a crash mid-segment still leaves its finished fragments playable
+    SEGMENT_MOVFLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+    OPENCV_CODECS = ['H264', 'mp4v', 'MJPG', 'XVID']
+
     def __init__(self, target_fps=Settings.DEFAULT_TARGET_FPS):
         # Recording
         self.recording = False
         self.video_writer = None
+        self.capture_pipeline = None  # Writer threads between the render loop and the video writer
+        self.readback = None          # Pixel buffer ring, None = direct glReadPixels
         self.output_filename = None
         self.frames_recorded = 0
         self.recording_start_time = None
         self.target_fps = target_fps
-        self.frame_time_accumulator = 0.0
+        self.next_frame_index = 0     # Video frames are indexed by audio time: N = floor(audio_time * fps)
+        self.next_progress_frame = 0
+        self.frames_duplicated = 0    # Repeated to fill frames the render skipped past
         self.original_audio_file = None
+        self.flipped_frames = threading.local()  # Each writer thread's output buffers
+        self.output_format = "bgr24"  # What _convert_frame hands the writer
+        self.audio_muxed = False      # The writer already put the audio in the file
+        self.writer_codec = None      # fourcc the OpenCV writer opened with
+        self.manifest = None          # Segment record of a segmented take
+        self.finalization_jobs = []   # Stopped takes still being encoded/muxed in the background
 
     def start_recording(self, filename, window_width, window_height):
         if self.recording:
@@ -25,28 +46,124 @@ class VideoRecorder:
         
         print(f"Setting up recording: {filename}")
         
-        for codec in ['H264', 'mp4v', 'MJPG', 'XVID']:
+        # A segmented take writes numbered files listed in a manifest, the audio goes in when they are stitched.
+        # A lossless take is always segmented, its final encode runs in parallel chunks when it is stitched.
+        segment_frames = round(Settings.RECORDING_SEGMENT_SECONDS * self.target_fps)
+        intermediate = Settings.RECORDING_INTERMEDIATE
+        segmented = segment_frames > 0 or intermediate is not None
+        first_file = filename
+        audio_file = self.original_audio_file
+        movflags = "+faststart"
+        if segmented:
+            first_file = RecordingManifest.segment_filename(
+                filename, 0, RecordingManifest.segment_extension(filename, intermediate))
+            audio_file = None
+            movflags = None if intermediate else self.SEGMENT_MOVFLAGS
+
+        writer = None
+        backend = "ffmpeg"
+        if Settings.RECORDING_BACKEND == "ffmpeg":
+            writer = self._create_ffmpeg_writer(first_file, window_width, window_height, audio_file, movflags,
+                                                intermediate or "libx264")
+        if writer is None:
+            backend = "opencv"
+            writer = self._create_opencv_writer(first_file, window_width, window_height,
+                                                [intermediate.upper()] if intermediate else self.OPENCV_CODECS)
+        if writer is None:
+            print("❌ All codecs failed!")
+            return False
+
+        self.manifest = None
+        if segmented:
+            codec = self.output_format if backend == "ffmpeg" else self.writer_codec
+            self.manifest = RecordingManifest.create(filename, window_width, window_height, self.target_fps, backend,
+                                                     codec, self.original_audio_file, segment_frames,
+                                                     backend == "ffmpeg" or intermediate is not None, intermediate)
+            writer = SegmentedWriter(
+                self.manifest,
+                functools.partial(self._open_segment, backend, codec, intermediate, window_width, window_height),
+                segment_frames, writer
+            )
+            if segment_frames > 0:
+                print(f"🧩 Recording in {Settings.RECORDING_SEGMENT_SECONDS}s segments: {self.manifest.path}")
+            if intermediate:
+                print(f"💾 Lossless {intermediate} capture, final encode when the recording stops")
+
+        self.video_writer = writer
+        # Bound to this take, an earlier one may still be finishing on its own writer threads
+        self.capture_pipeline = CapturePipeline(
+            (window_height, window_width, 3), functools.partial(self._convert_frame, self.output_format), writer.write,
+            Settings.RECORDING_QUEUE_DEPTH, Settings.RECORDING_WRITER_THREADS, Settings.RECORDING_DROP_POLICY
+        )
+        self.readback = self._create_readback(window_width, window_height)
+        self.recording = True
+        self.output_filename = filename
+        self.frames_recorded = 0
+        self.recording_start_time = None
+        self.next_frame_index = 0
+        self.next_progress_frame = self.target_fps
+        self.frames_duplicated = 0
+        return True
+
+    def _create_ffmpeg_writer(self, filename, width, height, audio_file, movflags="+faststart", codec="libx264"):
+        """One ffmpeg process encoding the piped frames and muxing the audio, None if unavailable"""
+        if not FFmpegWriter.available():
+            print("ℹ️  ffmpeg not found - recording with OpenCV and muxing audio afterwards")
+            return None
+        # yuv420p halves the pipe traffic of bgr24, but needs even dimensions
+        pixel_format = Settings.RECORDING_PIXEL_FORMAT
+        if pixel_format == "yuv420p" and (width % 2 or height % 2):
+            pixel_format = "bgr24"
+        try:
+            writer = FFmpegWriter(filename, width, height, self.target_fps, audio_file, pixel_format,
+                                  Settings.RECORDING_FFMPEG_PRESET, Settings.RECORDING_FFMPEG_CRF, movflags, codec)
+        except (OSError, ValueError) as e:
+            print(f"❌ ffmpeg exception: {e}")
+            return None
+        if not writer.isOpened():
+            writer.release()
+            return None
+        self.output_format = pixel_format
+        self.audio_muxed = bool(audio_file)
+        print(f"✅ ffmpeg writer created ({codec}, {pixel_format} pipe{', audio muxed' if self.audio_muxed else ''})")
+        return writer
+
+    def _create_opencv_writer(self, filename, width, height, codecs=OPENCV_CODECS):
+        for codec in codecs:
             try:
                 fourcc = cv2.VideoWriter_fourcc(*codec)
-                test_writer = cv2.VideoWriter(filename, fourcc, self.target_fps, (window_width, window_height))
+                test_writer = cv2.VideoWriter(filename, fourcc, self.target_fps, (width, height))
                 
                 if test_writer.isOpened():
                     print(f"✅ Video writer created with {codec}")
-                    self.video_writer = test_writer
-                    self.recording = True
-                    self.output_filename = filename
-                    self.frames_recorded = 0
-                    self.recording_start_time = None
-                    self.frame_time_accumulator = 0.0
-                    return True
+                    self.writer_codec = codec
+                    self.output_format = "bgr24"
+                    self.audio_muxed = False
+                    return test_writer
                 else:
                     test_writer.release()
                     
             except Exception as e:
                 print(f"❌ {codec} exception: {e}")
-        
-        print("❌ All codecs failed!")
-        return False
+        return None
+
+    def _open_segment(self, backend, codec, intermediate, width, height, filename):
+        """Writer thread: next segment of a segmented take, on the backend its first segment opened with"""
+        try:
+            if backend == "ffmpeg":
+                writer = FFmpegWriter(filename, width, height, self.target_fps, None, codec,
+                                      Settings.RECORDING_FFMPEG_PRESET, Settings.RECORDING_FFMPEG_CRF,
+                                      None if intermediate else self.SEGMENT_MOVFLAGS, intermediate or "libx264")
+            else:
+                writer = cv2.VideoWriter(filename, cv2.VideoWriter_fourcc(*codec), self.target_fps, (width, height))
+        except (OSError, ValueError) as e:
+            print(f"❌ Segment writer exception: {e}")
+            return None
+        if not writer.isOpened():
+            print(f"❌ Could not open segment {filename}")
+            writer.release()
+            return None
+        return writer
 
     def stop_recording(self):
         if not self.recording:
@@ -54,28 +171,32 @@ class VideoRecorder:
         
         self.recording = False
         
-        if self.video_writer:
-            self.video_writer.release()
-            self.video_writer = None
-        
-        print(f"✅ Recording stopped. Total frames: {self.frames_recorded}")
-        
-        if self.output_filename and os.path.exists(self.output_filename):
-            file_size = os.path.getsize(self.output_filename) / (1024 * 1024)
-            print(f"📁 Video file: {self.output_filename} ({file_size:.1f} MB)")
-            
-            # Automatically combine with audio
-            if self.original_audio_file:
-                self.combine_with_audio()
-            else:
-                print("🎬 Video-only file ready!")
-        else:
-            print("❌ Video file not found")
-        
+        if self.readback:
+            # Collect the transfers still in flight
+            while self.readback.in_flight:
+                self._submit(self.readback.copy_oldest, self.readback.oldest_tag)
+            self.readback.delete()
+            self.readback = None
+
+        # Everything after the last readback runs in the background, the next take can start right away
+        job = FinalizationJob(
+            self.capture_pipeline, self.video_writer, self.output_filename,
+            self.original_audio_file, self.audio_muxed,
+            self.next_frame_index / self.target_fps, Settings.RECORDING_FINALIZE_TIMEOUT,
+            self.frames_duplicated, self.manifest, Settings.RECORDING_ENCODE_PROCESSES,
+            Settings.RECORDING_ENCODE_CHUNK_SECONDS, Settings.RECORDING_FINALIZE_PER_SECOND
+        )
+        self.finalization_jobs = [j for j in self.finalization_jobs if j.is_alive()] + [job]
+        job.start()
+        self.capture_pipeline = None
+        self.video_writer = None
+        self.manifest = None
+
+        print(f"✅ Recording stopped. Total frames: {self.frames_recorded} (finishing in the background)")
         return True
     
-    def capture_frame(self, dt, window_width, window_height):
-        """Frame capture for recording"""
+    def capture_frame(self, audio_time, window_width, window_height):
+        """Frame capture for recording - this render stands for video frame floor(audio_time * fps)"""
         if not self.recording or not self.video_writer:
             return
         
@@ -83,102 +204,122 @@ class VideoRecorder:
         if self.recording_start_time is None:
             self.recording_start_time = time.time()
             print(f"🎬 Recording started at {self.target_fps} FPS")
-            return
         
-        # Frame timing
-        self.frame_time_accumulator += dt
-        frame_interval = 1.0 / self.target_fps
-        
-        if self.frame_time_accumulator < frame_interval:
-            return
+        # Frame timing follows the audio timeline, not the render clock
+        frame_index = math.floor(audio_time * self.target_fps + 1e-9)
+        if frame_index < self.next_frame_index:
+            return  # Already captured (rendering faster than the video frame rate)
+
+        # Frames the render skipped past are filled with this one, the video stays at a constant rate
+        frame_indices = list(range(self.next_frame_index, frame_index + 1))
+        self.frames_duplicated += frame_index - self.next_frame_index
+        self.next_frame_index = frame_index + 1
         
         try:
-            # Capture frame
-            buffer = pyglet.image.get_buffer_manager().get_color_buffer()
-            image_data = buffer.get_image_data()
-            
-            # Convert to OpenCV format
-            if image_data.format == 'RGBA':
-                rgba_data = image_data.get_data('RGBA', image_data.width * 4)
-                pil_img = PIL.Image.frombytes('RGBA', (image_data.width, image_data.height), rgba_data)
-                pil_img = pil_img.convert('RGB')
+            # Copy the frame out and move on - conversion and encoding happen on the writer threads
+            if self.readback:
+                # This frame's transfer is queued, an earlier one is copied out once it is due
+                if self.readback.read(frame_indices):
+                    self._submit(self.readback.copy_oldest, self.readback.oldest_tag)
             else:
-                rgb_data = image_data.get_data('RGB', image_data.width * 3)
-                pil_img = PIL.Image.frombytes('RGB', (image_data.width, image_data.height), rgb_data)
-            
-            pil_img = pil_img.transpose(PIL.Image.FLIP_TOP_BOTTOM)
-            frame = np.array(pil_img, dtype=np.uint8)
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            
-            # Write frame
-            if self.video_writer.isOpened():
-                result = self.video_writer.write(frame)
-                if result is not False:
-                    self.frames_recorded += 1
-                    self.frame_time_accumulator -= frame_interval
-                    
-                    # Progress update
-                    if self.frames_recorded % self.target_fps == 0:
-                        elapsed_time = time.time() - self.recording_start_time
-                        video_duration = self.frames_recorded / self.target_fps
-                        actual_fps = self.frames_recorded / elapsed_time if elapsed_time > 0 else 0
-                        efficiency = (actual_fps / self.target_fps) * 100
-                        print(f"🎬 Real: {elapsed_time:.1f}s | Video: {video_duration:.1f}s | Frames: {self.frames_recorded} | FPS: {actual_fps:.1f} ({efficiency:.0f}%)")
+                self._submit(self._read_pixels, frame_indices)
+
+            # Progress update
+            if self.frames_recorded >= self.next_progress_frame:
+                self.next_progress_frame += self.target_fps
+                elapsed_time = time.time() - self.recording_start_time
+                video_duration = self.frames_recorded / self.target_fps
+                actual_fps = self.frames_recorded / elapsed_time if elapsed_time > 0 else 0
+                efficiency = (actual_fps / self.target_fps) * 100
+                stats = self.capture_pipeline.get_stats()
+                print(f"🎬 Real: {elapsed_time:.1f}s | Video: {video_duration:.1f}s | Frames: {self.frames_recorded} | FPS: {actual_fps:.1f} ({efficiency:.0f}%) | Queue: {stats['queue_depth']} | Dup: {self.frames_duplicated}")
                 
         except Exception as e:
             print(f"❌ Frame capture error: {e}")
 
-    def combine_with_audio(self):
-        """Combine video with audio using ffmpeg"""
-        if not self.original_audio_file or not self.output_filename:
-            print("ℹ️  No audio to combine")
-            return
-        
+    def _create_readback(self, width, height):
+        if Settings.RECORDING_READBACK != "pbo":
+            return None
         try:
-            import subprocess
-            subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-            
-            base_name = self.output_filename.replace('.mp4', '')
-            final_output = f"{base_name}_with_audio.mp4"
-            
-            print("🎵 Combining video with audio...")
-            
-            cmd = [
-                'ffmpeg', '-y',
-                '-i', self.output_filename,
-                '-i', self.original_audio_file,
-                '-vf', 'scale=1920:1080', # Force scale to 1080p
-                '-c:v', 'libx264',
-                '-c:a', 'aac',
-                '-preset', 'medium',
-                '-crf', '18',
-                '-pix_fmt', 'yuv420p',
-                '-movflags', '+faststart',
-                '-shortest',
-                final_output
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                file_size = os.path.getsize(final_output) / (1024 * 1024)
-                print(f"🎉 Final video with audio: {final_output}")
-                print(f"   File size: {file_size:.1f} MB")
-                print(f"   Ready for YouTube upload!")
-                
-                try:
-                    os.remove(self.output_filename)
-                    print(f"   Cleaned up: {self.output_filename}")
-                except:
-                    pass
-                    
-            else:
-                print(f"⚠️  ffmpeg failed: {result.stderr}")
-                print(f"   Keeping video-only file: {self.output_filename}")
-                
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("ℹ️  ffmpeg not found - keeping video-only file")
-            print("   Install ffmpeg to get video+audio output")
+            readback = PixelBufferReadback(width, height, Settings.RECORDING_PBO_COUNT)
+            print(f"✅ Asynchronous readback with {len(readback.buffers)} pixel buffers")
+            return readback
+        except Exception as e:
+            print(f"⚠️  Pixel buffers unavailable ({e}), reading pixels directly")
+            return None
+
+    def _submit(self, fill, frame_indices):
+        """Hand one capture to the pipeline, False if it was dropped (a neighbouring frame covers its indices)"""
+        self.frames_recorded += len(frame_indices)
+        if not self.capture_pipeline.submit(fill, frame_indices):
+            if fill == getattr(self.readback, 'copy_oldest', None):
+                self.readback.discard_oldest()  # Dropped before it was copied out
+            return False
+        return True
+
+    def _read_pixels(self, buffer):
+        """Render thread: read the back buffer straight into a pooled buffer, already in the writer's BGR"""
+        height, width, _ = buffer.shape
+        gl.glReadBuffer(gl.GL_BACK)
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        gl.glReadPixels(0, 0, width, height, gl.GL_BGR, gl.GL_UNSIGNED_BYTE, buffer.ctypes.data)
+
+    def _convert_frame(self, output_format, buffer):
+        """Writer thread: GL rows run bottom-up, one flip pass (and the YUV conversion for an ffmpeg pipe)"""
+        local = self.flipped_frames
+        if getattr(local, 'frame', None) is None or local.frame.shape != buffer.shape:
+            local.frame = np.empty_like(buffer)
+            height, width, _ = buffer.shape
+            local.yuv = np.empty((height * 3 // 2, width), np.uint8)  # I420: Y plane, then U and V at half size
+        flipped = cv2.flip(buffer, 0, dst=local.frame)
+        if output_format == "yuv420p":
+            return cv2.cvtColor(flipped, cv2.COLOR_BGR2YUV_I420, dst=local.yuv)
+        return flipped
+
+    def get_capture_stats(self):
+        """Queue depth, written/dropped/duplicated frames and conversion/encode times (None when not recording)"""
+        if not self.capture_pipeline:
+            return None
+        stats = self.capture_pipeline.get_stats()
+        stats['duplicated'] = self.frames_duplicated
+        return stats
+
+    def recover_segments(self, directory):
+        """Stitch the segments of takes a crash or kill cut short, in the background"""
+        manifests = RecordingManifest.find_unfinished(directory)
+        for manifest in manifests:
+            print(f"♻️  Stitching interrupted recording: {manifest.output_filename}")
+            job = FinalizationJob(None, None, manifest.output_filename, manifest.data['audio_file'],
+                                  timeout=Settings.RECORDING_FINALIZE_TIMEOUT, manifest=manifest,
+                                  encoders=Settings.RECORDING_ENCODE_PROCESSES,
+                                  chunk_seconds=Settings.RECORDING_ENCODE_CHUNK_SECONDS,
+                                  timeout_per_second=Settings.RECORDING_FINALIZE_PER_SECOND)
+            self.finalization_jobs.append(job)
+            job.start()
+        return len(manifests)
+
+    def get_finalization_status(self):
+        """Status of the stopped takes still finishing, None when there are none"""
+        active = [job for job in self.finalization_jobs if job.is_alive()]
+        if not active:
+            return None
+        status = active[-1].get_status()
+        return f"{status} (+{len(active) - 1})" if len(active) > 1 else status
+
+    def cancel_finalization(self):
+        """Stop the background encode/mux of every stopped take, the video-only files are kept"""
+        active = [job for job in self.finalization_jobs if job.is_alive()]
+        for job in active:
+            job.cancel()
+        return len(active)
+
+    def wait_for_finalization(self, timeout=None):
+        """Block until the stopped takes are finished or timeout seconds have passed (on exit), True if all finished"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in self.finalization_jobs:
+            job.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self.finalization_jobs = [job for job in self.finalization_jobs if job.is_alive()]
+        return not self.finalization_jobs
 
     def is_recording(self):
         return self.recording
@@ -0,0 +1,32 @@
+import sys
+from config.settings              import Settings
+from recording.finalization_job   import FinalizationJob
+from recording.recording_manifest import RecordingManifest
+
+def stitch(manifest):
+    """Concatenate one take's segments (and mux its audio), the way stop_recording would have"""
+    job = FinalizationJob(None, None, manifest.output_filename, manifest.data['audio_file'],
+                          timeout=Settings.RECORDING_FINALIZE_TIMEOUT, manifest=manifest,
+                          encoders=Settings.RECORDING_ENCODE_PROCESSES,
+                          chunk_seconds=Settings.RECORDING_ENCODE_CHUNK_SECONDS,
+                          timeout_per_second=Settings.RECORDING_FINALIZE_PER_SECOND)
+    job.start()
+    job.join()
+    return job.stage == "done"
+
+def main():
+    # Manifests given on the command line, else every unfinished take in the output folder
+    if len(sys.argv) > 1:
+        manifests = [RecordingManifest.load(path) for path in sys.argv[1:]]
+    else:
+        manifests = RecordingManifest.find_unfinished(Settings.OUTPUT_VIDEOS_DIR)
+    if not manifests:
+        print("ℹ️  No segmented recordings to stitch")
+        return
+    failed = [manifest.path for manifest in manifests if not stitch(manifest)]
+    for path in failed:
+        print(f"❌ Not stitched: {path}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
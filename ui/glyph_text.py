@@ -0,0 +1,215 @@
+import pyglet
+from pyglet import gl
+
+_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec2 tex_coords;
+    in vec4 colors;
+
+    out vec2 texture_coords;
+    out vec4 text_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    void main()
+    {
+        gl_Position = window.projection * window.view * vec4(position, 0.0, 1.0);
+        texture_coords = tex_coords;
+        text_colors = colors;
+    }
+"""
+
+_fragment_source = """#version 150 core
+    in vec2 texture_coords;
+    in vec4 text_colors;
+
+    out vec4 final_colors;
+
+    uniform sampler2D glyph_atlas;
+
+    void main()
+    {
+        final_colors = vec4(text_colors.rgb, text_colors.a * texture(glyph_atlas, texture_coords).a);
+    }
+"""
+
+_program = None
+
+def get_glyph_program():
+    """Shader shared by every glyph grid (compiled on first use)"""
+    global _program
+    if _program is None:
+        _program = pyglet.graphics.shader.ShaderProgram(
+            pyglet.graphics.shader.Shader(_vertex_source, 'vertex'),
+            pyglet.graphics.shader.Shader(_fragment_source, 'fragment'),
+        )
+    return _program
+
+
+class GlyphAtlas:
+    """Monospace glyphs rasterized once into fixed-size cells of a single texture"""
+    PRELOADED = ''.join(chr(c) for c in range(32, 127))
+    COLUMNS = 16
+    ROWS = 12
+
+    def __init__(self, font_name, font_size):
+        self.font = pyglet.font.load(font_name, font_size)
+        self.cell_width = self.font.get_glyphs('0')[0][0].advance  # Every cell is one advance wide
+        self.cell_height = self.font.ascent - self.font.descent
+        self.descent = self.font.descent
+
+        self.texture = pyglet.image.Texture.create(
+            self.cell_width * self.COLUMNS, self.cell_height * self.ROWS,
+            min_filter=gl.GL_NEAREST, mag_filter=gl.GL_NEAREST  # Cells map 1:1 onto screen pixels
+        )
+        self.cells = {}  # char -> 8 tex coord floats (4 corners)
+        for char in self.PRELOADED:
+            self.add_glyph(char)
+
+    def add_glyph(self, char):
+        """Rasterize char into the next free cell, returns False when the atlas is full"""
+        index = len(self.cells)
+        if index >= self.COLUMNS * self.ROWS:
+            return False
+
+        cell_x = (index % self.COLUMNS) * self.cell_width
+        cell_y = (index // self.COLUMNS) * self.cell_height
+        glyph = self.font.get_glyphs(char)[0][0]
+        left, bottom = int(glyph.vertices[0]), int(glyph.vertices[1])
+
+        # Crop the glyph to its cell - bearings can push it past the edges
+        src_x, src_y = max(0, -left), max(0, -(bottom - self.descent))
+        dest_x, dest_y = max(0, left), max(0, bottom - self.descent)
+        width = min(glyph.width - src_x, self.cell_width - dest_x)
+        height = min(glyph.height - src_y, self.cell_height - dest_y)
+        if width > 0 and height > 0 and char != ' ':
+            image = glyph.get_image_data()
+            if glyph.tex_coords[1] > glyph.tex_coords[7]:
+                # Font textures may hold glyphs top-down - flip rows so the cell is bottom-up
+                image = pyglet.image.ImageData(
+                    image.width, image.height, 'RGBA', image.get_data('RGBA', -image.width * 4)
+                )
+            image = image.get_region(src_x, src_y, width, height)
+            self.texture.blit_into(image, cell_x + dest_x, cell_y + dest_y, 0)
+
+        u0 = cell_x / self.texture.width
+        v0 = cell_y / self.texture.height
+        u1 = (cell_x + self.cell_width) / self.texture.width
+        v1 = (cell_y + self.cell_height) / self.texture.height
+        self.cells[char] = (u0, v0, u1, v0, u1, v1, u0, v1)
+        return True
+
+    def get_tex_coords(self, char):
+        """Tex coords of char's cell (rasterized on first use, '?' once the atlas is full)"""
+        coords = self.cells.get(char)
+        if coords is None:
+            coords = self.cells[char] if self.add_glyph(char) else self.cells['?']
+        return coords
+
+
+class GlyphGroup(pyglet.graphics.Group):
+    """Binds the glyph atlas and shader for every grid drawn from it"""
+    def __init__(self, atlas, program, order=0, parent=None):
+        super().__init__(order, parent)
+        self.atlas = atlas
+        self.program = program
+
+    def set_state(self):
+        self.program.use()
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        gl.glBindTexture(self.atlas.texture.target, self.atlas.texture.id)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+    def unset_state(self):
+        gl.glDisable(gl.GL_BLEND)
+        self.program.stop()
+
+    def __eq__(self, other):
+        return (other.__class__ is self.__class__ and self.atlas is other.atlas and
+                self.program is other.program and self.order == other.order and self.parent == other.parent)
+
+    def __hash__(self):
+        return hash((id(self.atlas), id(self.program), self.order, self.parent))
+
+
+class GlyphGrid:
+    """Fixed rows x columns of character cells - changing text only rewrites the cells that differ"""
+    BLANK_QUAD = (0.0,) * 8  # Spaces collapse to a zero-area quad so they rasterize nothing
+    
+    def __init__(self, atlas, x, y, rows, columns, line_height, color, batch, group=None):
+        self.atlas = atlas
+        self.rows = rows
+        self.columns = columns
+        self.cells = [[' '] * columns for _ in range(rows)]
+        self.lines = [GlyphGridLine(self, row) for row in range(rows)]
+
+        # Quads are laid out once; y is the first row's baseline, rows go downwards
+        self.quads = []
+        for row in range(rows):
+            bottom = y - row * line_height + atlas.descent
+            top = bottom + atlas.cell_height
+            for column in range(columns):
+                left = x + column * atlas.cell_width
+                right = left + atlas.cell_width
+                self.quads.append((left, bottom, right, bottom, right, top, left, top))
+
+        cell_count = rows * columns
+        indices = []
+        for cell in range(cell_count):
+            base = cell * 4
+            indices.extend((base, base + 1, base + 2, base, base + 2, base + 3))
+
+        program = get_glyph_program()
+        self.vertex_list = program.vertex_list_indexed(
+            cell_count * 4, gl.GL_TRIANGLES, indices, batch=batch,
+            group=GlyphGroup(atlas, program, parent=group),
+            position=('f', self.BLANK_QUAD * cell_count),  # Every cell starts blank
+            tex_coords=('f', atlas.get_tex_coords(' ') * cell_count),
+            colors=('Bn', tuple(color) * (cell_count * 4)),
+        )
+        self.position_buffer = self.vertex_list.domain.attrib_name_buffers['position']
+        self.tex_coord_buffer = self.vertex_list.domain.attrib_name_buffers['tex_coords']
+
+    def set_line(self, row, text):
+        """Show text on a row, rewriting only the cells whose character changed"""
+        text = text[:self.columns].ljust(self.columns)
+        cells = self.cells[row]
+        first_cell = row * self.columns
+        for column, char in enumerate(text):
+            previous = cells[column]
+            if previous == char:
+                continue
+            cells[column] = char
+            vertex = self.vertex_list.start + (first_cell + column) * 4
+            if char == ' ':
+                self.position_buffer.set_region(vertex, 4, self.BLANK_QUAD)
+                continue
+            if previous == ' ':
+                self.position_buffer.set_region(vertex, 4, self.quads[first_cell + column])
+            self.tex_coord_buffer.set_region(vertex, 4, self.atlas.get_tex_coords(char))
+
+    def get_line(self, row):
+        return ''.join(self.cells[row]).rstrip()
+
+    def delete(self):
+        self.vertex_list.delete()
+
+
+class GlyphGridLine:
+    """One row of a GlyphGrid, with the same text property a Label has"""
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    @property
+    def text(self):
+        return self.grid.get_line(self.row)
+
+    @text.setter
+    def text(self, value):
+        self.grid.set_line(self.row, value)
@@ -0,0 +1,118 @@
+import pyglet
+from pyglet import gl
+
+class LayerCache:
+    """Render a batch of static geometry once into a texture and blit it every frame"""
+    def __init__(self, window_width, window_height, region=None, enabled=True):
+        self.window_width = window_width
+        self.window_height = window_height
+        # Window-space rectangle the cached content occupies (x, y, width, height)
+        self.region = region or (0, 0, window_width, window_height)
+        self.enabled = enabled
+        self.batch = pyglet.graphics.Batch()  # Static content lives here
+        self.dirty = True
+        self.tint = 1.0
+
+        # Offscreen target, sized to the region rather than the whole window
+        self.texture = None
+        self.framebuffer = None
+        self.sprite = None
+
+        if self.enabled:
+            self._create_target()
+
+    def _create_target(self):
+        """Create the texture + framebuffer the layer is rendered into"""
+        x, y, width, height = self.region
+        try:
+            self.texture = pyglet.image.Texture.create(
+                width, height,
+                min_filter=gl.GL_NEAREST, mag_filter=gl.GL_NEAREST  # Always blitted 1:1
+            )
+            self.framebuffer = pyglet.image.buffer.Framebuffer()
+            self.framebuffer.attach_texture(self.texture)
+
+            # Layer texture holds premultiplied colour, so blit with ONE / ONE_MINUS_SRC_ALPHA
+            self.sprite = pyglet.sprite.Sprite(
+                self.texture, x, y,
+                blend_src=gl.GL_ONE, blend_dest=gl.GL_ONE_MINUS_SRC_ALPHA
+            )
+            self._apply_tint()
+            self.dirty = True
+        except Exception as e:
+            print(f"⚠️  Layer cache unavailable, drawing geometry directly: {e}")
+            self.enabled = False
+            self.texture = None
+            self.framebuffer = None
+            self.sprite = None
+
+    def resize(self, window_width, window_height, region=None):
+        """Follow a window resize (and optionally move/resize the cached region)"""
+        if region is None:
+            full_window = self.region == (0, 0, self.window_width, self.window_height)
+            region = (0, 0, window_width, window_height) if full_window else self.region
+        self.window_width = window_width
+        self.window_height = window_height
+
+        if region != self.region:
+            self.region = region
+            if self.enabled:
+                self._create_target()
+        self.invalidate()
+
+    def invalidate(self):
+        """Mark the cached texture stale - it is re-rendered on the next draw"""
+        self.dirty = True
+
+    def set_tint(self, tint):
+        """Scale the whole layer's opacity without touching its geometry"""
+        tint = max(0.0, min(1.0, tint))
+        if tint != self.tint:
+            self.tint = tint
+            self._apply_tint()
+
+    def _apply_tint(self):
+        if self.sprite:
+            # Premultiplied alpha: scale colour and alpha together
+            level = int(self.tint * 255)
+            self.sprite.color = (level, level, level, level)
+
+    def render(self):
+        """Render the static batch into the layer texture"""
+        x, y, width, height = self.region
+
+        previous_clear = (gl.GLfloat * 4)()
+        gl.glGetFloatv(gl.GL_COLOR_CLEAR_VALUE, previous_clear)
+        previous_viewport = (gl.GLint * 4)()
+        gl.glGetIntegerv(gl.GL_VIEWPORT, previous_viewport)
+        previous_framebuffer = gl.GLint()
+        gl.glGetIntegerv(gl.GL_DRAW_FRAMEBUFFER_BINDING, previous_framebuffer)  # May be an offscreen scene
+
+        self.framebuffer.bind()
+        # Offset the window-sized viewport so the region's corner lands on texel (0, 0)
+        gl.glViewport(-x, -y, self.window_width, self.window_height)
+        gl.glClearColor(0.0, 0.0, 0.0, 0.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+
+        # Colour blends normally (giving premultiplied RGB), alpha keeps the strongest coverage
+        gl.glBlendEquationSeparate(gl.GL_FUNC_ADD, gl.GL_MAX)
+        self.batch.draw()
+        gl.glBlendEquation(gl.GL_FUNC_ADD)
+
+        self.framebuffer.unbind()
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, previous_framebuffer.value)
+        gl.glViewport(*previous_viewport)
+        gl.glClearColor(*previous_clear)
+        self.dirty = False
+
+    def draw(self):
+        """Blit the cached layer, re-rendering it first if it is stale"""
+        if not self.enabled:
+            self.batch.draw()
+            return
+
+        if self.dirty:
+            self.render()
+
+        if self.tint > 0.0:
+            self.sprite.draw()
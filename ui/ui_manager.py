@@ -1,7 +1,8 @@
 
-import time
 from config.settings import Settings
 from pyglet          import shapes, text
+from ui.layer_cache  import LayerCache
+from ui.glyph_text   import GlyphAtlas, GlyphGrid
 
 class UIManager:
     def __init__(self, window_width, window_height, ui_batch, grid_batch):
@@ -16,26 +17,107 @@ class UIManager:
         self.panels        = {}             # Store panel background shapes
         self.panel_labels  = {}             # Store labels organized by panel
         self.clean_font    = None           # Store working font name
+        self.glyph_atlas   = None           # Shared atlas for the panels' data text
+        self.glyph_grids   = {}             # One character grid per panel
 
         # Animation state for holographic effects
         self.pulse_timer       = 0.0
+        self.sim_time          = 0.0  # Simulation time of the current frame
         self.last_data_update  = {}  # Track when each panel's data changed
         self.panel_fade_states = {}  # Track fade animations per panel
 
+        # Static layers rendered once into textures (grid under the scene, panels over it)
+        self.grid_lines      = []
+        self.grid_layer      = LayerCache(
+            window_width, window_height,
+            enabled=Settings.UI_LAYER_CACHE_ENABLED and Settings.UI_CACHE_GRID_LAYER
+        )
+        self.layer_signature = self.get_layer_signature()
+
     def create_grid(self):
         grid_color   = Settings.GRID_COLOR
         grid_spacing = Settings.GRID_SPACING
+        grid_batch   = self.grid_layer.batch
 
+        # Keep references - shapes delete their vertex lists when garbage collected
+        self.grid_lines = []
         for x in range(0, self.window_width, grid_spacing):
-            shapes.Line(x, 0, x, self.window_height, color=grid_color, batch=self.grid_batch)
+            self.grid_lines.append(shapes.Line(x, 0, x, self.window_height, color=grid_color, batch=grid_batch))
         for y in range(0, self.window_height, grid_spacing):
-            shapes.Line(0, y, self.window_width, y, color=grid_color, batch=self.grid_batch)
+            self.grid_lines.append(shapes.Line(0, y, self.window_width, y, color=grid_color, batch=grid_batch))
+        self.grid_layer.invalidate()
+
+    def get_layer_signature(self):
+        """Settings the cached layers are built from - a change triggers a rebuild"""
+        return (
+            Settings.GRID_COLOR, Settings.GRID_SPACING,
+            Settings.PANEL_BACKGROUND, Settings.PANEL_BORDER, Settings.PANEL_GLOW,
+            Settings.PANEL_TITLE_COLOR, Settings.UI_TITLE_SIZE,
+        )
+
+    def resize(self, window_width, window_height):
+        """Rebuild cached layers for a new window size"""
+        if window_width == self.window_width and window_height == self.window_height:
+            return
+        self.window_width  = window_width
+        self.window_height = window_height
+        self.grid_layer.resize(window_width, window_height)
+        for panel_info in self.panels.values():
+            for layer in panel_info['layers'].values():
+                layer.resize(window_width, window_height)
+        self.create_grid()
+
+    def rebuild_static_layers(self):
+        """Recreate grid and panel chrome from current Settings"""
+        self.layer_signature = self.get_layer_signature()
+        self.create_grid()
+        if self.panels:
+            self.create_panels()
+
+    def draw_background_layers(self):
+        """Draw cached layers that sit underneath the scene"""
+        if self.get_layer_signature() != self.layer_signature:
+            self.rebuild_static_layers()
+        self.grid_layer.draw()
+
+    def draw_panel_layers(self):
+        """Draw cached panel layers (glow, pulsing background, borders and titles)"""
+        for panel_info in self.panels.values():
+            layers = panel_info['layers']
+            layers['glow'].draw()
+            layers['background'].draw()
+            layers['chrome'].draw()
     
     def create_ui(self):
         # Setup font first
         self.setup_clean_font()
+        self.setup_glyph_atlas()
         
         # Create panels
+        self.create_panels()
+
+        # Calculate the offset to align bottoms of both panels
+        audio_panel_y_offset = Settings.PANEL_HEIGHT_AUDIO - Settings.PANEL_HEIGHT
+        
+        # Create labels for each panel
+        self.panel_labels['system'] = self.create_panel_labels(
+            Settings.PANEL_LEFT_X, Settings.PANEL_TOP_Y, "SYSTEM", 9, Settings.PANEL_HEIGHT
+        )
+        
+        self.panel_labels['audio'] = self.create_panel_labels(
+            Settings.PANEL_RIGHT_X, Settings.PANEL_TOP_Y - audio_panel_y_offset, "AUDIO", 11, Settings.PANEL_HEIGHT_AUDIO
+        )
+        
+        self.panel_labels['midi'] = self.create_panel_labels(
+            Settings.PANEL_LEFT_X, Settings.PANEL_BOTTOM_Y, "MIDI", 8, Settings.PANEL_HEIGHT
+        )
+        
+        self.panel_labels['particles'] = self.create_panel_labels(
+            Settings.PANEL_RIGHT_X, Settings.PANEL_BOTTOM_Y, "PARTICLES", 7, Settings.PANEL_HEIGHT
+        )
+
+    def create_panels(self):
+        """Create the four panel frames, each cached in its own layers"""
         # Top-left: System Status
         self.panels['system'] = self.create_clean_panel(
             Settings.PANEL_LEFT_X, Settings.PANEL_TOP_Y, 
@@ -63,38 +145,24 @@ class UIManager:
             Settings.PANEL_RIGHT_X, Settings.PANEL_BOTTOM_Y,
             Settings.PANEL_WIDTH, Settings.PANEL_HEIGHT, "PARTICLES"
         )
-        
-        # Create labels for each panel
-        self.panel_labels['system'] = self.create_panel_labels(
-            Settings.PANEL_LEFT_X, Settings.PANEL_TOP_Y, "SYSTEM", 6, Settings.PANEL_HEIGHT
-        )
-        
-        self.panel_labels['audio'] = self.create_panel_labels(
-            Settings.PANEL_RIGHT_X, Settings.PANEL_TOP_Y - audio_panel_y_offset, "AUDIO", 11, Settings.PANEL_HEIGHT_AUDIO
-        )
-        
-        self.panel_labels['midi'] = self.create_panel_labels(
-            Settings.PANEL_LEFT_X, Settings.PANEL_BOTTOM_Y, "MIDI", 8, Settings.PANEL_HEIGHT
-        )
-        
-        self.panel_labels['particles'] = self.create_panel_labels(
-            Settings.PANEL_RIGHT_X, Settings.PANEL_BOTTOM_Y, "PARTICLES", 6, Settings.PANEL_HEIGHT
-        )
 
-    def update_ui(self, audio_time, start_time, playing, midi_processor, video_recorder, network_manager, audio_analyzer):
+    def update_ui(self, frame, audio_time, start_time, playing, midi_processor, video_recorder, network_manager, audio_analyzer,
+                  render_scale=1.0):
         """Update all 4 panels with organized data"""
-        self.update_system_panel(audio_time, start_time, playing, video_recorder)
+        elapsed = frame.time - self.sim_time
+        self.sim_time = frame.time
+        self.update_system_panel(audio_time, start_time, playing, video_recorder, render_scale)
         self.update_audio_panel(audio_analyzer)
         self.update_midi_panel(midi_processor)
         self.update_particles_panel(network_manager, midi_processor)
 
         # Apply subtle holographic animations
-        self.update_panel_animations(1/60.0)  # Assume 60fps
+        self.update_panel_animations(elapsed)
         self.update_fade_effects()
 
-    def update_system_panel(self, audio_time, start_time, playing, video_recorder):
+    def update_system_panel(self, audio_time, start_time, playing, video_recorder, render_scale=1.0):
         """Update top-left panel with core system status"""
-        system_time = (time.time() - start_time) if (start_time and playing) else 0
+        system_time = (self.sim_time - start_time) if (start_time is not None and playing) else 0
         
         system_data = [
             f"AUDIO: {audio_time:.1f}s",
@@ -102,8 +170,18 @@ class UIManager:
             f"STATUS: {'PLAYING' if playing else 'STOPPED'}",
             f"RECORD: {'●REC' if video_recorder.recording else 'READY'}",
             f"FRAMES: {video_recorder.frames_recorded}",
-            f"FPS: {video_recorder.target_fps}"
+            f"FPS: {video_recorder.target_fps}",
+            f"RES: {int(round(render_scale * 100))}%"
         ]
+
+        # The next take can start while earlier ones are still finishing - both lines can show
+        capture_stats = video_recorder.get_capture_stats()
+        if capture_stats:
+            system_data.append(f"QUEUE: {capture_stats['queue_depth']} | {capture_stats['convert_ms']:.1f}/"
+                               f"{capture_stats['encode_ms']:.1f} ms")
+        finalization_status = video_recorder.get_finalization_status()
+        if finalization_status:
+            system_data.append(f"FINAL: {finalization_status}")
         
         for i, label in enumerate(self.panel_labels['system']):
             if i < len(system_data):
@@ -156,14 +234,16 @@ class UIManager:
 
     def update_particles_panel(self, network_manager, midi_processor):
         """Update bottom-right panel with particle system and events"""
-        odin_particles = len(network_manager.odin_node.particle_sink) if network_manager.odin_node else 0
+        odin_particles = network_manager.get_sink_count() if network_manager.odin_node else 0
         max_capacity = network_manager.odin_node.max_sink_capacity if network_manager.odin_node else 0
+        budget = f"BUDGET: {int(round(network_manager.particle_budget.level * 100))}%"
         
         # Show recent events if logs enabled, otherwise show more particle data
         if self.show_logs:
             recent_events = list(midi_processor.recent_events)[-4:]  # Only last 4 events
             particles_data = [
                 f"ODIN: {odin_particles}/{max_capacity}",
+                budget,
                 f"RECENT EVENTS:",
             ] + [event for event in recent_events]
         else:
@@ -172,7 +252,8 @@ class UIManager:
                 f"CAPACITY: {(odin_particles/max_capacity*100):.1f}%" if max_capacity > 0 else "CAPACITY: 0%",
                 f"PARTICLES: {len(network_manager.particles)}",
                 f"EXPLOSIONS: {len(network_manager.explosion_particles)}",
-                "",
+                f"CULLED: {sum(network_manager.explosion_culled.values())}",
+                budget,
                 f"LOGS DISABLED"
             ]
         
@@ -194,6 +275,14 @@ class UIManager:
     def create_clean_panel(self, x, y, width, height, title):
         """Create a 2001/Minority Report style panel"""
         panel_info = {}
+
+        # Cache the panel's own rectangle: glow underneath, pulsing background, then borders and title
+        glow_width = Settings.PANEL_GLOW_WIDTH
+        region = (x - glow_width, y - glow_width, width + glow_width * 2, height + glow_width * 2)
+        layers = {
+            name: LayerCache(self.window_width, self.window_height, region, Settings.UI_LAYER_CACHE_ENABLED)
+            for name in ('glow', 'background', 'chrome')
+        }
         
         # Subtle glow effect (behind everything, larger and transparent)
         glow = shapes.Rectangle(
@@ -202,7 +291,7 @@ class UIManager:
             width + (Settings.PANEL_GLOW_WIDTH * 2), 
             height + (Settings.PANEL_GLOW_WIDTH * 2),
             color=Settings.PANEL_GLOW[:3], 
-            batch=self.ui_batch
+            batch=layers['glow'].batch
         )
         glow.opacity = Settings.PANEL_GLOW[3]
         
@@ -210,16 +299,18 @@ class UIManager:
         panel_bg = shapes.Rectangle(
             x, y, width, height, 
             color=Settings.PANEL_BACKGROUND[:3], 
-            batch=self.ui_batch
+            batch=layers['background'].batch
         )
-        panel_bg.opacity = Settings.PANEL_BACKGROUND[3]
+        panel_bg.opacity = self.get_background_peak_opacity(layers['background'])
         
         # Border (4 thin lines forming a rectangle outline)
+        chrome_batch = layers['chrome'].batch
+
         # Top border
         border_top = shapes.Rectangle(
             x, y + height - Settings.PANEL_BORDER_WIDTH, 
             width, Settings.PANEL_BORDER_WIDTH,
-            color=Settings.PANEL_BORDER[:3], batch=self.ui_batch
+            color=Settings.PANEL_BORDER[:3], batch=chrome_batch
         )
         border_top.opacity = Settings.PANEL_BORDER[3]
 
@@ -227,7 +318,7 @@ class UIManager:
         border_bottom = shapes.Rectangle(
             x, y, 
             width, Settings.PANEL_BORDER_WIDTH,
-            color=Settings.PANEL_BORDER[:3], batch=self.ui_batch
+            color=Settings.PANEL_BORDER[:3], batch=chrome_batch
         )
         border_bottom.opacity = Settings.PANEL_BORDER[3]
 
@@ -235,7 +326,7 @@ class UIManager:
         border_left = shapes.Rectangle(
             x, y, 
             Settings.PANEL_BORDER_WIDTH, height,
-            color=Settings.PANEL_BORDER[:3], batch=self.ui_batch
+            color=Settings.PANEL_BORDER[:3], batch=chrome_batch
         )
         border_left.opacity = Settings.PANEL_BORDER[3]
 
@@ -243,7 +334,7 @@ class UIManager:
         border_right = shapes.Rectangle(
             x + width - Settings.PANEL_BORDER_WIDTH, y, 
             Settings.PANEL_BORDER_WIDTH, height,
-            color=Settings.PANEL_BORDER[:3], batch=self.ui_batch
+            color=Settings.PANEL_BORDER[:3], batch=chrome_batch
         )
         border_right.opacity = Settings.PANEL_BORDER[3]
         
@@ -253,13 +344,14 @@ class UIManager:
             color=Settings.PANEL_TITLE_COLOR,
             x=x + Settings.PANEL_PADDING, 
             y=y + height - Settings.PANEL_PADDING - 5,
-            batch=self.ui_batch
+            batch=chrome_batch
         )
         
         panel_info['background'] = panel_bg
         panel_info['borders'] = [border_top, border_bottom, border_left, border_right]
         panel_info['glow'] = glow
         panel_info['title'] = title_label
+        panel_info['layers'] = layers
         
         return panel_info
 
@@ -270,6 +362,16 @@ class UIManager:
         self.clean_font = Settings.UI_FONT_FAMILY
         print(f"✅ Using font: {Settings.UI_FONT_FAMILY} (with system fallback)")
 
+    def setup_glyph_atlas(self):
+        """Rasterize the data font into a glyph atlas (falls back to Labels if that fails)"""
+        if not Settings.HUD_GLYPH_TEXT_ENABLED:
+            return
+        try:
+            self.glyph_atlas = GlyphAtlas(self.clean_font, Settings.UI_DATA_SIZE)
+        except Exception as e:
+            print(f"⚠️  Glyph atlas unavailable, using labels for panel text: {e}")
+            self.glyph_atlas = None
+
     def create_panel_labels(self, panel_x, panel_y, panel_title, label_count, panel_height=None):
         """Create labels positioned within a clean panel"""
         labels = []
@@ -278,6 +380,18 @@ class UIManager:
         if panel_height is None:
             panel_height = Settings.PANEL_HEIGHT
         
+        if self.glyph_atlas:
+            # Fixed character grid - its lines take .text just like the labels do
+            first_line_y = (panel_y + panel_height - Settings.PANEL_PADDING -
+                            Settings.TITLE_BOTTOM_MARGIN - Settings.PANEL_TITLE_HEIGHT)
+            grid = GlyphGrid(
+                self.glyph_atlas, panel_x + Settings.PANEL_PADDING, first_line_y,
+                label_count, Settings.HUD_TEXT_COLUMNS, Settings.LINE_HEIGHT,
+                Settings.PANEL_TEXT_COLOR, self.ui_batch
+            )
+            self.glyph_grids[panel_title] = grid
+            return grid.lines
+        
         for i in range(label_count):
             # Calculate Y position using the actual panel height
             label_y = (panel_y + panel_height - Settings.PANEL_PADDING - 
@@ -297,6 +411,13 @@ class UIManager:
         
         return labels
     
+    def get_background_peak_opacity(self, background_layer):
+        """Opacity the cached background is baked at - the pulse tints down from it"""
+        base_opacity = Settings.PANEL_BACKGROUND[3]
+        if not (Settings.PANEL_PULSE_ENABLED and background_layer.enabled):
+            return base_opacity
+        return min(255, int(base_opacity * (1.0 + Settings.PANEL_PULSE_INTENSITY)))
+
     def update_panel_animations(self, dt):
         """Apply subtle 2001/Minority Report style animations"""
         if not Settings.PANEL_PULSE_ENABLED:
@@ -309,12 +430,17 @@ class UIManager:
         pulse_factor = math.sin(self.pulse_timer * Settings.PANEL_PULSE_SPEED * 2 * math.pi)
         pulse_opacity_modifier = 1.0 + (pulse_factor * Settings.PANEL_PULSE_INTENSITY)
         
+        base_opacity = Settings.PANEL_BACKGROUND[3]
+        new_opacity = max(20, min(255, int(base_opacity * pulse_opacity_modifier)))
+
         # Apply to all panel backgrounds
         for panel_name, panel_info in self.panels.items():
-            if 'background' in panel_info:
-                base_opacity = Settings.PANEL_BACKGROUND[3]
-                new_opacity = int(base_opacity * pulse_opacity_modifier)
-                panel_info['background'].opacity = max(20, min(255, new_opacity))
+            background_layer = panel_info['layers']['background']
+            if background_layer.enabled:
+                # Pulse the cached background as a tint - no geometry is touched
+                background_layer.set_tint(new_opacity / self.get_background_peak_opacity(background_layer))
+            elif 'background' in panel_info:
+                panel_info['background'].opacity = new_opacity
 
     def detect_data_changes(self, panel_name, new_data):
         """Detect when panel data changes for fade effects"""
@@ -337,13 +463,14 @@ class UIManager:
                 if not hasattr(border, 'original_opacity'):
                     border.original_opacity = border.opacity
                 border.opacity = min(255, border.opacity + 60)
+            self.panels[panel_name]['layers']['chrome'].invalidate()
             
             # Schedule fade back to normal
-            self.panel_fade_states[panel_name] = time.time()
+            self.panel_fade_states[panel_name] = self.sim_time
 
     def update_fade_effects(self):
         """Handle fade-back animations for highlighted panels"""
-        current_time = time.time()
+        current_time = self.sim_time
         
         for panel_name, trigger_time in list(self.panel_fade_states.items()):
             if current_time - trigger_time > 0.5:  # Fade duration
@@ -352,6 +479,7 @@ class UIManager:
                     for border in self.panels[panel_name]['borders']:
                         if hasattr(border, 'original_opacity'):
                             border.opacity = border.original_opacity
+                    self.panels[panel_name]['layers']['chrome'].invalidate()
                 
                 # Remove from fade tracking
                 del self.panel_fade_states[panel_name]
\ No newline at end of file
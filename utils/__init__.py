@@ -1,3 +1,7 @@
-from .file_manager import FileManager
+from .file_manager   import FileManager
+from .fixed_timestep import FixedTimestep
+from .frame_context  import FrameContext
+from .frame_timer    import FrameTimer
+from .random_streams import RandomStreams
 
-__all__ = ['FileManager']
+__all__ = ['FileManager', 'FixedTimestep', 'FrameContext', 'FrameTimer', 'RandomStreams']
\ No newline at end of file
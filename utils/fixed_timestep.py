@@ -0,0 +1,24 @@
+class FixedTimestep:
+    """Accumulate real frame time and pay it out as fixed simulation steps"""
+    EPSILON = 1e-9  # Keeps dt == step_dt from rounding down to zero steps
+
+    def __init__(self, rate=60, max_steps=5):
+        self.step_dt = 1.0 / rate
+        self.max_steps = max_steps  # Per render frame - a longer stall is dropped rather than caught up
+        self.accumulator = 0.0
+        self.alpha = 1.0  # Where the render frame sits between the last two steps (0..1)
+
+    def advance(self, dt):
+        """Add a render frame's dt, returns how many fixed steps to simulate now"""
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step_dt + self.EPSILON)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = steps * self.step_dt
+        self.accumulator = max(0.0, self.accumulator - steps * self.step_dt)
+        self.alpha = min(1.0, self.accumulator / self.step_dt)
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 1.0
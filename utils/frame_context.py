@@ -0,0 +1,21 @@
+class FrameContext:
+    """Frame index, simulation time and dt - the one clock every update() in a frame reads
+
+    song_time is the playback position this step stands for, set by the caller (emission follows the song).
+    """
+    def __init__(self):
+        self.reset()
+
+    def advance(self, dt):
+        """Step the clock by dt, returns the context for this frame's updates"""
+        self.frame_index += 1
+        self.dt = dt
+        self.time += dt
+        return self
+
+    def reset(self):
+        """Back to frame 0 at time 0 (e.g. when playback restarts)"""
+        self.frame_index = 0
+        self.time = 0.0
+        self.dt = 0.0
+        self.song_time = 0.0
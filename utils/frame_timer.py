@@ -0,0 +1,29 @@
+import time
+
+class FrameTimer:
+    """Smoothed (exponential moving average) time between frames"""
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing  # Weight of the newest frame in the average
+        self.last_time = None
+        self.average_ms = None
+
+    def tick(self, now=None):
+        """Record a frame boundary, returns the smoothed frame time in ms (None on the first tick)"""
+        now = time.perf_counter() if now is None else now
+        if self.last_time is not None:
+            frame_ms = (now - self.last_time) * 1000.0
+            if self.average_ms is None:
+                self.average_ms = frame_ms
+            else:
+                self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        self.last_time = now
+        return self.average_ms
+
+    def reset(self):
+        """Forget the history (after a pause the first interval would be meaningless)"""
+        self.last_time = None
+        self.average_ms = None
+
+    @property
+    def fps(self):
+        return 1000.0 / self.average_ms if self.average_ms else 0.0
@@ -0,0 +1,39 @@
+import random
+import zlib
+import numpy as np
+
+class RandomStreams:
+    """Named, seeded random streams - one per subsystem so each draws the same sequence on every run"""
+    seed_value = None
+    _python = {}  # name -> random.Random
+    _numpy = {}   # name -> np.random.Generator
+
+    @classmethod
+    def seed(cls, seed):
+        """Reseed every stream (None = fresh entropy), streams already handed out are reseeded in place"""
+        cls.seed_value = seed
+        for name, stream in cls._python.items():
+            stream.seed(int(cls._derive(name).generate_state(1)[0]))
+        for name, stream in cls._numpy.items():
+            stream.bit_generator.state = np.random.PCG64(cls._derive(name)).state
+
+    @classmethod
+    def _derive(cls, name):
+        # Streams are independent of each other and of the order they are first requested in
+        if cls.seed_value is None:
+            return np.random.SeedSequence()
+        return np.random.SeedSequence([cls.seed_value, zlib.crc32(name.encode())])
+
+    @classmethod
+    def python(cls, name):
+        """random.Random stream for scalar draws"""
+        if name not in cls._python:
+            cls._python[name] = random.Random(int(cls._derive(name).generate_state(1)[0]))
+        return cls._python[name]
+
+    @classmethod
+    def numpy(cls, name):
+        """NumPy Generator stream for vectorized draws"""
+        if name not in cls._numpy:
+            cls._numpy[name] = np.random.Generator(np.random.PCG64(cls._derive(name)))
+        return cls._numpy[name]
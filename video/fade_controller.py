@@ -1,4 +1,5 @@
 from pyglet import shapes
+from visual import Visibility
 
 class FadeController:
     def __init__(self, window_width, window_height, batch):
@@ -31,6 +32,7 @@ class FadeController:
         if not self.fade_enabled:
             self.current_fade_alpha = 1.0
             self.fade_overlay.opacity = 0
+            Visibility.sync_opacity(self.fade_overlay, self.batch)
             return
             
         if elapsed_time < self.fade_in_duration:
@@ -47,12 +49,14 @@ class FadeController:
         # Update overlay opacity (inverse of fade alpha)
         overlay_alpha = int((1.0 - self.current_fade_alpha) * 255)
         self.fade_overlay.opacity = max(0, min(255, overlay_alpha))
+        Visibility.sync_opacity(self.fade_overlay, self.batch)  # Fully transparent overlay isn't drawn
         
     def enable_fade(self, enabled=True):
         """Enable or disable fade effects"""
         self.fade_enabled = enabled
         if not enabled:
             self.fade_overlay.opacity = 0
+            Visibility.sync_opacity(self.fade_overlay, self.batch)
             
     def set_fade_durations(self, fade_in=2.0, fade_out=2.0):
         """Configure fade timing"""
@@ -1,4 +1,8 @@
 from .background_pattern import BackgroundPattern
 from .visual_manager     import VisualManager
+from .visibility         import Visibility
+from .dynamic_resolution import DynamicResolution
+from .particle_budget    import ParticleBudget
+from .emission_schedule  import EmissionTimeline, EmissionSchedule
 
-__all__ = ['BackgroundPattern', 'VisualManager']
\ No newline at end of file
+__all__ = ['BackgroundPattern', 'VisualManager', 'Visibility', 'DynamicResolution', 'ParticleBudget', 'EmissionTimeline', 'EmissionSchedule']
\ No newline at end of file
@@ -1,5 +1,4 @@
 import math
-import time
 from pyglet          import shapes
 from config.settings import Settings
 
@@ -48,8 +47,9 @@ class BackgroundPattern:
                 line.direction = 'horizontal'
                 self.pattern_elements.append(line)
         
-    def update(self, dt, total_audio_activity=0.0):
+    def update(self, frame, total_audio_activity=0.0):
         """Update lattice with undulating waves"""
+        dt = frame.dt
         if not Settings.BACKGROUND_PATTERN_ENABLED or not self.pattern_elements:
             return
         
@@ -57,7 +57,7 @@ class BackgroundPattern:
         self.target_audio_intensity = min(1.0, total_audio_activity)
         self.audio_intensity += (self.target_audio_intensity - self.audio_intensity) * dt * 4
         
-        current_time = time.time()
+        current_time = frame.time
 
         wave_speed     = 1.5 + self.audio_intensity * 2  # Faster waves with more audio
         wave_amplitude = 15 * self.audio_intensity       # Bigger waves with more audio
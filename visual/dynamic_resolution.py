@@ -0,0 +1,139 @@
+import pyglet
+from pyglet            import gl
+from config.settings   import Settings
+from utils.frame_timer import FrameTimer
+
+class DynamicResolution:
+    """Render the scene offscreen at a resolution that follows frame time, then upscale it to the window"""
+    def __init__(self, window_width, window_height, enabled=True):
+        self.window_width = window_width
+        self.window_height = window_height
+        self.enabled = enabled
+        self.min_scale = Settings.DYNAMIC_RESOLUTION_MIN_SCALE
+        self.max_scale = min(1.0, Settings.DYNAMIC_RESOLUTION_MAX_SCALE)  # 1.0 = native
+        self.scale = self.max_scale
+        self.pinned = False  # Hold the ceiling scale (e.g. while recording)
+
+        # Frame time control
+        self.frame_timer = FrameTimer(Settings.DYNAMIC_RESOLUTION_SMOOTHING)
+        self.target_frame_ms = 1000.0 / Settings.DYNAMIC_RESOLUTION_TARGET_FPS
+        self.last_adjust_time = 0.0
+        self.native_frame_ms = None  # Frame time last measured at the ceiling, to check scaling pays off
+        self.ineffective = False     # Set when the floor is no faster than native (e.g. software GL)
+
+        # Offscreen target - created the first time the scale drops below native
+        self.texture = None
+        self.framebuffer = None
+        self.sprite = None
+        self.sprite_size = None
+        self.previous_viewport = None
+        self.active = False  # True between begin() and end() while drawing offscreen
+
+    def _create_target(self):
+        """Create the window-sized texture + framebuffer the scene is rendered into"""
+        try:
+            self.texture = pyglet.image.Texture.create(
+                self.window_width, self.window_height,
+                min_filter=gl.GL_LINEAR, mag_filter=gl.GL_LINEAR  # Bilinear upscale
+            )
+            self.framebuffer = pyglet.image.buffer.Framebuffer()
+            self.framebuffer.attach_texture(self.texture)
+
+            # Opaque copy - the scene target already holds the cleared background
+            self.sprite = pyglet.sprite.Sprite(self.texture, 0, 0, blend_src=gl.GL_ONE, blend_dest=gl.GL_ZERO)
+            self.sprite_size = None
+        except Exception as e:
+            print(f"⚠️  Dynamic resolution unavailable, rendering at native resolution: {e}")
+            self.enabled = False
+            self.texture = None
+            self.framebuffer = None
+            self.sprite = None
+
+    def resize(self, window_width, window_height):
+        """Follow a window resize - the target is recreated on next use"""
+        self.window_width = window_width
+        self.window_height = window_height
+        self.texture = None
+        self.framebuffer = None
+        self.sprite = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.scale = self.max_scale
+        self.ineffective = False
+        self.native_frame_ms = None
+        self.frame_timer.reset()
+
+    def get_scaled_size(self):
+        return (max(1, int(self.window_width * self.scale)), max(1, int(self.window_height * self.scale)))
+
+    def update(self):
+        """Measure the frame and step the scale towards the frame time target"""
+        frame_ms = self.frame_timer.tick()
+        if not self.enabled or self.ineffective or frame_ms is None:
+            return
+        if self.pinned:
+            self.scale = self.max_scale
+            return
+
+        # Let the average settle on the new resolution before adjusting again
+        now = self.frame_timer.last_time
+        if now - self.last_adjust_time < Settings.DYNAMIC_RESOLUTION_ADJUST_INTERVAL:
+            return
+
+        step = Settings.DYNAMIC_RESOLUTION_STEP
+        headroom = Settings.DYNAMIC_RESOLUTION_HEADROOM
+        if self.scale == self.max_scale:
+            self.native_frame_ms = frame_ms
+        new_scale = self.scale
+        if frame_ms > self.target_frame_ms * (1.0 + headroom):
+            if self.scale <= self.min_scale and self.native_frame_ms and frame_ms >= self.native_frame_ms:
+                # Offscreen pass + upscale costs more than it saves - go back to native and stay there
+                print(f"⚠️  Dynamic resolution not reducing frame time ({frame_ms:.1f}ms at "
+                      f"{self.scale:.0%} vs {self.native_frame_ms:.1f}ms native), staying native")
+                self.ineffective = True
+                self.scale = self.max_scale
+                return
+            new_scale -= step
+        elif frame_ms < self.target_frame_ms * (1.0 - headroom):
+            new_scale += step
+        new_scale = round(max(self.min_scale, min(self.max_scale, new_scale)), 3)
+
+        if new_scale != self.scale:
+            self.scale = new_scale
+            self.last_adjust_time = now
+
+    def begin(self):
+        """Redirect scene drawing offscreen while below native resolution, returns True if redirected"""
+        if not self.enabled or self.scale >= 1.0:
+            return False
+        if self.framebuffer is None:
+            self._create_target()
+            if not self.enabled:
+                return False
+
+        scaled_width, scaled_height = self.get_scaled_size()
+        self.previous_viewport = (gl.GLint * 4)()
+        gl.glGetIntegerv(gl.GL_VIEWPORT, self.previous_viewport)
+
+        # Window projection is unchanged - the smaller viewport shrinks the whole scene into the corner
+        self.framebuffer.bind()
+        gl.glViewport(0, 0, scaled_width, scaled_height)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)  # Current clear colour = window background
+        self.active = True
+        return True
+
+    def end(self):
+        """Stop redirecting and upscale the rendered scene over the window"""
+        if not self.active:
+            return
+        self.active = False
+        self.framebuffer.unbind()
+        gl.glViewport(*self.previous_viewport)
+
+        scaled_size = self.get_scaled_size()
+        if scaled_size != self.sprite_size:
+            self.sprite.image = self.texture.get_region(0, 0, *scaled_size)
+            self.sprite.update(scale_x=self.window_width / scaled_size[0], scale_y=self.window_height / scaled_size[1])
+            self.sprite_size = scaled_size
+        self.sprite.draw()
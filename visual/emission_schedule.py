@@ -0,0 +1,96 @@
+import numpy as np
+from config.settings import Settings
+
+class EmissionTimeline:
+    """Song-time inputs to the emission rates, all known ahead: held notes per channel and band levels per element"""
+    def __init__(self, midi_events, time_frames=None, band_levels=None):
+        # Held-note count after every event of a channel, counted like MIDIProcessor does
+        self.event_times = {}
+        self.note_counts = {}
+        events = {}
+        for event in midi_events:
+            events.setdefault(min(15, max(0, event['channel'])), []).append(event)
+        for channel, channel_events in events.items():
+            count = 0
+            counts = []
+            for event in channel_events:
+                if event['type'] == 'note_on' and event['velocity'] > 0:
+                    count += 1
+                else:
+                    count = max(0, count - 1)
+                counts.append(count)
+            self.event_times[channel] = np.array([event['time'] for event in channel_events])
+            self.note_counts[channel] = np.array(counts)
+
+        self.time_frames = time_frames
+        self.band_levels = band_levels or {}
+
+    @classmethod
+    def from_sources(cls, midi_processor, audio_analyzer):
+        time_frames, band_levels = audio_analyzer.frequency_analyzer.get_level_timeline(audio_analyzer.audio_data)
+        return cls(midi_processor.midi_events, time_frames, band_levels)
+
+    def held(self, channel, times):
+        """Whether the channel has a note held at each of times"""
+        if channel not in self.event_times:
+            return np.zeros(len(times), bool)
+        index = np.searchsorted(self.event_times[channel], times, side='right') - 1
+        return (index >= 0) & (self.note_counts[channel][np.maximum(index, 0)] > 0)
+
+    def levels(self, element_type, times):
+        """Band level of the element at each of times (0 without audio)"""
+        if self.time_frames is None or element_type not in self.band_levels:
+            return np.zeros(len(times))
+        index = np.minimum(np.searchsorted(self.time_frames, times), len(self.time_frames) - 1)
+        return self.band_levels[element_type][index]
+
+
+class EmissionSchedule:
+    """One element's emission times, drawn a window at a time as an inhomogeneous Poisson process"""
+    def __init__(self, emitter, channel, random, window=None, resolution=None):
+        self.emitter = emitter
+        self.channel = channel
+        self.random = random
+        self.window = window or Settings.EMISSION_SCHEDULE_WINDOW
+        self.resolution = resolution or 1.0 / Settings.SIMULATION_RATE  # Rate is held constant over these steps
+        self.reset(None)
+
+    def reset(self, start):
+        """Forget planned events, the next window starts at start (None = first due() call)"""
+        self.times = np.zeros(0)
+        self.keys = np.zeros(0)
+        self.planned_until = start
+        self.last_time = start
+
+    def plan(self, timeline, start):
+        """Draw every event in [start, start + window) - the count is Poisson in the integrated rate,
+        arrivals are uniform in it and mapped back to song time"""
+        steps = max(1, int(round(self.window / self.resolution)))
+        times = start + (np.arange(steps) + 0.5) * self.resolution
+        held = timeline.held(self.channel, times)
+        rate = np.where(held, self.emitter.get_emission_rate(timeline.levels(self.emitter.element_type, times),
+                                                             held.astype(float)), 0.0)
+        cumulative = np.concatenate(([0.0], np.cumsum(rate * self.resolution)))
+
+        count = self.random.poisson(cumulative[-1])
+        arrivals = np.sort(self.random.uniform(0.0, cumulative[-1], count))
+        event_times = start + np.interp(arrivals, cumulative, np.arange(steps + 1) * self.resolution)
+        keys = self.random.random(count)  # Budget thinning: an event fires while its key is under the share
+
+        self.times = np.concatenate((self.times, event_times))
+        self.keys = np.concatenate((self.keys, keys))
+        self.planned_until = start + steps * self.resolution
+
+    def due(self, timeline, song_time):
+        """Keys of the events up to song_time, in order - planning further windows as the song gets there"""
+        if self.last_time is None or song_time < self.last_time or song_time - self.planned_until > self.window:
+            self.reset(song_time)  # First call, restart or seek: plan from here
+        self.last_time = song_time
+        while self.planned_until <= song_time:
+            self.plan(timeline, self.planned_until)
+
+        due = np.searchsorted(self.times, song_time, side='right')
+        keys = self.keys[:due]
+        self.times = self.times[due:]
+        self.keys = self.keys[due:]
+        return keys
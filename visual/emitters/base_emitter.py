@@ -1,34 +1,40 @@
 import abc
-import random
+from config.settings      import Settings
+from utils.random_streams import RandomStreams
 
 class BaseEmitter(abc.ABC):
     def __init__(self, element_node, batch):
         self.element_node = element_node
+        self.element_type = element_node.element_type
         self.batch = batch
-        self.emission_cooldown = 0.0
-        self.last_emission_time = 0.0
+        self.budget_scale = 1.0  # Share of the full emission the particle budget allows
+        self.random = RandomStreams.numpy(f"emitters.{element_node.element_type}")
         
     @abc.abstractmethod
     def get_emission_probability(self, freq_level, midi_activity):
-        """Calculate base emission probability"""
+        """Calculate base emission probability per simulation step (scalars or arrays)"""
         pass
     
     @abc.abstractmethod
-    def emit_particles(self, odin_pos, particles_list, element_pan=0.0):
-        """Emit particles toward Odin"""
+    def emit_many(self, count, odin_pos, element_pan=0.0):
+        """Spawn parameters for count emission events, as arrays for ParticleEngine.emit_batch"""
         pass
+
+    def get_emission_rate(self, freq_level, midi_activity):
+        """Expected emission events per second of song time"""
+        return self.get_emission_probability(freq_level, midi_activity) * Settings.SIMULATION_RATE
+
+    def get_budgeted_share(self):
+        """Share of scheduled emission events the particle budget lets through"""
+        return self.budget_scale
+
+    def emit_particles(self, odin_pos, particle_engine, element_pan=0.0, count=1):
+        """Emit the particles of count events toward Odin into the ParticleEngine"""
+        spawn = self.emit_many(count, odin_pos, element_pan)
+        if len(spawn['x']):
+            particle_engine.emit_batch(self.element_type, odin_pos, self.element_node.color, **spawn)
     
-    def update_cooldown(self, dt):
-        """Update emission cooldown timer"""
-        self.emission_cooldown -= dt
-        
-    def can_emit(self):
-        """Check if cooldown allows emission"""
-        return self.emission_cooldown <= 0
-    
-    def get_element_position_with_jitter(self):
-        """Get element position with subtle random movement"""
+    def get_element_positions_with_jitter(self, count):
+        """Element position with subtle random movement, once per event"""
         pos = self.element_node.get_current_position()
-        jitter_x = random.uniform(-8, 8)
-        jitter_y = random.uniform(-8, 8)
-        return (pos[0] + jitter_x, pos[1] + jitter_y)
+        return (pos[0] + self.random.uniform(-8, 8, count), pos[1] + self.random.uniform(-8, 8, count))
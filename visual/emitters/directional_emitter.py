@@ -1,6 +1,5 @@
-import random
+import numpy as np
 from .base_emitter    import BaseEmitter
-from visual.particles import ElementalParticle
 
 class DirectionalEmitter(BaseEmitter):
     def __init__(self, element_node, batch, emitter_separation=60):
@@ -10,38 +9,23 @@ class DirectionalEmitter(BaseEmitter):
     def get_emission_probability(self, freq_level, midi_activity):
         return 0.1 + (freq_level * 0.4)
     
-    def emit_particles(self, odin_pos, particles_list, element_pan=0.0):
-        if not self.can_emit():
-            return
-            
-        element_pos = self.get_element_position_with_jitter()
-        
-        # Calculate left/right emitter positions
-        left_emitter = (element_pos[0] - self.emitter_separation//2, element_pos[1])
-        right_emitter = (element_pos[0] + self.emitter_separation//2, element_pos[1])
+    def emit_many(self, count, odin_pos, element_pan=0.0):
+        element_x, element_y = self.get_element_positions_with_jitter(count)
         
         # Calculate emission probabilities based on panning
         left_prob, right_prob = self._calculate_pan_probabilities(element_pan)
+        left = self.random.random(count) < left_prob
+        right = self.random.random(count) < right_prob
         
-        # Emit from left emitter
-        if random.random() < left_prob:
-            left_particle = ElementalParticle(
-                left_emitter, odin_pos, self.element_node.color,
-                self.batch, None, (0, 0),
-                emission_direction=(-1, 0),
-                element_type=self.element_node.element_type
-            )
-            particles_list.append(left_particle)
-        
-        # Emit from right emitter  
-        if random.random() < right_prob:
-            right_particle = ElementalParticle(
-                right_emitter, odin_pos, self.element_node.color,
-                self.batch, None, (0, 0),
-                emission_direction=(1, 0),
-                element_type=self.element_node.element_type
-            )
-            particles_list.append(right_particle)
+        # Left emitters fire outward to the left, right emitters to the right
+        half = self.emitter_separation // 2
+        x = np.concatenate((element_x[left] - half, element_x[right] + half))
+        return {
+            'x': x,
+            'y': np.concatenate((element_y[left], element_y[right])),
+            'emission_x': np.concatenate((np.full(left.sum(), -1.0), np.full(right.sum(), 1.0))),
+            'emission_y': np.zeros(len(x)),
+        }
     
     def _calculate_pan_probabilities(self, element_pan):
         """Calculate left/right emission probabilities from stereo panning"""
@@ -1,7 +1,5 @@
-import random
-import math
+import numpy as np
 from .base_emitter    import BaseEmitter
-from visual.particles import WaterParticle
 
 class StreamEmitter(BaseEmitter):
     def __init__(self, element_node, batch, stream_interval=0.06):
@@ -14,47 +12,43 @@ class StreamEmitter(BaseEmitter):
     def get_emission_probability(self, freq_level, midi_activity):
         # Water uses time-based emission instead of probability
         return 1.0
+
+    def get_emission_rate(self, freq_level, midi_activity):
+        # One cluster per stream interval on average, whatever the band level
+        return np.ones_like(np.asarray(freq_level, np.float64)) / self.stream_interval
+
+    def get_budgeted_share(self):
+        # The budget shrinks clusters rather than skipping them, so the stream stays continuous
+        return 1.0
     
-    def emit_particles(self, odin_pos, particles_list, element_pan=0.0):
-        if not self.can_emit():
-            return
-            
-        element_pos = self.get_element_position_with_jitter()
-        
-        # Create water droplet cluster
-        cluster_size = random.choice(self.cluster_sizes)
-        
-        for i in range(cluster_size):
-            droplet_pos = self._calculate_droplet_position(element_pos, odin_pos)
-            
-            water_particle = WaterParticle(
-                droplet_pos, odin_pos, self.element_node.color,
-                self.batch, None, (0, 0)
-            )
-            
-            # Configure stream properties
-            water_particle.curve_intensity = random.uniform(0.2, 0.4)
-            water_particle.curve_start_time = random.uniform(0.8, 1.4)
-            water_particle.speed = random.uniform(55, 80)
-            water_particle.stream_alignment_strength = random.uniform(0.4, 0.8)
-            
-            particles_list.append(water_particle)
+    def emit_many(self, count, odin_pos, element_pan=0.0):
+        # Create water droplet clusters
+        cluster_sizes = np.maximum(1, np.round(self.random.choice(self.cluster_sizes, count) * self.budget_scale))
+        droplets = int(cluster_sizes.sum())
+        x, y = self._calculate_droplet_positions(droplets, odin_pos)
         
-        # Reset cooldown for next emission
-        self.emission_cooldown = random.uniform(0.04, 0.08)
+        # Stream properties: gentle curve, late start, aligned with neighbours
+        return {
+            'x': x,
+            'y': y,
+            'speed': self.random.uniform(55, 80, droplets),
+            'curve_start': self.random.uniform(0.8, 1.4, droplets),
+            'curve_intensity': self.random.uniform(0.2, 0.4, droplets),
+            'alignment': self.random.uniform(0.4, 0.8, droplets),
+        }
     
-    def _calculate_droplet_position(self, element_pos, odin_pos):
-        """Calculate organic droplet position with angular variation"""
-        angle_spread = random.uniform(*self.angle_spread_range)
-        distance = random.uniform(*self.distance_range)
+    def _calculate_droplet_positions(self, count, odin_pos):
+        """Calculate organic droplet positions with angular variation"""
+        angle_spread = self.random.uniform(*self.angle_spread_range, count)
+        distance = self.random.uniform(*self.distance_range, count)
         
-        base_angle = math.atan2(
+        base_angle = np.arctan2(
             odin_pos[1] - self.element_node.original_y,
             odin_pos[0] - self.element_node.original_x
         )
-        varied_angle = base_angle + math.radians(angle_spread)
+        varied_angle = base_angle + np.radians(angle_spread)
         
         return (
-            self.element_node.original_x + math.cos(varied_angle) * distance,
-            self.element_node.original_y + math.sin(varied_angle) * distance
+            self.element_node.original_x + np.cos(varied_angle) * distance,
+            self.element_node.original_y + np.sin(varied_angle) * distance
         )
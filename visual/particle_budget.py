@@ -0,0 +1,63 @@
+from config.settings   import Settings
+from utils.frame_timer import FrameTimer
+
+class ParticleBudget:
+    """Throttle particle emission and explosion fan-out to hold a frame time target"""
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.min_level = Settings.PARTICLE_BUDGET_MIN_LEVEL
+        self.level = 1.0     # Share of the full particle load currently allowed
+        self.pinned = False  # Hold the full budget (e.g. while recording)
+        self.priorities = Settings.PARTICLE_BUDGET_PRIORITIES
+
+        # Frame time control
+        self.frame_timer = FrameTimer(Settings.PARTICLE_BUDGET_SMOOTHING)
+        self.target_frame_ms = 1000.0 / Settings.PARTICLE_BUDGET_TARGET_FPS
+        self.last_adjust_time = 0.0
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.level = 1.0
+        self.frame_timer.reset()
+
+    def update(self):
+        """Measure the frame and step the budget towards the frame time target"""
+        frame_ms = self.frame_timer.tick()
+        if not self.enabled or self.pinned:
+            self.level = 1.0
+            return
+        if frame_ms is None:
+            return
+
+        # Let the average settle on the new load before adjusting again
+        now = self.frame_timer.last_time
+        if now - self.last_adjust_time < Settings.PARTICLE_BUDGET_ADJUST_INTERVAL:
+            return
+
+        # Hysteresis: nothing changes inside the dead band, and the budget is cut faster than it recovers
+        headroom = Settings.PARTICLE_BUDGET_HEADROOM
+        new_level = self.level
+        if frame_ms > self.target_frame_ms * (1.0 + headroom):
+            new_level -= Settings.PARTICLE_BUDGET_STEP_DOWN
+        elif frame_ms < self.target_frame_ms * (1.0 - headroom):
+            new_level += Settings.PARTICLE_BUDGET_STEP_UP
+        new_level = round(max(self.min_level, min(1.0, new_level)), 3)
+
+        if new_level != self.level:
+            self.level = new_level
+            self.last_adjust_time = now
+
+    def get_scale(self, source):
+        """Share of its full particle count a source (element type or "EXPLOSION") may spawn"""
+        if self.level >= 1.0:
+            return 1.0
+        # Low priority sources shed load first: priority 0.5 loses twice as fast as priority 1.0
+        priority = self.priorities.get(source, 1.0)
+        scale = 1.0 - (1.0 - self.level) / priority
+        return max(Settings.PARTICLE_BUDGET_MIN_SCALE, min(1.0, scale))
+
+    def allows_emission(self, particle_count):
+        """False once the live particle count reaches the hard cap (no cap while the budget is disabled or pinned)"""
+        if not self.enabled or self.pinned:
+            return True
+        return particle_count < Settings.PARTICLE_BUDGET_MAX_PARTICLES
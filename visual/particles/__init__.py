@@ -1,6 +1,6 @@
-from .elemental_particle    import ElementalParticle
-from .water_particle        import WaterParticle
-from .explosion_particle    import ExplosionParticle
-from .explosion_particle_3d import ExplosionParticle3D
+from .explosion_particle import ExplosionParticle
+from .particle_engine    import ParticleEngine
+from .explosion_engine   import ExplosionEngine
+from .simulation_worker  import SimulationWorker
 
-__all__ = ['ElementalParticle', 'WaterParticle', 'ExplosionParticle', 'ExplosionParticle3D']
\ No newline at end of file
+__all__ = ['ExplosionParticle', 'ParticleEngine', 'ExplosionEngine', 'SimulationWorker']
\ No newline at end of file
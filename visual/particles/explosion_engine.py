@@ -0,0 +1,204 @@
+import math
+import numpy as np
+from config.settings      import Settings
+from utils.random_streams import RandomStreams
+from .                    import particle_kernels
+from .particle_pool       import ParticlePool
+from .particle_renderer   import ExplosionRenderer
+
+class ExplosionEngine:
+    """Odin's explosion bursts as structure-of-arrays pools - generated, projected and culled with NumPy"""
+    PARTICLE_TYPES = ("screen_plane", "toward_viewer", "away_from_viewer")
+    SCREEN_PLANE, TOWARD_VIEWER, AWAY_FROM_VIEWER = range(3)
+    ELEMENT_NAMES = ("EARTH", "WIND", "FIRE", "WATER")  # Indexed by element code, as in ParticleEngine
+
+    # Motion model constants
+    FOCAL_LENGTH = 2000.0
+    NEAR_PLANE = FOCAL_LENGTH * 0.9  # z past this is (almost) behind the viewer
+    MAX_LIFE = 20.0
+
+    FLOAT_FIELDS = ('x', 'y', 'z', 'start_x', 'start_y', 'vx', 'vy', 'vz', 'life', 'perspective_scale',
+                    'prev_x', 'prev_y')
+
+    def __init__(self, batch, capacity=256, backend=None):
+        self.pools = {
+            name: ParticlePool(name, self.FLOAT_FIELDS, capacity, code_fields=('kind', 'opacity'))
+            for name in self.ELEMENT_NAMES
+        }
+        self.random = RandomStreams.numpy("explosions")
+        self.jit = particle_kernels.use_jit(backend or Settings.PARTICLE_KERNEL_BACKEND)
+        self.renderers = {}
+        if batch is not None:
+            self.renderers = {name: ExplosionRenderer(name, batch) for name in self.ELEMENT_NAMES}
+
+        # Bursts waiting to be spawned - each is released over a few frames
+        self.pending = []
+
+        # Per-type counters: particles currently on screen / retired by culling
+        self.visible = {particle_type: 0 for particle_type in self.PARTICLE_TYPES}
+        self.culled = {particle_type: 0 for particle_type in self.PARTICLE_TYPES}
+        if self.jit:
+            self.warm_up()
+
+    def warm_up(self):
+        """Compile the kernel at launch on a throwaway pool, not on the first explosion"""
+        pool = ParticlePool("FIRE", self.FLOAT_FIELDS, 1, code_fields=('kind', 'opacity'))
+        pool.acquire_block(1)
+        self._simulate(pool, 1.0 / Settings.SIMULATION_RATE)
+
+    @property
+    def count(self):
+        return sum(pool.count for pool in self.pools.values())
+
+    def __len__(self):
+        return self.count
+
+    def explode(self, position, element_codes, colors):
+        """Generate a whole burst in one vectorized pass - its particles appear over the next few frames"""
+        count = len(element_codes)
+        if count == 0:
+            return
+
+        # 5% fly toward the viewer, 5% away, the rest spread out in the screen plane
+        chance = self.random.random(count)
+        kind = np.full(count, self.SCREEN_PLANE, np.uint8)
+        kind[chance < 0.10] = self.AWAY_FROM_VIEWER
+        kind[chance < 0.05] = self.TOWARD_VIEWER
+        toward = kind == self.TOWARD_VIEWER
+        away = kind == self.AWAY_FROM_VIEWER
+
+        angle = self.random.uniform(0, 2 * math.pi, count)
+        radius = np.where(away, 0.5, 1.0)
+        direction_x = np.where(toward, self.random.uniform(-0.2, 0.2, count), np.cos(angle) * radius)
+        direction_y = np.where(toward, self.random.uniform(-0.2, 0.2, count), np.sin(angle) * radius)
+
+        # Speed ranges per type: (low, high) for x/y, and z
+        low = np.select((toward, away), (20.0, 30.0), 50.0)
+        high = np.select((toward, away), (60.0, 80.0), 150.0)
+        vz = np.select(
+            (toward, away), (self.random.uniform(50, 150, count), self.random.uniform(-150, -50, count)), 0.0
+        )
+
+        burst = {
+            'element': np.asarray(element_codes, np.uint8),
+            'color': np.asarray(colors, np.uint8).reshape(count, 3),
+            'kind': kind,
+            'vx': direction_x * self.random.uniform(low, high),
+            'vy': direction_y * self.random.uniform(low, high),
+            'vz': vz,
+        }
+        per_frame = math.ceil(count / max(1, Settings.EXPLOSION_SPAWN_FRAMES))
+        self.pending.append((position, burst, 0, per_frame))
+
+    def _spawn_pending(self):
+        """Move the next slice of every pending burst into the pools"""
+        still_pending = []
+        for position, burst, start, per_frame in self.pending:
+            end = min(start + per_frame, len(burst['kind']))
+            element = burst['element'][start:end]
+            for code, (element_type, pool) in enumerate(self.pools.items()):
+                rows = np.flatnonzero(element == code) + start
+                if len(rows) == 0:
+                    continue
+                block = pool.acquire_block(len(rows))
+                pool.x[block] = pool.start_x[block] = pool.prev_x[block] = position[0]
+                pool.y[block] = pool.start_y[block] = pool.prev_y[block] = position[1]
+                pool.z[block] = 0.0
+                pool.life[block] = self.MAX_LIFE
+                pool.perspective_scale[block] = 1.0
+                pool.opacity[block] = 255
+                for name in ('kind', 'vx', 'vy', 'vz', 'color'):
+                    getattr(pool, name)[block] = burst[name][rows]
+            if end < len(burst['kind']):
+                still_pending.append((position, burst, end, per_frame))
+        self.pending = still_pending
+
+    def update(self, frame, view_width=None, view_height=None, cull_margin=0):
+        """Spawn queued particles, advance and project everything, cull what left the viewport"""
+        dt = frame.dt
+        if self.pending:
+            self._spawn_pending()
+
+        for particle_type in self.PARTICLE_TYPES:
+            self.visible[particle_type] = 0
+        for element_type, pool in self.pools.items():
+            if pool.count:
+                self._simulate(pool, dt)
+                if view_width is not None:
+                    self._cull(pool, view_width, view_height, cull_margin)
+                visible = np.bincount(pool.kind[:pool.count][pool.alive[:pool.count]], minlength=3)
+                for code, particle_type in enumerate(self.PARTICLE_TYPES):
+                    self.visible[particle_type] += int(visible[code])
+            pool.release_retired()
+
+    def clear(self):
+        """Remove every particle and pending burst, and zero the counters"""
+        for pool in self.pools.values():
+            pool.clear()
+        self.pending = []
+        for particle_type in self.PARTICLE_TYPES:
+            self.visible[particle_type] = 0
+            self.culled[particle_type] = 0
+
+    def render(self, alpha=1.0):
+        """Write the vertex lists, alpha of the way from the previous step to the current one"""
+        for element_type, renderer in self.renderers.items():
+            renderer.update(self.pools[element_type], alpha)
+
+    def _simulate(self, pool, dt):
+        n = pool.count
+        pool.prev_x[:n] = pool.x[:n]
+        pool.prev_y[:n] = pool.y[:n]
+        if self.jit:
+            particle_kernels.integrate_explosions(
+                pool.x[:n], pool.y[:n], pool.z[:n], pool.start_x[:n], pool.start_y[:n], pool.vx[:n], pool.vy[:n],
+                pool.vz[:n], pool.life[:n], pool.perspective_scale[:n], pool.kind[:n], pool.opacity[:n],
+                pool.alive[:n], dt, self.FOCAL_LENGTH, self.MAX_LIFE, self.TOWARD_VIEWER, self.AWAY_FROM_VIEWER
+            )
+            return
+        x, y, z = pool.x[:n], pool.y[:n], pool.z[:n]
+        vz = pool.vz[:n]
+        kind = pool.kind[:n]
+        alive = pool.alive[:n]
+        toward = kind == self.TOWARD_VIEWER
+        away = kind == self.AWAY_FROM_VIEWER
+
+        x += pool.vx[:n] * dt
+        y += pool.vy[:n] * dt
+        z += vz * dt
+
+        # Away-from-viewer particles vanish as soon as they leave their origin
+        gone = away & (np.sqrt((x - pool.start_x[:n]) ** 2 + (y - pool.start_y[:n]) ** 2 + z ** 2) > 2)
+        alive &= ~gone
+
+        vz += np.where(toward, 50 * dt, 0.0)
+        vz -= np.where(away & ~gone, 100000 * dt, 0.0)
+
+        life = pool.life[:n]
+        life -= np.where(away, dt * 100.0, dt * 0.5)
+        alive &= life > 0
+
+        # Perspective projection, particles outside the frustum depth range retire
+        in_depth = (-self.FOCAL_LENGTH < z) & (z < self.FOCAL_LENGTH)
+        alive &= in_depth
+        scale = np.maximum(0.1, self.FOCAL_LENGTH / np.where(in_depth, self.FOCAL_LENGTH - z, 1.0))
+        pool.perspective_scale[:n] = np.where(alive, scale, pool.perspective_scale[:n])
+
+        opacity_factor = np.where(scale > 3.0, np.maximum(0.2, 3.0 / scale), 1.0)
+        opacity = np.trunc(life / self.MAX_LIFE * 255 * opacity_factor)
+        pool.opacity[:n] = np.where(alive, np.clip(opacity, 0, 255), pool.opacity[:n])
+
+    def _cull(self, pool, width, height, margin):
+        """Retire live particles whose projected shape no longer overlaps the viewport"""
+        n = pool.count
+        x, y = pool.x[:n], pool.y[:n]
+        # Widest shape (wind chevron) reaches ~4x the perspective scale from its centre
+        extent = margin + 4 * pool.perspective_scale[:n]
+        in_view = ((pool.z[:n] < self.NEAR_PLANE) &
+                   (-extent < x) & (x < width + extent) & (-extent < y) & (y < height + extent))
+        culled = pool.alive[:n] & ~in_view
+        if culled.any():
+            pool.alive[:n] &= in_view
+            counts = np.bincount(pool.kind[:n][culled], minlength=3)
+            for code, particle_type in enumerate(self.PARTICLE_TYPES):
+                self.culled[particle_type] += int(counts[code])
@@ -0,0 +1,357 @@
+import numpy as np
+from config.settings      import Settings
+from utils.random_streams import RandomStreams
+from .                    import particle_kernels, particle_paths
+from .particle_renderer   import ParticleRenderer
+from .particle_pool       import ParticlePool
+from .spatial_grid        import SpatialGrid
+
+class ParticleEngine:
+    """Elemental particles kept as structure-of-arrays pools and simulated with vectorized NumPy"""
+    ELEMENT_CODES = {"EARTH": 0, "WIND": 1, "FIRE": 2, "WATER": 3}
+    ELEMENT_NAMES = ("EARTH", "WIND", "FIRE", "WATER")
+    MOTION_MODELS = ("integrated", "bezier")
+
+    # Motion model constants
+    ARRIVAL_DISTANCE = 5.0         # Particles retire this close to their target
+    CURVE_FALLOFF = 100.0          # Curve strength fades inside this distance of the target
+    CURVE_STRENGTH = 30.0          # Elemental particles bend hard and renormalize
+    WATER_CURVE_STRENGTH = 0.3     # Water only drifts sideways (3 * 0.1), no renormalize
+    WATER_NEIGHBOR_DISTANCE = 25.0
+    COHESION_CHUNK = 4096          # Water particles queried against the grid at a time
+
+    FLOAT_FIELDS = (
+        'x', 'y', 'target_x', 'target_y', 'speed',
+        'emission_x', 'emission_y', 'emission_duration',
+        'curve_start', 'curve_intensity', 'curve_direction',
+        'elapsed', 'velocity_x', 'velocity_y', 'anchor_x', 'anchor_y', 'alignment',
+        'prev_x', 'prev_y',  # Position at the previous step, for render interpolation
+        'spawn_time', 'path_duration',  # Closed-form paths: emission time, time to reach the target
+        'control_x1', 'control_y1', 'control_x2', 'control_y2',  # and the Bezier's inner control points
+    )
+
+    def __init__(self, batch, capacity=256, backend=None, motion=None):
+        # One pool per element, each with its own preallocated vertex list
+        self.pools = {
+            name: ParticlePool(name, self.FLOAT_FIELDS, capacity, flag_fields=('curving',))
+            for name in self.ELEMENT_NAMES
+        }
+        self.random = RandomStreams.python("particles")
+        self.batch_random = RandomStreams.numpy("particles.batch")  # Draws for emit_batch
+        self.jit = particle_kernels.use_jit(backend or Settings.PARTICLE_KERNEL_BACKEND)  # numba kernels, else NumPy
+        self.water_grid = SpatialGrid(self.WATER_NEIGHBOR_DISTANCE)  # Cell size = neighbour radius
+        self.motion = motion or Settings.PARTICLE_MOTION_MODEL
+        if self.motion not in self.MOTION_MODELS:
+            raise ValueError(f"Unknown particle motion model: {self.motion}")
+        self.time = 0.0  # Simulation time of the last update, new particles are spawned at it
+        self.renderers = {}
+        if batch is not None:
+            self.renderers = {name: ParticleRenderer(name, batch) for name in self.ELEMENT_NAMES}
+        if self.jit:
+            self.warm_up()
+
+    def warm_up(self):
+        """Compile the kernels at launch on a throwaway pool, not on the first frame with particles"""
+        for element_type in ("EARTH", "WATER"):  # Water also runs the cohesion kernel
+            pool = ParticlePool(element_type, self.FLOAT_FIELDS, 2, flag_fields=('curving',))
+            pool.acquire_block(2)
+            pool.target_x[:] = 100.0  # Moving towards a target, neighbours of each other
+            pool.speed[:] = 1.0
+            self._simulate_jit(pool, 1.0 / Settings.SIMULATION_RATE)
+
+    @property
+    def count(self):
+        return sum(pool.count for pool in self.pools.values())
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, element_type, start_pos, target_pos, color, emission_direction=None, speed=None,
+             curve_start_time=None, curve_intensity=None, stream_alignment=0.3):
+        """Add one particle - unspecified parameters are drawn at random"""
+        emission_duration = self.random.uniform(0.3, 0.8)
+        if speed is None:
+            speed = self.random.uniform(40, 100)
+        if curve_start_time is None:
+            curve_start_time = emission_duration if emission_direction else self.random.uniform(0.2, 1.3)
+        if curve_intensity is None:
+            curve_intensity = self.random.uniform(0.3, 1.0)
+
+        pool = self.pools[element_type]
+        i = pool.acquire()
+        pool.x[i], pool.y[i] = start_pos
+        pool.prev_x[i], pool.prev_y[i] = start_pos
+        pool.anchor_x[i], pool.anchor_y[i] = start_pos
+        pool.target_x[i], pool.target_y[i] = target_pos
+        pool.speed[i] = speed
+        if emission_direction:
+            pool.emission_x[i], pool.emission_y[i] = emission_direction
+            pool.emission_duration[i] = emission_duration
+        else:
+            pool.emission_x[i] = pool.emission_y[i] = 0.0
+            pool.emission_duration[i] = 0.0  # No emission phase
+        pool.curve_start[i] = curve_start_time
+        pool.curve_intensity[i] = curve_intensity
+        pool.curve_direction[i] = self.random.choice((-1.0, 1.0))
+        pool.alignment[i] = stream_alignment
+        pool.elapsed[i] = 0.0
+        pool.spawn_time[i] = self.time
+        pool.velocity_x[i] = pool.velocity_y[i] = 0.0
+        pool.color[i] = [int(c) for c in color[:3]]
+        if self.motion == "bezier":
+            self._plan_paths(pool, slice(i, i + 1))
+
+    def emit_batch(self, element_type, target_pos, color, x, y, emission_x=None, emission_y=None, speed=None,
+                   curve_start=None, curve_intensity=None, alignment=None):
+        """Add len(x) particles in one block write - parameter arrays left out are drawn as in emit()"""
+        count = len(x)
+        if count == 0:
+            return
+        random = self.batch_random
+        emission_duration = random.uniform(0.3, 0.8, count)
+        if emission_x is not None:
+            directed = (np.asarray(emission_x) != 0) | (np.asarray(emission_y) != 0)
+            emission_duration = np.where(directed, emission_duration, 0.0)  # No emission phase
+        else:
+            directed = np.zeros(count, bool)
+            emission_x = emission_y = emission_duration = 0.0
+        if speed is None:
+            speed = random.uniform(40, 100, count)
+        if curve_start is None:
+            curve_start = np.where(directed, emission_duration, random.uniform(0.2, 1.3, count))
+        if curve_intensity is None:
+            curve_intensity = random.uniform(0.3, 1.0, count)
+
+        pool = self.pools[element_type]
+        block = pool.acquire_block(count)
+        pool.x[block] = pool.prev_x[block] = pool.anchor_x[block] = x
+        pool.y[block] = pool.prev_y[block] = pool.anchor_y[block] = y
+        pool.target_x[block], pool.target_y[block] = target_pos
+        pool.speed[block] = speed
+        pool.emission_x[block] = emission_x
+        pool.emission_y[block] = emission_y
+        pool.emission_duration[block] = emission_duration
+        pool.curve_start[block] = curve_start
+        pool.curve_intensity[block] = curve_intensity
+        pool.curve_direction[block] = random.choice((-1.0, 1.0), count)
+        pool.alignment[block] = 0.3 if alignment is None else alignment
+        pool.elapsed[block] = 0.0
+        pool.spawn_time[block] = self.time
+        pool.velocity_x[block] = pool.velocity_y[block] = 0.0
+        pool.color[block] = [int(c) for c in color[:3]]
+        if self.motion == "bezier":
+            self._plan_paths(pool, block)
+
+    def update(self, frame, capture_center=None, capture_radius=0.0, on_capture=None):
+        """Advance every particle, hand captured ones to on_capture and recycle the retired slots"""
+        dt = frame.dt
+        self.time = frame.time
+        for pool in self.pools.values():
+            if pool.count:
+                n = pool.count
+                pool.prev_x[:n] = pool.x[:n]
+                pool.prev_y[:n] = pool.y[:n]
+                if self.motion == "bezier" and pool.element_type != "WATER":  # Water steers by its neighbours
+                    self._evaluate_paths(pool, capture_center)
+                else:
+                    self._simulate(pool, dt)
+        if capture_center is not None and on_capture is not None:
+            self._capture(capture_center, capture_radius, on_capture)
+        for pool in self.pools.values():
+            pool.release_retired()
+
+    def clear(self):
+        """Remove every particle (e.g. when playback restarts)"""
+        for pool in self.pools.values():
+            pool.clear()
+        self.time = 0.0
+
+    def render(self, alpha=1.0):
+        """Write the vertex lists, alpha of the way from the previous step to the current one"""
+        for element_type, renderer in self.renderers.items():
+            renderer.update(self.pools[element_type], alpha)
+
+    def _simulate(self, pool, dt):
+        if self.jit:
+            self._simulate_jit(pool, dt)
+            return
+        n = pool.count
+        water = pool.element_type == "WATER"
+        x, y = pool.x[:n], pool.y[:n]
+        speed = pool.speed[:n]
+        elapsed = pool.elapsed[:n]
+        elapsed += dt
+
+        # Emission phase: straight out of the emitter
+        emitting = elapsed < pool.emission_duration[:n]
+        if emitting.any():
+            step = np.where(emitting, speed * dt, 0.0)
+            x += pool.emission_x[:n] * step
+            y += pool.emission_y[:n] * step
+        moving = ~emitting
+
+        curving = pool.curving[:n]
+        curving |= moving & (elapsed > pool.curve_start[:n])
+
+        # Head for the target, retiring on arrival
+        dx = pool.target_x[:n] - x
+        dy = pool.target_y[:n] - y
+        dist = np.hypot(dx, dy)
+        arrived = moving & (dist < self.ARRIVAL_DISTANCE)
+        alive = pool.alive[:n]
+        alive &= ~arrived
+        active = moving & ~arrived
+
+        safe_dist = np.where(dist > 0, dist, 1.0)
+        dir_x = dx / safe_dist
+        dir_y = dy / safe_dist
+
+        if water and active.any():
+            dir_x, dir_y = self._apply_stream_cohesion(pool, active, dir_x, dir_y)
+
+        # Sideways curve, fading out near the target
+        bend = active & curving
+        if bend.any():
+            closeness = np.minimum(1.0, dist / self.CURVE_FALLOFF) * pool.curve_intensity[:n]
+            perp_x = -dir_y * pool.curve_direction[:n]
+            perp_y = dir_x * pool.curve_direction[:n]
+
+            strength = self.WATER_CURVE_STRENGTH if water else self.CURVE_STRENGTH
+            push = np.where(bend, closeness * strength * dt, 0.0)
+            dir_x = dir_x + perp_x * push
+            dir_y = dir_y + perp_y * push
+
+            if not water:
+                magnitude = np.hypot(dir_x, dir_y)
+                renormalize = bend & (magnitude > 0)
+                dir_x = np.where(renormalize, dir_x / np.where(renormalize, magnitude, 1.0), dir_x)
+                dir_y = np.where(renormalize, dir_y / np.where(renormalize, magnitude, 1.0), dir_y)
+
+        step = np.where(active, speed * dt, 0.0)
+        x += dir_x * step
+        y += dir_y * step
+
+        if water:
+            # Water remembers its velocity so neighbours can align with it next frame
+            pool.velocity_x[:n] = np.where(active, dir_x * speed, pool.velocity_x[:n])
+            pool.velocity_y[:n] = np.where(active, dir_y * speed, pool.velocity_y[:n])
+
+    def _plan_paths(self, pool, rows):
+        """Fix the Bezier control points and travel time of newly emitted particles"""
+        (pool.control_x1[rows], pool.control_y1[rows], pool.control_x2[rows], pool.control_y2[rows],
+         pool.path_duration[rows]) = particle_paths.control_points(
+            pool.anchor_x[rows], pool.anchor_y[rows], pool.target_x[rows], pool.target_y[rows], pool.speed[rows],
+            pool.emission_x[rows], pool.emission_y[rows], pool.emission_duration[rows],
+            pool.curve_intensity[rows], pool.curve_direction[rows]
+        )
+
+    def _evaluate_paths(self, pool, end=None):
+        """Closed-form motion: every particle is placed on its Bezier path, the end re-anchored to Odin"""
+        n = pool.count
+        u = np.minimum(1.0, (self.time - pool.spawn_time[:n]) / pool.path_duration[:n])
+        pool.x[:n], pool.y[:n] = particle_paths.positions(
+            pool.anchor_x[:n], pool.anchor_y[:n], pool.control_x1[:n], pool.control_y1[:n],
+            pool.control_x2[:n], pool.control_y2[:n],
+            pool.target_x[:n] if end is None else end[0], pool.target_y[:n] if end is None else end[1], u
+        )
+        pool.alive[:n] &= u < 1.0  # Arrived
+
+    def _simulate_jit(self, pool, dt):
+        """Same step as _simulate, as compiled per-particle loops"""
+        n = pool.count
+        water = pool.element_type == "WATER"
+        active = np.empty(n, bool)
+        dir_x, dir_y, dist = np.zeros(n), np.zeros(n), np.empty(n)
+        particle_kernels.steer_particles(
+            pool.x[:n], pool.y[:n], pool.target_x[:n], pool.target_y[:n], pool.speed[:n], pool.elapsed[:n],
+            pool.emission_x[:n], pool.emission_y[:n], pool.emission_duration[:n], pool.curve_start[:n],
+            pool.curving[:n], pool.alive[:n], active, dir_x, dir_y, dist, dt, self.ARRIVAL_DISTANCE
+        )
+        if water and active.any():
+            self._apply_stream_cohesion_jit(pool, active, dir_x, dir_y)
+        particle_kernels.advance_particles(
+            pool.x[:n], pool.y[:n], pool.speed[:n], pool.curve_intensity[:n], pool.curve_direction[:n],
+            pool.curving[:n], active, dir_x, dir_y, dist, pool.velocity_x[:n], pool.velocity_y[:n], dt,
+            self.CURVE_FALLOFF, self.WATER_CURVE_STRENGTH if water else self.CURVE_STRENGTH, not water, water
+        )
+
+    def _apply_stream_cohesion_jit(self, pool, stream, dir_x, dir_y):
+        """Cohesion on the grid's cell table, blended in place - no pair arrays are materialized"""
+        n = pool.count
+        others = np.flatnonzero(pool.alive[:n])
+        grid = self.water_grid
+        grid.rebuild(pool.x[others], pool.y[others])
+        reach = int(np.ceil(self.WATER_NEIGHBOR_DISTANCE / grid.cell_size))
+        particle_kernels.blend_cohesion(
+            grid.cell_keys, grid.cell_starts, grid.cell_counts, grid.order, grid.x, grid.y,
+            pool.velocity_x[others], pool.velocity_y[others], others, stream[others], grid.KEY_STRIDE, reach,
+            self.WATER_NEIGHBOR_DISTANCE, pool.alignment[:n], pool.speed[:n], dir_x, dir_y
+        )
+
+    def _apply_stream_cohesion(self, pool, stream, dir_x, dir_y):
+        """Blend water headings with the average velocity of nearby water particles"""
+        n = pool.count
+        movers = np.flatnonzero(stream)
+        others = np.flatnonzero(pool.alive[:n])
+        x, y = pool.x[:n], pool.y[:n]
+
+        # Bucket the water once, then each mover only checks the cells around it
+        self.water_grid.rebuild(x[others], y[others])
+        sum_vx = np.zeros(len(movers))
+        sum_vy = np.zeros(len(movers))
+        counts = np.zeros(len(movers))
+        other_vx, other_vy = pool.velocity_x[others], pool.velocity_y[others]
+        for start in range(0, len(movers), self.COHESION_CHUNK):  # Chunked to bound the pair arrays
+            rows = movers[start:start + self.COHESION_CHUNK]
+            queries, points = self.water_grid.query_pairs(x[rows], y[rows], self.WATER_NEIGHBOR_DISTANCE)
+            not_self = rows[queries] != others[points]
+            queries, points = queries[not_self], points[not_self]
+            chunk = len(rows)
+            sum_vx[start:start + chunk] = np.bincount(queries, other_vx[points], chunk)
+            sum_vy[start:start + chunk] = np.bincount(queries, other_vy[points], chunk)
+            counts[start:start + chunk] = np.bincount(queries, minlength=chunk)
+
+        has_neighbors = counts > 0
+        rows = movers[has_neighbors]
+        if len(rows) == 0:
+            return dir_x, dir_y
+
+        blend = pool.alignment[rows]
+        speed = pool.speed[rows]
+        new_x = dir_x[rows] * (1 - blend) + (sum_vx[has_neighbors] / counts[has_neighbors] / speed) * blend
+        new_y = dir_y[rows] * (1 - blend) + (sum_vy[has_neighbors] / counts[has_neighbors] / speed) * blend
+        magnitude = np.hypot(new_x, new_y)
+        magnitude = np.where(magnitude > 0, magnitude, 1.0)
+
+        dir_x = dir_x.copy()
+        dir_y = dir_y.copy()
+        dir_x[rows] = new_x / magnitude
+        dir_y[rows] = new_y / magnitude
+        return dir_x, dir_y
+
+    def _capture(self, center, radius, on_capture):
+        """Offer particles within radius of center to on_capture, retire the ones it takes"""
+        candidates = {}
+        for element_type, pool in self.pools.items():
+            n = pool.count
+            near = pool.alive[:n] & (np.hypot(pool.x[:n] - center[0], pool.y[:n] - center[1]) < radius)
+            slots = np.flatnonzero(near)
+            if len(slots):
+                candidates[element_type] = slots
+        if not candidates:
+            return
+
+        codes = np.concatenate([np.full(len(slots), self.ELEMENT_CODES[element_type], np.uint8)
+                                for element_type, slots in candidates.items()])
+        colors = np.concatenate([self.pools[element_type].color[slots]
+                                 for element_type, slots in candidates.items()])
+        consumed = on_capture(codes, colors)
+
+        offset = 0
+        for element_type, slots in candidates.items():
+            taken = consumed[offset:offset + len(slots)]
+            self.pools[element_type].alive[slots[taken]] = False
+            offset += len(slots)
+
+    def get_element_type(self, code):
+        return self.ELEMENT_NAMES[code]
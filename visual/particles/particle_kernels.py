@@ -0,0 +1,179 @@
+import math
+import numpy as np
+
+# Optional JIT backend - every kernel here has a NumPy twin in ParticleEngine / ExplosionEngine
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+BACKENDS = ("auto", "numba", "numpy")
+
+def use_jit(backend):
+    """True when the numba kernels should run for this backend setting"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown particle kernel backend: {backend}")
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        print("⚠️  numba not installed, particle kernels fall back to NumPy")
+    return backend != "numpy" and NUMBA_AVAILABLE
+
+
+if NUMBA_AVAILABLE:
+    @njit(nogil=True, cache=True)
+    def lower_bound(keys, key):
+        """First index whose key is >= key (keys ascending)"""
+        low, high = 0, len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if keys[middle] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def steer_particles(x, y, target_x, target_y, speed, elapsed, emission_x, emission_y, emission_duration,
+                        curve_start, curving, alive, active, dir_x, dir_y, dist, dt, arrival_distance):
+        """Emission phase, arrival and heading towards the target - first half of an elemental step"""
+        for i in prange(len(x)):
+            elapsed[i] += dt
+            active[i] = False
+            if elapsed[i] < emission_duration[i]:
+                x[i] += emission_x[i] * speed[i] * dt
+                y[i] += emission_y[i] * speed[i] * dt
+                dx = target_x[i] - x[i]
+                dy = target_y[i] - y[i]
+                dist[i] = math.hypot(dx, dy)
+                continue
+            if elapsed[i] > curve_start[i]:
+                curving[i] = True
+
+            dx = target_x[i] - x[i]
+            dy = target_y[i] - y[i]
+            d = math.hypot(dx, dy)
+            dist[i] = d
+            if d < arrival_distance:
+                alive[i] = False
+                continue
+            active[i] = True
+            safe = d if d > 0 else 1.0
+            dir_x[i] = dx / safe
+            dir_y[i] = dy / safe
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def advance_particles(x, y, speed, curve_intensity, curve_direction, curving, active, dir_x, dir_y, dist,
+                          velocity_x, velocity_y, dt, curve_falloff, curve_strength, renormalize, keep_velocity):
+        """Sideways curve and the move itself - second half of an elemental step"""
+        for i in prange(len(x)):
+            if not active[i]:
+                continue
+            heading_x = dir_x[i]
+            heading_y = dir_y[i]
+            if curving[i]:
+                closeness = min(1.0, dist[i] / curve_falloff) * curve_intensity[i]
+                push = closeness * curve_strength * dt
+                perp_x = -heading_y * curve_direction[i]
+                perp_y = heading_x * curve_direction[i]
+                heading_x += perp_x * push
+                heading_y += perp_y * push
+                if renormalize:
+                    magnitude = math.hypot(heading_x, heading_y)
+                    if magnitude > 0:
+                        heading_x /= magnitude
+                        heading_y /= magnitude
+            x[i] += heading_x * speed[i] * dt
+            y[i] += heading_y * speed[i] * dt
+            if keep_velocity:
+                velocity_x[i] = heading_x * speed[i]
+                velocity_y[i] = heading_y * speed[i]
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def blend_cohesion(cell_keys, cell_starts, cell_counts, order, point_x, point_y, point_vx, point_vy, point_rows,
+                       is_mover, key_stride, reach, radius, alignment, speed, dir_x, dir_y):
+        """Blend each mover's heading with its neighbours' average velocity, walking the SpatialGrid cell table
+
+        Cells are sorted by packed key, so each column of neighbouring cells is one run of sorted points -
+        every cell finds its 2 * reach + 1 runs once and all its points scan them.
+        """
+        points = len(order)
+        sum_vx = np.zeros(points)
+        sum_vy = np.zeros(points)
+        counts = np.zeros(points, np.int64)
+        radius_sq = radius * radius
+        for cell in prange(len(cell_keys)):
+            home_start = cell_starts[cell]
+            home_end = home_start + cell_counts[cell]
+            for offset_x in range(-reach, reach + 1):
+                column_key = cell_keys[cell] + offset_x * key_stride
+                first = lower_bound(cell_keys, column_key - reach)
+                last = lower_bound(cell_keys, column_key + reach + 1)
+                if first == last:
+                    continue
+                run_start = cell_starts[first]
+                run_end = cell_starts[last - 1] + cell_counts[last - 1]
+                for home in range(home_start, home_end):
+                    point = order[home]
+                    if not is_mover[point]:
+                        continue
+                    qx, qy = point_x[point], point_y[point]
+                    for slot in range(run_start, run_end):
+                        other = order[slot]
+                        if other == point:
+                            continue
+                        dx = point_x[other] - qx
+                        dy = point_y[other] - qy
+                        if dx * dx + dy * dy < radius_sq:
+                            sum_vx[point] += point_vx[other]
+                            sum_vy[point] += point_vy[other]
+                            counts[point] += 1
+
+        for point in prange(points):
+            if counts[point] == 0:
+                continue
+            row = point_rows[point]
+            blend = alignment[row]
+            new_x = dir_x[row] * (1 - blend) + (sum_vx[point] / counts[point] / speed[row]) * blend
+            new_y = dir_y[row] * (1 - blend) + (sum_vy[point] / counts[point] / speed[row]) * blend
+            magnitude = math.hypot(new_x, new_y)
+            if magnitude <= 0:
+                magnitude = 1.0
+            dir_x[row] = new_x / magnitude
+            dir_y[row] = new_y / magnitude
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def integrate_explosions(x, y, z, start_x, start_y, vx, vy, vz, life, perspective_scale, kind, opacity, alive,
+                             dt, focal_length, max_life, toward_viewer, away_from_viewer):
+        """3D explosion motion, perspective scale and opacity (ExplosionEngine._simulate per particle)"""
+        for i in prange(len(x)):
+            toward = kind[i] == toward_viewer
+            away = kind[i] == away_from_viewer
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            z[i] += vz[i] * dt
+
+            gone = False
+            if away:
+                ddx = x[i] - start_x[i]
+                ddy = y[i] - start_y[i]
+                gone = math.sqrt(ddx * ddx + ddy * ddy + z[i] * z[i]) > 2
+                if gone:
+                    alive[i] = False
+                else:
+                    vz[i] -= 100000 * dt
+            elif toward:
+                vz[i] += 50 * dt
+
+            life[i] -= dt * 100.0 if away else dt * 0.5
+            if life[i] <= 0:
+                alive[i] = False
+
+            if not (-focal_length < z[i] < focal_length):
+                alive[i] = False
+                continue
+            if not alive[i]:
+                continue
+            scale = max(0.1, focal_length / (focal_length - z[i]))
+            perspective_scale[i] = scale
+            opacity_factor = max(0.2, 3.0 / scale) if scale > 3.0 else 1.0
+            opacity[i] = int(min(255.0, max(0.0, math.trunc(life[i] / max_life * 255 * opacity_factor))))
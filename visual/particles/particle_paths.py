@@ -0,0 +1,36 @@
+import numpy as np
+
+# Closed-form particle paths: a cubic Bezier from the spawn point to the target.
+# Control points are fixed at emission, a position is a function of them, the end point and the time since spawn.
+BEND = 0.25  # Sideways control offset per unit of curve intensity, as a share of the chord
+
+def control_points(start_x, start_y, end_x, end_y, speed, emission_x, emission_y, emission_duration,
+                   curve_intensity, curve_direction):
+    """Inner control points of every path and the time each takes to travel"""
+    chord_x = end_x - start_x
+    chord_y = end_y - start_y
+    length = np.hypot(chord_x, chord_y)
+
+    # Leave along the emission direction (its push lasts the emission phase), else straight at the target
+    directed = (emission_x != 0) | (emission_y != 0)
+    lead = np.maximum(speed * emission_duration, length / 3)
+    first_x = start_x + np.where(directed, emission_x * lead, chord_x / 3)
+    first_y = start_y + np.where(directed, emission_y * lead, chord_y / 3)
+
+    # Arrive from the side the particle curves towards
+    bend = curve_direction * curve_intensity * BEND
+    second_x = start_x + chord_x * 2 / 3 - chord_y * bend
+    second_y = start_y + chord_y * 2 / 3 + chord_x * bend
+
+    # Arc length lies between the chord and the control polygon
+    polygon = (np.hypot(first_x - start_x, first_y - start_y) + np.hypot(second_x - first_x, second_y - first_y) +
+               np.hypot(end_x - second_x, end_y - second_y))
+    duration = np.maximum((length + polygon) / 2 / speed, 1e-6)
+    return first_x, first_y, second_x, second_y, duration
+
+def positions(start_x, start_y, first_x, first_y, second_x, second_y, end_x, end_y, u):
+    """Points at parameter u (0 = spawn, 1 = target) on every path"""
+    v = 1 - u
+    a, b, c, d = v * v * v, 3 * v * v * u, 3 * v * u * u, u * u * u
+    return (a * start_x + b * first_x + c * second_x + d * end_x,
+            a * start_y + b * first_y + c * second_y + d * end_y)
@@ -0,0 +1,87 @@
+import numpy as np
+
+class ParticlePool:
+    """Preallocated slots for one element's particles - live ones stay packed at the front"""
+    def __init__(self, element_type, float_fields, capacity=256, flag_fields=(), code_fields=()):
+        self.element_type = element_type
+        self.float_fields = float_fields
+        self.flag_fields = flag_fields  # bool, cleared when a slot is handed out
+        self.code_fields = code_fields  # uint8
+        self.count = 0
+        self.capacity = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)allocate every array, keeping the live particles - only happens when the pool fills up"""
+        for name in self.float_fields:
+            self._resize_field(name, np.zeros(capacity, np.float64))
+        for name in self.flag_fields:
+            self._resize_field(name, np.zeros(capacity, bool))
+        for name in self.code_fields:
+            self._resize_field(name, np.zeros(capacity, np.uint8))
+        self._resize_field('alive', np.zeros(capacity, bool))
+        self._resize_field('color', np.zeros((capacity, 3), np.uint8))
+        self._resize_field('recolored', np.zeros(capacity, bool))  # Slots whose colour the renderer must rewrite
+        self.capacity = capacity
+
+    def _resize_field(self, name, array):
+        old = getattr(self, name, None)
+        if old is not None and self.count:
+            array[:self.count] = old[:self.count]
+        setattr(self, name, array)
+
+    def __len__(self):
+        return self.count
+
+    def acquire(self):
+        """Hand out the first free slot, doubling the pool only when it is full"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        slot = self.count
+        self.count += 1
+        self.alive[slot] = True
+        for name in self.flag_fields:
+            getattr(self, name)[slot] = False
+        self.recolored[slot] = True
+        return slot
+
+    def acquire_block(self, count):
+        """Hand out count consecutive free slots at once, returns the slice they occupy"""
+        capacity = self.capacity
+        while self.count + count > capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            self._allocate(capacity)
+        block = slice(self.count, self.count + count)
+        self.count += count
+        self.alive[block] = True
+        for name in self.flag_fields:
+            getattr(self, name)[block] = False
+        self.recolored[block] = True
+        return block
+
+    def clear(self):
+        """Drop every particle, the arrays stay allocated"""
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def release_retired(self):
+        """Swap-remove every slot marked not alive: the live tail fills the holes, nothing is reallocated"""
+        n = self.count
+        retired = np.flatnonzero(~self.alive[:n])
+        if len(retired) == 0:
+            return 0
+
+        survivors = n - len(retired)
+        holes = retired[retired < survivors]
+        if len(holes):
+            # Live particles in the tail [survivors, n) move down into the holes
+            tail_alive = self.alive[survivors:n]
+            movers = np.flatnonzero(tail_alive) + survivors
+            for name in self.float_fields + self.flag_fields + self.code_fields + ('color',):
+                array = getattr(self, name)
+                array[holes] = array[movers]
+            self.alive[holes] = True
+            self.recolored[holes] = True
+        self.count = survivors
+        return len(retired)
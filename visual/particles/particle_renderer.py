@@ -0,0 +1,230 @@
+import numpy as np
+import pyglet
+from pyglet import gl
+
+_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec4 colors;
+
+    out vec4 vertex_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    void main()
+    {
+        gl_Position = window.projection * window.view * vec4(position, 0.0, 1.0);
+        vertex_colors = colors;
+    }
+"""
+
+_fragment_source = """#version 150 core
+    in vec4 vertex_colors;
+    out vec4 final_color;
+
+    void main()
+    {
+        final_color = vertex_colors;
+    }
+"""
+
+_program = None
+
+def get_particle_program():
+    """Shader shared by every particle vertex list (compiled on first use)"""
+    global _program
+    if _program is None:
+        _program = pyglet.graphics.shader.ShaderProgram(
+            pyglet.graphics.shader.Shader(_vertex_source, 'vertex'),
+            pyglet.graphics.shader.Shader(_fragment_source, 'fragment'),
+        )
+    return _program
+
+
+class ParticleGroup(pyglet.graphics.Group):
+    """Alpha-blended flat colour, same state the pyglet shapes use"""
+    def __init__(self, program, order=0, parent=None):
+        super().__init__(order, parent)
+        self.program = program
+
+    def set_state(self):
+        self.program.use()
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+    def unset_state(self):
+        gl.glDisable(gl.GL_BLEND)
+        self.program.stop()
+
+    def __eq__(self, other):
+        return (other.__class__ is self.__class__ and self.program is other.program and
+                self.order == other.order and self.parent == other.parent)
+
+    def __hash__(self):
+        return hash((id(self.program), self.order, self.parent))
+
+
+def line_quads(x1, y1, x2, y2, thickness):
+    """Two triangles per line, the same quad pyglet.shapes.Line builds - shape (n, 6, 2)"""
+    dx, dy = x2 - x1, y2 - y1
+    length = np.hypot(dx, dy)
+    safe = np.where(length > 0, length, 1.0)
+    ux = np.where(length > 0, dx / safe, 1.0)
+    uy = np.where(length > 0, dy / safe, 0.0)
+    nx, ny = -uy * (thickness / 2), ux * (thickness / 2)
+
+    a = np.stack((x1 - nx, y1 - ny), axis=-1)
+    b = np.stack((x2 - nx, y2 - ny), axis=-1)
+    c = np.stack((x2 + nx, y2 + ny), axis=-1)
+    d = np.stack((x1 + nx, y1 + ny), axis=-1)
+    return np.stack((a, b, c, a, c, d), axis=1)
+
+
+class ParticleRenderer:
+    """One element's particle shapes in a single vertex list, slot for slot with its ParticlePool"""
+    # Vertices per particle for each element's particle shape (see ElementShapeFactory)
+    VERTEX_COUNTS = {"EARTH": 6, "WIND": 18, "FIRE": 12, "WATER": 3}
+
+    def __init__(self, element_type, batch):
+        self.element_type = element_type
+        self.batch = batch
+        self.per_particle = self.VERTEX_COUNTS[element_type]
+        self.vertex_list = None
+        self.capacity = 0
+        self.count = 0  # Slots currently drawn - the rest are collapsed to zero area
+
+    def _allocate(self, capacity):
+        """Create (or grow, when the pool has grown) the vertex list backing every slot"""
+        if self.vertex_list is not None:
+            self.vertex_list.delete()
+        program = get_particle_program()
+        self.vertex_list = program.vertex_list(
+            capacity * self.per_particle, gl.GL_TRIANGLES, batch=self.batch, group=ParticleGroup(program),
+            position='f', colors='Bn'
+        )
+        # Start fully collapsed - the domain may hand back memory of a deleted list
+        np.frombuffer(self.vertex_list.position, np.float32)[:] = 0.0
+        np.frombuffer(self.vertex_list.colors, np.uint8)[:] = 0
+        self.capacity = capacity
+        self.count = 0
+
+    def update(self, pool, alpha=1.0):
+        """Rewrite live slot positions, collapse freed slots and recolour only the slots that changed"""
+        active = pool.count
+        if active == 0 and self.count == 0:
+            return
+        if pool.capacity != self.capacity:
+            self._allocate(pool.capacity)
+            pool.recolored[:active] = True
+
+        positions = np.frombuffer(self.vertex_list.position, np.float32).reshape(self.capacity, self.per_particle, 2)
+        if active:
+            positions[:active] = self.build_vertices(pool, *self.interpolated_positions(pool, alpha))
+        if self.count > active:
+            positions[active:self.count] = 0.0  # Collapse the freed slots
+        self.count = active
+        self.write_colors(pool, active)
+        pool.recolored[:active] = False
+
+    def write_colors(self, pool, active):
+        """Opaque colours, written only for the slots that were (re)filled"""
+        recolored = np.flatnonzero(pool.recolored[:active])
+        if len(recolored):
+            colors = np.frombuffer(self.vertex_list.colors, np.uint8).reshape(self.capacity, self.per_particle, 4)
+            colors[recolored, :, :3] = pool.color[recolored, None, :]
+            colors[recolored, :, 3] = 255
+
+    @staticmethod
+    def interpolated_positions(pool, alpha):
+        """Live slot positions alpha of the way from the previous simulation step to the current one"""
+        n = pool.count
+        if alpha >= 1.0:
+            return pool.x[:n], pool.y[:n]
+        prev_x, prev_y = pool.prev_x[:n], pool.prev_y[:n]
+        return prev_x + (pool.x[:n] - prev_x) * alpha, prev_y + (pool.y[:n] - prev_y) * alpha
+
+    def build_vertices(self, pool, x, y):
+        """Particle shape geometry for the live slots - pixel snapped like the shape classes"""
+        n = pool.count
+
+        if self.element_type == "EARTH":
+            # 3x3 square
+            left, bottom = np.trunc(x - 1), np.trunc(y - 1)
+            right, top = left + 3, bottom + 3
+            return np.stack((
+                np.stack((left, bottom), -1), np.stack((right, bottom), -1), np.stack((right, top), -1),
+                np.stack((left, bottom), -1), np.stack((right, top), -1), np.stack((left, top), -1),
+            ), axis=1)
+
+        if self.element_type == "WATER":
+            # Teardrop - the tip stays on the emission point, as the pyglet Triangle's first vertex did
+            back_x = np.trunc(x - 1.5)
+            return np.stack((
+                np.stack((np.trunc(pool.anchor_x[:n] + 1.5), np.trunc(pool.anchor_y[:n])), -1),
+                np.stack((back_x, np.trunc(y - 1)), -1),
+                np.stack((back_x, np.trunc(y + 1)), -1),
+            ), axis=1)
+
+        if self.element_type == "FIRE":
+            # Chevron: two 2px lines
+            left = line_quads(np.trunc(x - 3), np.trunc(y - 1), np.trunc(x), np.trunc(y + 1), 2)
+            right = line_quads(np.trunc(x), np.trunc(y + 1), np.trunc(x + 3), np.trunc(y - 1), 2)
+            return np.concatenate((left, right), axis=1)
+
+        # WIND: S-curve of three 2px lines
+        line1 = line_quads(np.trunc(x - 4), np.trunc(y - 2), np.trunc(x - 1), np.trunc(y), 2)
+        line2 = line_quads(np.trunc(x - 1), np.trunc(y), np.trunc(x + 1), np.trunc(y), 2)
+        line3 = line_quads(np.trunc(x + 1), np.trunc(y), np.trunc(x + 4), np.trunc(y - 2), 2)
+        return np.concatenate((line1, line2, line3), axis=1)
+
+
+class ExplosionRenderer(ParticleRenderer):
+    """Explosion shapes sized by each particle's perspective scale, with per-particle opacity"""
+    def write_colors(self, pool, active):
+        # Opacity changes every frame, so every live slot is rewritten
+        if active:
+            colors = np.frombuffer(self.vertex_list.colors, np.uint8).reshape(self.capacity, self.per_particle, 4)
+            colors[:active, :, :3] = pool.color[:active, None, :]
+            colors[:active, :, 3] = pool.opacity[:active, None]
+
+    def build_vertices(self, pool, x, y):
+        """Element shapes scaled by each particle's perspective"""
+        n = pool.count
+        scale = pool.perspective_scale[:n]
+
+        if self.element_type == "EARTH":
+            # Square, at least 1px
+            size = np.maximum(1, np.trunc(2 * scale))
+            left, bottom = np.trunc(x - size // 2), np.trunc(y - size // 2)
+            right, top = left + size, bottom + size
+            return np.stack((
+                np.stack((left, bottom), -1), np.stack((right, bottom), -1), np.stack((right, top), -1),
+                np.stack((left, bottom), -1), np.stack((right, top), -1), np.stack((left, top), -1),
+            ), axis=1)
+
+        size = np.trunc(3 * scale)
+        if self.element_type == "WATER":
+            # Teardrop - the tip stays where the burst started, as the pyglet Triangle's first vertex did
+            back_x = np.trunc(x - size * 0.7)
+            return np.stack((
+                np.stack((np.trunc(pool.start_x[:n] + 1.5), np.trunc(pool.start_y[:n])), -1),
+                np.stack((back_x, np.trunc(y - size * 0.7)), -1),
+                np.stack((back_x, np.trunc(y + size * 0.7)), -1),
+            ), axis=1)
+
+        # Lines keep their 2px thickness (pyglet Lines have no width to scale)
+        if self.element_type == "FIRE":
+            half = size // 2
+            left = line_quads(np.trunc(x - size), np.trunc(y - half), np.trunc(x), np.trunc(y + half), 2)
+            right = line_quads(np.trunc(x), np.trunc(y + half), np.trunc(x + size), np.trunc(y - half), 2)
+            return np.concatenate((left, right), axis=1)
+
+        # WIND
+        inner, outer, drop = size * 0.3, size * 1.3, size * 0.7
+        line1 = line_quads(np.trunc(x - outer), np.trunc(y - drop), np.trunc(x - inner), np.trunc(y), 2)
+        line2 = line_quads(np.trunc(x - inner), np.trunc(y), np.trunc(x + inner), np.trunc(y), 2)
+        line3 = line_quads(np.trunc(x + inner), np.trunc(y), np.trunc(x + outer), np.trunc(y - drop), 2)
+        return np.concatenate((line1, line2, line3), axis=1)
@@ -0,0 +1,305 @@
+import time
+import types
+import queue
+import multiprocessing
+import numpy as np
+from multiprocessing    import shared_memory
+from .particle_renderer import ParticleRenderer, ExplosionRenderer
+
+# Pool fields the renderers read, published by the worker for every element pool
+ELEMENT_NAMES = ("EARTH", "WIND", "FIRE", "WATER")
+RENDER_FIELDS = {
+    'particles': ('x', 'y', 'prev_x', 'prev_y', 'anchor_x', 'anchor_y'),
+    'explosions': ('x', 'y', 'prev_x', 'prev_y', 'start_x', 'start_y', 'perspective_scale'),
+}
+HEADER_FIELDS = 3  # count, capacity, publish sequence per pool
+
+
+class SharedParticleBuffers:
+    """Two copies of every pool's render state in one shared memory block - the worker fills one while the other is drawn"""
+    POOLS = [(engine, element) for engine in RENDER_FIELDS for element in ELEMENT_NAMES]
+
+    def __init__(self, capacity, name=None):
+        self.capacity = capacity
+        self.sequence = 0     # Publishes so far
+        self.versions = {}    # Worker side: sequence each slot's colour last changed at, per pool
+        size = 2 * self.buffer_size(capacity)
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.buffers = [self._map(index) for index in range(2)]
+
+    @classmethod
+    def pool_size(cls, engine, capacity):
+        size = (len(RENDER_FIELDS[engine]) + 1) * capacity * 8 + capacity * 3  # float64 fields, colour version + RGB
+        if engine == 'explosions':
+            size += capacity  # opacity
+        return size
+
+    @classmethod
+    def buffer_size(cls, capacity):
+        return len(cls.POOLS) * HEADER_FIELDS * 8 + sum(cls.pool_size(engine, capacity) for engine, _ in cls.POOLS)
+
+    def _map(self, index):
+        """Array views onto one buffer: (header, {(engine, element): {field: array}})"""
+        capacity = self.capacity
+        offset = index * self.buffer_size(capacity)
+        header = np.ndarray((len(self.POOLS), HEADER_FIELDS), np.int64, self.memory.buf, offset)
+        offset += header.nbytes
+        pools = {}
+        for engine, element in self.POOLS:
+            fields = {}
+            for name in RENDER_FIELDS[engine]:
+                fields[name] = np.ndarray(capacity, np.float64, self.memory.buf, offset)
+                offset += capacity * 8
+            fields['color_version'] = np.ndarray(capacity, np.int64, self.memory.buf, offset)
+            offset += capacity * 8
+            fields['color'] = np.ndarray((capacity, 3), np.uint8, self.memory.buf, offset)
+            offset += capacity * 3
+            if engine == 'explosions':
+                fields['opacity'] = np.ndarray(capacity, np.uint8, self.memory.buf, offset)
+                offset += capacity
+            pools[(engine, element)] = fields
+        return header, pools
+
+    def publish(self, index, engines):
+        """Copy the live slots of every pool into buffer index, stamping the slots recoloured since the last publish"""
+        self.sequence += 1
+        header, pools = self.buffers[index]
+        for row, (engine, element) in enumerate(self.POOLS):
+            pool = engines[engine].pools[element]
+            n = min(pool.count, self.capacity)  # Anything past the shared capacity is simulated but not drawn
+            versions = self.versions.setdefault((engine, element), np.zeros(self.capacity, np.int64))
+            versions[:n][pool.recolored[:n]] = self.sequence
+            pool.recolored[:pool.count] = False
+            fields = pools[(engine, element)]
+            fields['color_version'][:n] = versions[:n]
+            for name in RENDER_FIELDS[engine] + ('color',) + (('opacity',) if engine == 'explosions' else ()):
+                fields[name][:n] = getattr(pool, name)[:n]
+            header[row] = n, min(pool.capacity, self.capacity), self.sequence
+
+    def close(self, unlink=False):
+        self.buffers = []
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+class PoolView:
+    """Read-only stand-in for a ParticlePool, backed by one published buffer"""
+    def __init__(self, element_type, fields):
+        self.element_type = element_type
+        self.count = 0
+        self.capacity = 0
+        for name, array in fields.items():
+            setattr(self, name, array)
+        self.recolored = np.zeros(len(fields['color']), bool)
+
+
+def run_worker(shm_name, capacity, seed, width, height, front, reading, lock, commands, results):
+    """Worker process: MIDI, audio features, nodes and particles stepped by the queued frames, their state published
+    after each batch (particles into the shared buffer, the rest as plain data on the result queue)"""
+    from audio                   import AudioAnalyzer
+    from midi.midi_processor     import MIDIProcessor
+    from network.network_manager import NetworkManager
+    from utils                   import FrameContext, RandomStreams
+
+    RandomStreams.seed(seed)
+    midi_processor = MIDIProcessor()
+    audio_analyzer = AudioAnalyzer()
+    visualizer = types.SimpleNamespace(audio_analyzer=audio_analyzer)  # What the nodes read from the visualizer
+    network_manager = NetworkManager(width, height, None, visualizer, worker=False)
+    engines = {'particles': network_manager.particles, 'explosions': network_manager.explosion_particles}
+    buffers = SharedParticleBuffers(capacity, shm_name)
+    frame = FrameContext()
+
+    running = True
+    while running:
+        batch = commands.get()
+        batches = [batch]
+        while True:  # Catch up on everything queued since, then publish once
+            try:
+                batches.append(commands.get_nowait())
+            except queue.Empty:
+                break
+
+        for batch in batches:
+            if batch is None:
+                running = False
+                break
+            for command, *args in batch:
+                if command == 'simulate':
+                    steps, step_dt, audio_time, playing, budget_enabled, budget_pinned, budget_level = args
+                    network_manager.particle_budget.enabled = budget_enabled  # Measured in the render process
+                    network_manager.particle_budget.pinned = budget_pinned
+                    network_manager.particle_budget.level = budget_level
+                    network_manager.simulate(frame, steps, step_dt, audio_time, playing, midi_processor, audio_analyzer)
+                elif command == 'load':
+                    midi_events, audio_file = args
+                    midi_processor.midi_events = midi_events
+                    midi_processor.reset()
+                    if audio_file and audio_file != audio_analyzer.audio_file:
+                        audio_analyzer.analyze_audio_frequencies(audio_file)
+                elif command == 'reset':
+                    # Restart from the seed: same streams, clock and state as a fresh worker
+                    RandomStreams.seed(seed)
+                    frame.reset()
+                    midi_processor.reset()
+                    audio_analyzer.reset()
+                    network_manager.reset()
+        if not running:
+            break
+
+        # Write the buffer that is not on screen, waiting if the renderer is still reading it
+        back = 1 - front.value
+        while reading.value == back:
+            time.sleep(0.0005)
+        buffers.publish(back, engines)
+        with lock:
+            front.value = back
+        results.put(network_manager.get_state(midi_processor, audio_analyzer))
+    buffers.close()
+
+
+class RemoteParticleEngine:
+    """ParticleEngine stand-in in the render process - draws what the worker publishes"""
+    ELEMENT_CODES = {"EARTH": 0, "WIND": 1, "FIRE": 2, "WATER": 3}
+    ELEMENT_NAMES = ELEMENT_NAMES
+
+    def __init__(self, worker, batch):
+        self.worker = worker
+        self.published_count = 0
+        self.renderers = {}
+        if batch is not None:
+            self.renderers = {name: ParticleRenderer(name, batch) for name in ELEMENT_NAMES}
+
+    @property
+    def count(self):
+        return self.published_count
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.worker.reset()
+
+    def render(self, alpha=1.0):
+        self.worker.draw('particles', self.renderers, alpha)
+
+
+class RemoteExplosionEngine:
+    """ExplosionEngine stand-in in the render process - draws what the worker publishes"""
+    PARTICLE_TYPES = ("screen_plane", "toward_viewer", "away_from_viewer")
+
+    def __init__(self, worker, batch):
+        self.worker = worker
+        self.published_count = 0
+        self.visible = {particle_type: 0 for particle_type in self.PARTICLE_TYPES}
+        self.culled = {particle_type: 0 for particle_type in self.PARTICLE_TYPES}
+        self.renderers = {}
+        if batch is not None:
+            self.renderers = {name: ExplosionRenderer(name, batch) for name in ELEMENT_NAMES}
+
+    @property
+    def count(self):
+        return self.published_count
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.worker.reset()
+
+    def render(self, alpha=1.0):
+        self.worker.draw('explosions', self.renderers, alpha)
+
+
+class SimulationWorker:
+    """MIDI, audio features, nodes and particles simulated in a separate process - particles are drawn from a
+    shared-memory double buffer, everything else is applied from the plain-data state published with it"""
+    def __init__(self, batch, capacity, seed, width, height):
+        context = multiprocessing.get_context('spawn')  # No GL state is inherited by the worker
+        self.buffers = SharedParticleBuffers(capacity)
+        self.front = context.Value('i', 0, lock=False)
+        self.reading = context.Value('i', -1, lock=False)  # Buffer the renderer is copying from
+        self.lock = context.Lock()
+        self.commands = context.Queue()
+        self.results = context.Queue()
+        self.pending = []  # Commands queued this frame, sent as one batch
+        self.sources = None  # MIDI events and audio file the worker was handed
+
+        self.views = [
+            {key: PoolView(key[1], fields) for key, fields in pools.items()}
+            for _, pools in self.buffers.buffers
+        ]
+        self.drawn = {key: 0 for key in SharedParticleBuffers.POOLS}  # Publish each pool was last drawn from
+        self.particles = RemoteParticleEngine(self, batch)
+        self.explosions = RemoteExplosionEngine(self, batch)
+
+        self.process = context.Process(
+            target=run_worker, daemon=True,
+            args=(self.buffers.memory.name, capacity, seed, width, height, self.front, self.reading, self.lock,
+                  self.commands, self.results),
+        )
+        self.process.start()
+        print(f"✅ Simulation worker started (pid {self.process.pid})")
+
+    def queue(self, command):
+        self.pending.append(command)
+
+    def load(self, midi_processor, audio_analyzer):
+        """Hand the worker the MIDI events and audio file, whenever another one has been loaded"""
+        sources = (id(midi_processor.midi_events), len(midi_processor.midi_events), audio_analyzer.audio_file)
+        if sources != self.sources:
+            self.sources = sources
+            self.queue(('load', midi_processor.midi_events, audio_analyzer.audio_file))
+
+    def reset(self):
+        """Restart the worker's simulation from the seed"""
+        if ('reset',) not in self.pending:
+            self.queue(('reset',))
+
+    def sync(self):
+        """Once per rendered frame: send this frame's commands, returns the latest state published since (or None)"""
+        if self.pending:
+            self.commands.put(self.pending)
+            self.pending = []
+
+        state = None
+        while True:
+            try:
+                state = self.results.get_nowait()
+            except queue.Empty:
+                return state
+
+    def draw(self, engine, renderers, alpha):
+        """Point the renderers at the latest published buffer (held until they are done with it)"""
+        with self.lock:
+            index = self.front.value
+            self.reading.value = index
+        header, _ = self.buffers.buffers[index]
+        try:
+            for row, (engine_name, element) in enumerate(SharedParticleBuffers.POOLS):
+                if engine_name != engine or element not in renderers:
+                    continue
+                key = (engine_name, element)
+                view = self.views[index][key]
+                view.count, view.capacity, sequence = (int(value) for value in header[row])
+                # Recolour the slots whose colour changed after the publish this pool was last drawn from
+                view.recolored[:view.count] = view.color_version[:view.count] > self.drawn[key]
+                self.drawn[key] = sequence
+                if view.capacity:
+                    renderers[element].update(view, alpha)
+        finally:
+            self.reading.value = -1
+
+    def stop(self):
+        if self.process.is_alive():
+            self.commands.put(None)
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.views = []
+        self.buffers.close(unlink=True)
+        print("🛑 Simulation worker stopped")
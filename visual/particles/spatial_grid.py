@@ -0,0 +1,67 @@
+import numpy as np
+
+class SpatialGrid:
+    """Uniform grid over a point set - rebuilt once per frame, answers fixed-radius neighbour queries"""
+    CELL_OFFSET = 1 << 20  # Shifts cell coordinates positive so (cx, cy) packs into one int64 key
+    KEY_STRIDE = 1 << 21
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.order = np.zeros(0, np.int64)       # Point indices sorted by cell
+        self.cell_keys = np.zeros(0, np.int64)   # Occupied cells, ascending
+        self.cell_starts = np.zeros(0, np.int64) # Where each occupied cell's run begins in order
+        self.cell_counts = np.zeros(0, np.int64)
+
+    def __len__(self):
+        return len(self.x)
+
+    def _keys(self, x, y):
+        cell_x = np.floor(x / self.cell_size).astype(np.int64) + self.CELL_OFFSET
+        cell_y = np.floor(y / self.cell_size).astype(np.int64) + self.CELL_OFFSET
+        return cell_x * self.KEY_STRIDE + cell_y
+
+    def rebuild(self, x, y):
+        """Bucket the points by cell (a stable sort on the packed cell key)"""
+        self.x = x
+        self.y = y
+        keys = self._keys(x, y)
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+
+    def query_pairs(self, query_x, query_y, radius):
+        """All (query, point) index pairs closer than radius - only the cells radius can reach are scanned"""
+        if len(self.cell_keys) == 0:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        reach = int(np.ceil(radius / self.cell_size))
+        query_ids, point_ids = [], []
+
+        home = self._keys(query_x, query_y)
+        by_cell = np.argsort(home, kind='stable')  # Sorted lookups walk the cell table in order
+        home = home[by_cell]
+        for offset_x in range(-reach, reach + 1):
+            for offset_y in range(-reach, reach + 1):
+                keys = home + (offset_x * self.KEY_STRIDE + offset_y)
+                cells = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+                hit = self.cell_keys[cells] == keys
+                if not hit.any():
+                    continue
+                cells = cells[hit]
+                first = self.cell_starts[cells]
+                counts = self.cell_counts[cells]
+                # Expand each query's [first, first + count) run of sorted points into flat pairs
+                queries = np.repeat(by_cell[hit], counts)
+                run_starts = np.cumsum(counts) - counts
+                slots = np.arange(int(counts.sum())) - np.repeat(run_starts - first, counts)
+                query_ids.append(queries)
+                point_ids.append(self.order[slots])
+
+        if not query_ids:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        queries = np.concatenate(query_ids)
+        points = np.concatenate(point_ids)
+        near = (self.x[points] - query_x[queries]) ** 2 + (self.y[points] - query_y[queries]) ** 2 < radius * radius
+        return queries[near], points[near]
@@ -1,4 +1,5 @@
 from pyglet import shapes
+from visual.visibility import Visibility
 import math
 
 class CurvedOdinShape:
@@ -29,10 +30,14 @@ class CurvedOdinShape:
                 color=(120, 80, 180), batch=batch
             )
             circle.opacity = 0  # Start invisible
+            Visibility.sync_opacity(circle, batch)
             self.circles.append(circle)
+        self.circles_visible = False
+        self.circles_layout = (self.x, self.y, self.size)
     
-    def update(self, dt, color, audio_intensity=0.0, current_size=45):
+    def update(self, frame, color, audio_intensity=0.0, current_size=45):
         """Update the shape with new curvature based on audio"""
+        dt = frame.dt
         # Ensure color is integers
         color = [int(c) for c in color]
         
@@ -65,10 +70,29 @@ class CurvedOdinShape:
         
         # Update circles for curved effect
         circle_opacity = int(min(255, max(0, self.curvature * 80)))
+        self.circles_visible = circle_opacity > 0
+        for circle in self.circles:
+            Visibility.sync(circle, self.batch, self.circles_visible)
+        if not self.circles_visible:
+            return  # Fully transparent circles stay parked and untouched
+        
+        if self.circles_layout != (self.x, self.y, self.size):
+            self.layout_circles()  # Catch up on moves made while hidden
         for circle in self.circles:
             circle.color = tuple(color)
             circle.opacity = circle_opacity
     
+    def layout_circles(self):
+        """Place the morph circles around the current centre"""
+        for i, circle in enumerate(self.circles):
+            angle = (2 * math.pi * i) / 8
+            offset_x = math.cos(angle) * self.size * 0.3
+            offset_y = math.sin(angle) * self.size * 0.3
+            circle.x = int(self.x + offset_x)
+            circle.y = int(self.y + offset_y)
+            circle.radius = int(self.size * 0.4)
+        self.circles_layout = (self.x, self.y, self.size)
+    
     def set_position_and_size(self, x, y, size):
         """Update position and size"""
         x, y, size = int(x), int(y), int(size)
@@ -83,14 +107,9 @@ class CurvedOdinShape:
             self.base_rect.width = size * 2
             self.base_rect.height = size * 2
             
-            # Update circles
-            for i, circle in enumerate(self.circles):
-                angle = (2 * math.pi * i) / 8
-                offset_x = math.cos(angle) * size * 0.3
-                offset_y = math.sin(angle) * size * 0.3
-                circle.x = int(x + offset_x)
-                circle.y = int(y + offset_y)
-                circle.radius = int(size * 0.4)
+            # Update circles (hidden ones are laid out when they reappear)
+            if self.circles_visible:
+                self.layout_circles()
     
     def delete(self):
         """Clean up - not needed with batch rendering"""
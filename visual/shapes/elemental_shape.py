@@ -1,6 +1,6 @@
 from pyglet import shapes
+from visual.visibility import Visibility
 import math
-import time
 
 class ElementalShape:
     """Base class for elemental shapes with audio reactivity"""
@@ -13,6 +13,7 @@ class ElementalShape:
         self.base_color = [int(c) for c in color]
         self.audio_intensity = 0.0
         self.target_audio_intensity = 0.0
+        self.sim_time = 0.0  # Simulation time of the last update
         
         # Create shapes based on element type
         self.create_elemental_shape()
@@ -89,6 +90,7 @@ class ElementalShape:
                 color=tuple(self.base_color), batch=self.batch
             )
             crystal.opacity = 0
+            Visibility.sync_opacity(crystal, self.batch)
             self.crystals.append(crystal)
     
     def create_wind_shape(self):
@@ -143,6 +145,7 @@ class ElementalShape:
                 self.size * 2, 2, color=tuple(self.base_color), batch=self.batch
             )
             stream.opacity = 0
+            Visibility.sync_opacity(stream, self.batch)
             self.wind_streams.append(stream)
     
     def create_fire_shape(self):        
@@ -208,6 +211,8 @@ class ElementalShape:
                 color=tuple(self.base_color), batch=self.batch
             )
             right_line.opacity = 0
+            Visibility.sync_opacity(left_line, self.batch)
+            Visibility.sync_opacity(right_line, self.batch)
             
             self.flame_chevrons.append((left_line, right_line))
     
@@ -253,10 +258,13 @@ class ElementalShape:
                 color=tuple(self.base_color), batch=self.batch
             )
             ripple.opacity = 0
+            Visibility.sync_opacity(ripple, self.batch)
             self.ripples.append(ripple)
     
-    def update(self, dt, color, audio_intensity=0.0, midi_activity=0.0):
+    def update(self, frame, color, audio_intensity=0.0, midi_activity=0.0):
         """Update the elemental shape based on audio and MIDI"""
+        dt = frame.dt
+        self.sim_time = frame.time
         # Ensure color is integers
         color = [int(c) for c in color]
     
@@ -300,6 +308,8 @@ class ElementalShape:
         # Use audio_intensity for crystal effects
         crystal_opacity = int(min(255, max(0, self.audio_intensity * 220)))
         for i, crystal in enumerate(self.crystals):
+            if not Visibility.sync(crystal, self.batch, crystal_opacity > 0):
+                continue  # Fully transparent - parked, nothing to update
             # Much more saturated crystals - boost all color channels significantly
             brighter_color = [min(255, int(c * 2.0)) for c in color]  # Increased from 1.2 to 2.0
             crystal.color = tuple(brighter_color)
@@ -314,7 +324,8 @@ class ElementalShape:
             self.base_rect.opacity = 0  # Hidden during MIDI activity
         else:
             self.base_rect.opacity = 130  # Visible when no MIDI
-        self.base_rect.color = tuple(color)
+        if Visibility.sync_opacity(self.base_rect, self.batch):
+            self.base_rect.color = tuple(color)
 
         self.circumference.color = (120, 120, 120)  # Slightly lighter gray
         circumference_opacity = 60 + int(self.audio_intensity * 30)  # Subtle pulse with audio
@@ -326,9 +337,12 @@ class ElementalShape:
                 self.line.opacity = 0  # Hidden during MIDI activity
             else:
                 self.line.opacity = 160  # Visible when no MIDI
+            Visibility.sync_opacity(self.line, self.batch)
 
         stream_opacity = int(min(255, max(0, self.audio_intensity * 200)))  # Quicker fade-in
         for i, stream in enumerate(self.wind_streams):
+            if not Visibility.sync(stream, self.batch, stream_opacity > 0):
+                continue
             stream.color = tuple(color)
             stream.opacity = stream_opacity
             # Streams extend with audio
@@ -351,10 +365,13 @@ class ElementalShape:
         for i, (left_line, right_line) in enumerate(self.flame_chevrons):
             if self.audio_intensity > 0.02:
                 # Flicker effect - different chevrons react differently, bottom chevron most responsive
-                flicker_intensity = self.audio_intensity + math.sin(time.time() * (5 + i)) * 0.2
+                flicker_intensity = self.audio_intensity + math.sin(self.sim_time * (5 + i)) * 0.2
                 # Bottom chevron (i=0) gets full intensity, top chevrons get progressively less
                 intensity_multiplier = 1.0 - (i * 0.2)  # 1.0, 0.8, 0.6
                 chevron_opacity = int(max(0, min(255, flicker_intensity * 240 * intensity_multiplier)))
+                Visibility.sync(left_line, self.batch, chevron_opacity > 0)
+                if not Visibility.sync(right_line, self.batch, chevron_opacity > 0):
+                    continue  # Flicker dipped to fully transparent
                 
                 brighter_color = [min(255, int(c * 1.3)) for c in color]
                 
@@ -370,6 +387,8 @@ class ElementalShape:
             else:
                 left_line.opacity = 0
                 right_line.opacity = 0
+                Visibility.sync(left_line, self.batch, False)
+                Visibility.sync(right_line, self.batch, False)
     
     def update_water(self, color):
         """Water ripples pulse with audio"""
@@ -388,6 +407,8 @@ class ElementalShape:
             if self.audio_intensity > 0.02:
                 # Ripples fade from center outward
                 ripple_opacity = int(max(0, self.audio_intensity * 150 - i * 30))
+                if not Visibility.sync(ripple, self.batch, ripple_opacity > 0):
+                    continue  # Outer ripples stay parked at low intensity
                 ripple.color = tuple(color)
                 ripple.opacity = ripple_opacity
                 # Make first ripple smaller than the square
@@ -401,8 +422,7 @@ class ElementalShape:
                 ripple.radius = max(1, calculated_radius)
             else:
                 # Ensure they're completely hidden when no audio
-                ripple.opacity = 0
-                ripple.radius = 1  # Set to 1 instead of 0 to avoid GL error
+                Visibility.sync(ripple, self.batch, False)  # Parked, so radius/colour need no upkeep
     
     def set_position_and_size(self, x, y, size):
         """Update position and size"""
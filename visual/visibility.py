@@ -0,0 +1,27 @@
+import pyglet
+
+class Visibility:
+    """Keeps drawables that can't be seen out of their batch so they cost nothing to draw"""
+
+    # Hidden drawables are parked here - this batch is never drawn
+    _hidden_batch = None
+
+    @classmethod
+    def hidden_batch(cls):
+        """Batch that holds parked drawables (created on first use, needs a GL context)"""
+        if cls._hidden_batch is None:
+            cls._hidden_batch = pyglet.graphics.Batch()
+        return cls._hidden_batch
+
+    @classmethod
+    def sync(cls, drawable, batch, visible):
+        """Attach drawable to batch while visible, park it otherwise. Returns visible."""
+        target = batch if visible else cls.hidden_batch()
+        if drawable.batch is not target:
+            drawable.batch = target  # Only migrates on a visibility change
+        return visible
+
+    @classmethod
+    def sync_opacity(cls, drawable, batch):
+        """Visibility follows the drawable's current opacity"""
+        return cls.sync(drawable, batch, drawable.opacity > 0)
\ No newline at end of file
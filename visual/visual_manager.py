@@ -8,6 +8,6 @@ class VisualManager:
         # Initialize visual effects
         self.background_pattern = BackgroundPattern(window_width, window_height, grid_batch)
     
-    def update_effects(self, dt, total_audio_activity=0.0):
+    def update_effects(self, frame, total_audio_activity=0.0):
         """Update all visual effects"""
-        self.background_pattern.update(dt, total_audio_activity)
\ No newline at end of file
+        self.background_pattern.update(frame, total_audio_activity)
\ No newline at end of file